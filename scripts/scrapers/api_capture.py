@@ -0,0 +1,202 @@
+"""
+API Capture
+===========
+Record the JSON XHR/fetch traffic behind a rendered page and replay it
+over plain HTTP.
+
+Chrome's DevTools performance log reports every request the page makes.
+After one browser session runs a search, capture_json_responses() pulls the
+JSON responses (and the requests that produced them) out of that log.
+find_search_endpoint() picks the request that carried the search term and
+turns it into a template with a {query} placeholder, which replay_endpoint()
+can then fill in for any other ZIP code using requests - no browser needed.
+
+Usage:
+    # In a Selenium session started with performance logging enabled
+    responses = capture_json_responses(driver)
+    endpoint = find_search_endpoint(responses, '90210')
+    save_json(endpoint, 'nflflag_api_endpoint.json')
+
+    # Later, without a browser
+    data = replay_endpoint(session, load_json('nflflag_api_endpoint.json'), '10001')
+"""
+
+import base64
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER = '{query}'
+
+# Request headers that must not be replayed verbatim
+SKIPPED_HEADERS = {'content-length', 'host', 'connection', 'accept-encoding', 'cookie'}
+
+
+def capture_json_responses(driver) -> List[Dict]:
+    """
+    Collect JSON XHR/fetch responses from a driver's performance log
+
+    The driver must have been started with performance logging enabled
+    (goog:loggingPrefs {'performance': 'ALL'}). Reading the log clears it,
+    so call this once per page or search.
+
+    Returns:
+        List of {url, method, headers, post_data, status, mime_type, body}
+    """
+    requests_by_id: Dict[str, Dict] = {}
+    responses: List[Dict] = []
+
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+
+        method = message.get('method')
+        params = message.get('params', {})
+
+        if method == 'Network.requestWillBeSent':
+            request = params.get('request', {})
+            requests_by_id[params.get('requestId')] = {
+                'url': request.get('url'),
+                'method': request.get('method', 'GET'),
+                'headers': request.get('headers', {}),
+                'post_data': request.get('postData'),
+            }
+
+        elif method == 'Network.responseReceived':
+            response = params.get('response', {})
+            mime_type = response.get('mimeType', '')
+            if params.get('type') not in ('XHR', 'Fetch') or 'json' not in mime_type:
+                continue
+            request = requests_by_id.get(params.get('requestId'), {'url': response.get('url')})
+            body = _response_body(driver, params.get('requestId'))
+            if body is None:
+                continue
+            responses.append({
+                **request,
+                'status': response.get('status'),
+                'mime_type': mime_type,
+                'body': body,
+            })
+
+    logger.info(f"📡 Captured {len(responses)} JSON API response(s)")
+    return responses
+
+
+def _response_body(driver, request_id: str) -> Optional[Any]:
+    """Fetch and decode one response body through CDP"""
+    try:
+        result = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+    except Exception as e:
+        logger.debug(f"Response body for {request_id} is no longer available: {e}")
+        return None
+
+    body = result.get('body', '')
+    if result.get('base64Encoded'):
+        body = base64.b64decode(body).decode('utf-8', errors='ignore')
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def find_search_endpoint(responses: List[Dict], query: str) -> Optional[Dict]:
+    """
+    Build a replayable endpoint template from captured traffic
+
+    Prefers the request that carried the search term (in the URL or body)
+    and replaces it with a placeholder. Falls back to the largest JSON
+    response when no request mentions the term.
+
+    Returns:
+        {url, method, headers, post_data, parameterized} or None
+    """
+    if not responses:
+        return None
+
+    def mentions_query(response: Dict) -> bool:
+        return query in (response.get('url') or '') or query in (response.get('post_data') or '')
+
+    matching = [r for r in responses if mentions_query(r)]
+    candidates = matching or responses
+    best = max(candidates, key=lambda r: len(json.dumps(r['body'])))
+
+    if not matching:
+        logger.warning(f"⚠️  No captured request contains '{query}'; saving the largest JSON response instead")
+
+    headers = {
+        name: value for name, value in (best.get('headers') or {}).items()
+        if not name.startswith(':') and name.lower() not in SKIPPED_HEADERS
+    }
+
+    return {
+        'url': best['url'].replace(query, PLACEHOLDER),
+        'method': best.get('method', 'GET'),
+        'headers': headers,
+        'post_data': best['post_data'].replace(query, PLACEHOLDER) if best.get('post_data') else None,
+        'parameterized': bool(matching),
+    }
+
+
+def replay_endpoint(session: requests.Session, endpoint: Dict, query: str,
+                    rate_limiter=None, timeout: int = 10) -> Any:
+    """
+    Call a captured endpoint for a new search term
+
+    Raises:
+        requests.RequestException: the request failed
+        ValueError: the response was not JSON
+    """
+    url = endpoint['url'].replace(PLACEHOLDER, query)
+    data = endpoint['post_data'].replace(PLACEHOLDER, query) if endpoint.get('post_data') else None
+
+    if rate_limiter:
+        rate_limiter.acquire(url)
+
+    logger.info(f"Fetching: {url}")
+    response = session.request(
+        endpoint.get('method', 'GET'),
+        url,
+        headers=endpoint.get('headers'),
+        data=data,
+        timeout=timeout
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def find_records(data: Any) -> List[Dict]:
+    """Return the largest list of objects anywhere in a JSON document"""
+    best: List[Dict] = []
+    stack = [data]
+
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            objects = [item for item in node if isinstance(item, dict)]
+            if len(objects) > len(best):
+                best = objects
+            stack.extend(node)
+
+    return best
+
+
+def save_json(data: Any, path: Path):
+    """Write a capture or endpoint file"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    logger.info(f"💾 Saved {path}")
+
+
+def load_json(path: Path) -> Any:
+    """Read a capture or endpoint file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
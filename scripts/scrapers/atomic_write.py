@@ -0,0 +1,32 @@
+"""
+Atomic Write
+============
+Replace a file's contents all at once.
+
+The caches rewrite small files (index entries, selector profiles) that a
+crash or Ctrl-C mid-write would otherwise leave truncated. The data goes to
+a temp file in the same directory first and is then renamed over the target
+with os.replace(), so readers see either the old contents or the new ones.
+
+Usage:
+    from atomic_write import write_atomic
+
+    write_atomic(path, json.dumps(entry).encode('utf-8'))
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write data to path via a temp file so a crash never leaves it truncated"""
+    fd, tmp_path = tempfile.mkstemp(dir=Path(path).parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,324 @@
+"""
+Browser Pool
+============
+A pool of warm headless Chrome drivers shared by the Selenium scrapers.
+
+The pool starts N drivers up front, lends them out one task at a time, and
+quits and replaces a driver after a configurable number of pages so that
+Chrome's memory growth stays capped on long crawls. map() runs a function
+over a work queue with one worker thread per driver, which lets many league
+pages or ZIP searches render at the same time on a multi-core machine.
+
+With block_resources=True each driver skips images, fonts, stylesheets,
+media and known third-party tag/analytics scripts (via Chrome content
+settings and CDP Network.setBlockedURLs). The scrapers only read text and
+links, so this cuts bandwidth, render time and per-driver memory. XHR/fetch
+requests are never matched by the blocked patterns, and hosts passed in
+allow_hosts are exempt from the third-party block list.
+
+With capture_network=True drivers also keep Chrome's DevTools performance
+log, which api_capture.py reads to record the site's JSON API calls.
+
+Usage:
+    from browser_pool import BrowserPool
+
+    with BrowserPool(size=4, headless=True, recycle_after=50, block_resources=True) as pool:
+        titles = pool.map(lambda driver, url: driver.get(url) or driver.title, urls)
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECYCLE_AFTER = 50  # Pages per driver before it is replaced
+
+# Static asset types the scrapers never read
+BLOCKED_EXTENSIONS = [
+    'png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp',
+    'woff', 'woff2', 'ttf', 'otf', 'eot',
+    'css',
+    'mp4', 'webm', 'mp3', 'wav',
+]
+
+# Third-party tag managers, analytics, ads, chat widgets and web fonts
+BLOCKED_THIRD_PARTY_HOSTS = [
+    'googletagmanager.com', 'google-analytics.com', 'analytics.google.com',
+    'doubleclick.net', 'googlesyndication.com', 'googleadservices.com',
+    'facebook.net', 'facebook.com', 'connect.facebook.net',
+    'hotjar.com', 'clarity.ms', 'fullstory.com', 'segment.com', 'segment.io',
+    'mixpanel.com', 'amplitude.com', 'heap.io', 'optimizely.com',
+    'intercom.io', 'intercomcdn.com', 'zdassets.com', 'drift.com',
+    'tiktok.com', 'ads-twitter.com', 'snap.licdn.com', 'bat.bing.com',
+    'nr-data.net', 'newrelic.com', 'sentry.io', 'browser.sentry-cdn.com',
+    'fonts.googleapis.com', 'fonts.gstatic.com', 'use.typekit.net',
+    'youtube.com', 'ytimg.com', 'vimeo.com',
+]
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+_driver_path: Optional[str] = None
+_driver_path_lock = threading.Lock()
+
+
+def build_chrome_options(headless: bool = True, block_resources: bool = False,
+                         capture_network: bool = False) -> Options:
+    """Chrome options shared by every scraper driver"""
+    chrome_options = Options()
+
+    if headless:
+        chrome_options.add_argument('--headless=new')
+
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-software-rasterizer')
+    chrome_options.add_argument('--disable-webgl')
+    chrome_options.add_argument('--disable-3d-apis')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+
+    # Disable WebGL entirely (map widgets only produce errors headless)
+    prefs = {
+        'webgl.disabled': True
+    }
+    
+    if block_resources:
+        # Content settings catch <img> loads before they reach the network
+        prefs['profile.managed_default_content_settings.images'] = 2
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    
+    chrome_options.add_experimental_option('prefs', prefs)
+
+    # Suppress WebGL error messages
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    
+    if capture_network:
+        # Network.* DevTools events show up in driver.get_log('performance')
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    return chrome_options
+
+
+def blocked_url_patterns(allow_hosts: Sequence[str] = ()) -> List[str]:
+    """URL patterns for Network.setBlockedURLs, minus allowlisted hosts"""
+    allow_hosts = [host.lower() for host in allow_hosts]
+
+    def allowed(host: str) -> bool:
+        return any(host == a or host.endswith('.' + a) or a.endswith('.' + host) for a in allow_hosts)
+
+    patterns = [f'*.{ext}' for ext in BLOCKED_EXTENSIONS]
+    patterns += [f'*.{ext}?*' for ext in BLOCKED_EXTENSIONS]
+    patterns += [f'*://{host}/*' for host in BLOCKED_THIRD_PARTY_HOSTS if not allowed(host)]
+    patterns += [f'*://*.{host}/*' for host in BLOCKED_THIRD_PARTY_HOSTS if not allowed(host)]
+    return patterns
+
+
+def block_resources(driver: webdriver.Chrome, allow_hosts: Sequence[str] = ()):
+    """Tell a running driver to drop requests for non-data resources"""
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_url_patterns(allow_hosts)})
+
+
+def create_driver(headless: bool = True, block: bool = False,
+                  allow_hosts: Sequence[str] = (), capture_network: bool = False) -> webdriver.Chrome:
+    """Start one Chrome driver, installing ChromeDriver only once per process"""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+
+    service = Service(_driver_path)
+    options = build_chrome_options(headless, block, capture_network)
+    driver = webdriver.Chrome(service=service, options=options)
+    if block:
+        block_resources(driver, allow_hosts)
+    return driver
+
+
+class BrowserPool:
+    """Fixed-size pool of reusable Chrome drivers"""
+
+    def __init__(self, size: int = 1, headless: bool = True,
+                 recycle_after: int = DEFAULT_RECYCLE_AFTER,
+                 block_resources: bool = False, allow_hosts: Sequence[str] = (),
+                 capture_network: bool = False,
+                 driver_factory: Optional[Callable[[], webdriver.Chrome]] = None):
+        """
+        Args:
+            size: Number of drivers (and worker threads)
+            headless: Run Chrome without a window
+            recycle_after: Pages a driver serves before it is replaced (0 = never)
+            block_resources: Skip images, fonts, CSS, media and third-party scripts
+            allow_hosts: Hosts never blocked, e.g. a third-party data API
+            capture_network: Keep the DevTools performance log for API capture
+            driver_factory: Callable returning a new driver (defaults to create_driver)
+        """
+        self.size = max(1, size)
+        self.recycle_after = recycle_after
+        self.driver_factory = driver_factory or (
+            lambda: create_driver(headless, block_resources, allow_hosts, capture_network)
+        )
+        self.idle: queue.Queue = queue.Queue()
+        self.page_counts = {}
+        self.started = False
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        """
+        Warm up all drivers in parallel
+
+        If any driver fails to start, the ones that did start are quit and the
+        error is raised, leaving the pool unstarted so start() can be retried.
+        """
+        with self.lock:
+            if self.started:
+                return
+            self.started = True
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self.driver_factory) for _ in range(self.size)]
+
+        drivers, errors = [], []
+        for future in futures:
+            try:
+                drivers.append(future.result())
+            except Exception as e:
+                errors.append(e)
+
+        if errors:
+            for driver in drivers:
+                self._quit(driver)
+            with self.lock:
+                self.started = False
+            logger.error(f"❌ {len(errors)} of {self.size} browser(s) failed to start")
+            raise errors[0]
+
+        for driver in drivers:
+            self._add(driver)
+        logger.info(f"✅ Browser pool ready with {self.size} driver(s)")
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver for one unit of work"""
+        self.start()
+        driver = self._acquire()
+        try:
+            yield driver
+        finally:
+            # Callers often catch their own errors, so a crashed tab or dead
+            # session is detected here rather than by an exception escaping
+            self._release(driver, self._is_alive(driver))
+
+    def map(self, fn: Callable[[webdriver.Chrome, T], R], items: Iterable[T]) -> List[R]:
+        """
+        Run fn(driver, item) for every item across the pool
+
+        Returns:
+            Results in the same order as items
+        """
+        return list(self.imap(fn, items))
+
+    def imap(self, fn: Callable[[webdriver.Chrome, T], R], items: Iterable[T]) -> Iterator[R]:
+        """Like map, but yield each result in order as soon as it is ready"""
+        def run(item: T) -> R:
+            with self.driver() as driver:
+                return fn(driver, item)
+
+        self.start()
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            yield from executor.map(run, items)
+
+    def close(self):
+        """Quit every idle driver"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _acquire(self) -> webdriver.Chrome:
+        """Wait for an idle driver, failing if every driver has been lost"""
+        while True:
+            if self.size == 0:
+                raise RuntimeError('No working browsers left in the pool')
+            try:
+                return self.idle.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _add(self, driver: webdriver.Chrome):
+        self.page_counts[id(driver)] = 0
+        self.idle.put(driver)
+
+    def _release(self, driver: webdriver.Chrome, healthy: bool):
+        """Return a driver to the pool, replacing it if worn out or broken"""
+        count = self.page_counts.pop(id(driver), 0) + 1
+        worn_out = self.recycle_after and count >= self.recycle_after
+
+        if self.closed:
+            self._quit(driver)
+            return
+
+        if healthy and not worn_out:
+            self.page_counts[id(driver)] = count
+            self.idle.put(driver)
+            return
+
+        reason = 'Recycling' if healthy else 'Replacing crashed'
+        logger.info(f"♻️  {reason} driver after {count} page(s)")
+        try:
+            replacement = self.driver_factory()
+        except Exception as e:
+            logger.error(f"❌ Could not start a replacement browser: {e}")
+            if healthy:
+                # Keep the worn-out driver rather than shrinking the pool
+                self._add(driver)
+            else:
+                with self.lock:
+                    self.size -= 1
+                self._quit(driver)
+            return
+
+        self._quit(driver)
+        self._add(replacement)
+
+    @staticmethod
+    def _is_alive(driver: webdriver.Chrome) -> bool:
+        """One cheap ChromeDriver round trip; fails on a crashed tab or dead session"""
+        try:
+            driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver: webdriver.Chrome):
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,312 @@
+"""
+Columnar Export
+===============
+Write scraped records to Parquet or Arrow IPC files, and read them back with
+filters.
+
+List fields (divisions, formats, comp_levels, age_groups, ...) become real
+list<string> columns instead of repeated JSON text, and state and source are
+dictionary-encoded. Parquet files carry per-row-group min/max statistics, so
+a filtered read such as state == 'CA' skips row groups that cannot match
+and only decodes the requested columns.
+
+The schema is inferred from the first row group. A key that first shows up
+in a later group widens it: the groups already written are copied into a
+file with the new column (null for earlier rows), so sparse fields are kept.
+
+Needs pyarrow (pip install pyarrow); nothing else in the scrapers does.
+Unlike JSONL, a Parquet or Arrow file is only readable once it is closed, so
+keep a JSON/JSONL output alongside it for long crawls.
+
+Usage:
+    python columnar.py convert ../../scraped_data/raw/*_leagues.json --output leagues.parquet
+    python columnar.py convert ../../scraped_data/raw/*_teams.json --output teams.arrow
+    python columnar.py read leagues.parquet --where state=CA --columns name city formats
+
+    from columnar import read_records
+    leagues = read_records('leagues.parquet', where={'state': 'CA'})
+"""
+
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from record_reader import load_records
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_FORMATS = ('parquet', 'arrow')
+DEFAULT_ROW_GROUP_SIZE = 5000  # Records per Parquet row group / Arrow record batch
+
+# Low-cardinality string columns stored as dictionary indexes
+DICTIONARY_COLUMNS = {'state', 'source'}
+
+# Types for columns that may be null throughout the row group that introduces them
+KNOWN_TYPES = {
+    'fees': 'float64',
+    'fee': 'float64',
+}
+
+
+def _pyarrow():
+    """Import pyarrow on first use, so the scrapers run without it"""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow export needs pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def format_for_path(path: Path) -> str:
+    """Columnar format implied by a file extension"""
+    return 'parquet' if Path(path).suffix.lower() in ('.parquet', '.pq') else 'arrow'
+
+
+def infer_schema(records: List[Dict]):
+    """
+    Build a schema from sample records
+
+    Null-only columns fall back to KNOWN_TYPES or string, empty lists to
+    list<string>, and integers widen to float64 so a later 12.5 still fits.
+    """
+    pa = _pyarrow()
+    fields = []
+    for field in pa.Table.from_pylist(records).schema:
+        column_type = field.type
+        if pa.types.is_null(column_type):
+            column_type = pa.type_for_alias(KNOWN_TYPES.get(field.name, 'string'))
+        elif pa.types.is_integer(column_type):
+            column_type = pa.float64()
+        elif pa.types.is_list(column_type) and pa.types.is_null(column_type.value_type):
+            column_type = pa.list_(pa.string())
+
+        if field.name in DICTIONARY_COLUMNS and pa.types.is_string(column_type):
+            column_type = pa.dictionary(pa.int32(), pa.string())
+        fields.append(pa.field(field.name, column_type))
+    return pa.schema(fields)
+
+
+class ColumnarWriter:
+    """Buffer records into row groups and append them to a Parquet or Arrow file"""
+
+    def __init__(self, path: Path, fmt: Optional[str] = None, row_group_size: int = DEFAULT_ROW_GROUP_SIZE):
+        """
+        Args:
+            path: Output file
+            fmt: 'parquet' or 'arrow' (defaults to the file extension)
+            row_group_size: Records per row group
+        """
+        self.pa = _pyarrow()
+        self.path = Path(path)
+        self.format = fmt or format_for_path(self.path)
+        if self.format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format '{self.format}', expected parquet or arrow")
+        self.row_group_size = max(1, row_group_size)
+        self.buffer: List[Dict] = []
+        self.schema = None
+        self.writer = None
+        self.count = 0
+        # Dictionary column -> value -> index; grows across row groups so each
+        # batch's dictionary extends the last (Arrow IPC files require that)
+        self.dictionaries: Dict[str, Dict[str, int]] = {}
+
+    def write(self, record: Dict):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[Dict]):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """Write buffered records as one row group"""
+        if not self.buffer:
+            return
+        if self.writer is None:
+            self._open(infer_schema(self.buffer))
+        else:
+            new_columns = list(dict.fromkeys(
+                key for record in self.buffer for key in record if key not in self.column_names
+            ))
+            if new_columns:
+                self._widen(new_columns)
+
+        self._write(self.pa.Table.from_pylist(self.buffer, schema=self.plain_schema))
+        self.count += len(self.buffer)
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+        if self.writer is None:
+            return
+        self.writer.close()
+        self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _write(self, table):
+        """Dictionary-encode a plain_schema table and append it as one row group"""
+        for name, index in self.dictionaries.items():
+            indices = [None if value is None else index.setdefault(value, len(index))
+                       for value in table.column(name).to_pylist()]
+            column = self.pa.DictionaryArray.from_arrays(
+                self.pa.array(indices, self.pa.int32()), self.pa.array(list(index), self.pa.string())
+            )
+            table = table.set_column(table.schema.get_field_index(name), self.schema.field(name), column)
+
+        if self.format == 'parquet':
+            self.writer.write_table(table, row_group_size=table.num_rows)
+        else:
+            self.writer.write_table(table, max_chunksize=table.num_rows)
+
+    def _widen(self, new_columns: List[str]):
+        """
+        Add columns that first appear after the file was opened
+
+        Parquet and Arrow files have one schema, so the row groups already
+        written are streamed into a new file with the new columns as nulls.
+        This happens at most once per new column, not once per row group.
+        """
+        added = infer_schema([{column: record.get(column) for column in new_columns} for record in self.buffer])
+        logger.info(f"Widening {self.path.name} with columns: {', '.join(added.names)}")
+
+        self.writer.close()
+        previous = self.path.with_name(self.path.name + '.previous')
+        os.replace(self.path, previous)
+        self._open(self.pa.schema(list(self.schema) + list(added)))
+
+        for batch in read_batches(previous, self.format):
+            table = self.pa.Table.from_batches([batch])
+            columns = []
+            for field in self.plain_schema:
+                if field.name in table.column_names:
+                    columns.append(table.column(field.name).cast(field.type))
+                else:
+                    columns.append(self.pa.nulls(table.num_rows, field.type))
+            self._write(self.pa.Table.from_arrays(columns, schema=self.plain_schema))
+        previous.unlink()
+
+    def _open(self, schema):
+        self.schema = schema
+        self.column_names = set(schema.names)
+        self.dictionaries = {field.name: {} for field in schema if self.pa.types.is_dictionary(field.type)}
+        self.plain_schema = self.pa.schema([
+            self.pa.field(field.name, self.pa.string()) if field.name in self.dictionaries else field
+            for field in schema
+        ])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.format == 'parquet':
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(str(self.path), schema, compression='zstd', write_statistics=True)
+        else:
+            import pyarrow.ipc as ipc
+            options = ipc.IpcWriteOptions(compression='zstd', emit_dictionary_deltas=True)
+            self.writer = ipc.new_file(str(self.path), schema, options=options)
+
+
+def _filter_expression(where: Dict[str, Any]):
+    """AND together column == value (or column in [values]) conditions"""
+    import pyarrow.dataset as ds
+    expression = None
+    for column, value in where.items():
+        if isinstance(value, (list, tuple, set)):
+            condition = ds.field(column).isin(list(value))
+        else:
+            condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_table(path: Path, where: Optional[Dict[str, Any]] = None, columns: Optional[List[str]] = None):
+    """
+    Read a Parquet or Arrow file into a pyarrow Table
+
+    Args:
+        path: File written by ColumnarWriter
+        where: Column -> value (or list of values) that rows must match
+        columns: Columns to read (default all)
+    """
+    _pyarrow()
+    import pyarrow.dataset as ds
+    fmt = 'parquet' if format_for_path(path) == 'parquet' else 'ipc'
+    dataset = ds.dataset(str(path), format=fmt)
+    return dataset.to_table(columns=columns, filter=_filter_expression(where) if where else None)
+
+
+def read_batches(path: Path, fmt: Optional[str] = None) -> Iterator:
+    """Stream a Parquet or Arrow file one record batch at a time"""
+    _pyarrow()
+    import pyarrow.dataset as ds
+    fmt = 'parquet' if (fmt or format_for_path(path)) == 'parquet' else 'ipc'
+    return ds.dataset(str(path), format=fmt).to_batches()
+
+
+def read_records(path: Path, where: Optional[Dict[str, Any]] = None,
+                 columns: Optional[List[str]] = None) -> List[Dict]:
+    """Read matching rows as dicts, in the same shape the JSON exports use"""
+    return read_table(path, where, columns).to_pylist()
+
+
+def parse_where(conditions: List[str]) -> Dict[str, Any]:
+    """Turn 'column=value' (or 'column=a,b') arguments into a where dict"""
+    where = {}
+    for condition in conditions:
+        column, sep, value = condition.partition('=')
+        if not sep:
+            raise ValueError(f"Expected COLUMN=VALUE, got '{condition}'")
+        values = value.split(',')
+        where[column.strip()] = values if len(values) > 1 else value
+    return where
+
+
+def main():
+    """Convert JSON exports to a columnar file, or query one"""
+    parser = argparse.ArgumentParser(description='Parquet/Arrow export of scraped data')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert = subparsers.add_parser('convert', help='Convert JSON/JSONL exports to Parquet or Arrow')
+    convert.add_argument('files', nargs='+', help='Scraped JSON, JSONL or .gz files')
+    convert.add_argument('--output', required=True, help='Output .parquet or .arrow file')
+    convert.add_argument('--format', choices=COLUMNAR_FORMATS, help='Output format (default: from extension)')
+    convert.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                         help='Records per row group')
+
+    read = subparsers.add_parser('read', help='Print matching rows from a Parquet or Arrow file as JSONL')
+    read.add_argument('file', help='Parquet or Arrow file')
+    read.add_argument('--where', nargs='+', default=[], metavar='COLUMN=VALUE',
+                      help='Only rows where every COLUMN equals VALUE (a,b matches either)')
+    read.add_argument('--columns', nargs='+', help='Columns to read (default all)')
+    read.add_argument('--limit', type=int, help='Print at most this many rows')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == 'convert':
+        with ColumnarWriter(Path(args.output), args.format, args.row_group_size) as writer:
+            for path in args.files:
+                writer.write_many(load_records(path))
+        logger.info(f"💾 Wrote {writer.count} records to {args.output}")
+        return
+
+    try:
+        where = parse_where(args.where)
+    except ValueError as e:
+        parser.error(str(e))
+    table = read_table(Path(args.file), where, args.columns)
+    if args.limit is not None:
+        table = table.slice(0, args.limit)
+    for record in table.to_pylist():
+        print(json.dumps(record, ensure_ascii=False, default=str))
+    logger.info(f"📊 {table.num_rows} matching rows")
+
+
+if __name__ == '__main__':
+    main()
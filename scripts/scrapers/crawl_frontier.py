@@ -0,0 +1,197 @@
+"""
+Crawl Frontier
+==============
+Persistent record of every known URL, used for incremental crawls.
+
+A small SQLite database remembers, per URL, when it was first seen, last
+fetched and last changed, plus the SHA-256 of its last body and the sitemap
+<lastmod> if there is one. Incremental runs only fetch URLs that are new,
+whose lastmod is newer than the last fetch, or whose last fetch is older than
+a refresh age - and only re-parse pages whose content hash actually changed.
+
+Usage:
+    from crawl_frontier import CrawlFrontier
+
+    frontier = CrawlFrontier()
+    frontier.add(urls, kind='league')
+    for url in frontier.due(urls, kind='league', max_age_days=7):
+        page = fetch_page(session, url, cache=cache)
+        if not frontier.unchanged(url, page.content_hash) and parse(page):
+            frontier.record_fetch(url, page.content_hash, 'league')
+
+Only record a page once it has parsed: a page whose new content fails to
+parse keeps its old hash and is fetched and parsed again next time.
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FRONTIER_DB = Path('../../scraped_data/cache/frontier.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_fetched TEXT,
+    last_changed TEXT,
+    content_hash TEXT,
+    lastmod TEXT
+);
+CREATE INDEX IF NOT EXISTS urls_kind ON urls (kind);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _normalize_timestamp(value: Optional[str]) -> Optional[str]:
+    """Convert a W3C datetime (sitemap lastmod) to UTC ISO so timestamps compare as strings"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        logger.debug(f"Ignoring unparseable lastmod '{value}'")
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec='seconds')
+
+
+class CrawlFrontier:
+    """SQLite-backed URL state for incremental crawling"""
+
+    def __init__(self, db_path: Path = DEFAULT_FRONTIER_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.executescript(_SCHEMA)
+        self.lock = threading.Lock()
+
+    def add(self, urls: Iterable[str], kind: str, lastmods: Optional[Dict[str, str]] = None) -> int:
+        """
+        Record URLs, keeping first-seen times and refreshing sitemap lastmods
+
+        Args:
+            urls: URLs to record
+            kind: URL type, e.g. 'league' or 'team'
+            lastmods: Optional URL -> sitemap <lastmod>
+
+        Returns:
+            Number of URLs not seen before
+        """
+        lastmods = lastmods or {}
+        now = _now()
+        rows = [(url, kind, now, _normalize_timestamp(lastmods.get(url))) for url in urls]
+
+        with self.lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO urls (url, kind, first_seen, lastmod) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            added = self.conn.total_changes - before
+            self.conn.executemany(
+                "UPDATE urls SET lastmod = ? WHERE url = ?",
+                [(lastmod, url) for url, _, _, lastmod in rows if lastmod]
+            )
+        return added
+
+    def due(self, urls: Iterable[str], kind: str, max_age_days: Optional[float] = None) -> List[str]:
+        """
+        Filter URLs down to those worth fetching
+
+        A URL is due if it has never been fetched, its lastmod is newer than
+        its last fetch, or (with max_age_days) its last fetch is too old.
+        Unknown URLs are added first.
+
+        Returns:
+            Due URLs, in input order
+        """
+        urls = list(dict.fromkeys(urls))
+        self.add(urls, kind)
+        cutoff = None
+        if max_age_days is not None:
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).isoformat(timespec='seconds')
+
+        states = self._states(urls)
+        due = []
+        for url in urls:
+            last_fetched, lastmod = states.get(url, (None, None))
+            if (last_fetched is None
+                    or (lastmod and lastmod > last_fetched)
+                    or (cutoff and last_fetched <= cutoff)):
+                due.append(url)
+
+        logger.info(f"🧭 {len(due)} of {len(urls)} {kind} URLs are new, changed or stale")
+        return due
+
+    def unchanged(self, url: str, content_hash: str) -> bool:
+        """
+        Check a fetched page against the content last recorded for it
+
+        An unchanged page has its fetch time bumped. A new or changed page is
+        left untouched until record_fetch() is called after it parses.
+
+        Returns:
+            True if the content is byte-for-byte what was last recorded
+        """
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT content_hash FROM urls WHERE url = ?", (url,)).fetchone()
+            if row is None or row[0] != content_hash:
+                return False
+            self.conn.execute("UPDATE urls SET last_fetched = ? WHERE url = ?", (_now(), url))
+            return True
+
+    def record_fetch(self, url: str, content_hash: str, kind: Optional[str] = None) -> bool:
+        """
+        Record a fetched page
+
+        Returns:
+            True if the content is new or differs from the last fetch
+        """
+        now = _now()
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT content_hash FROM urls WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                self.conn.execute(
+                    "INSERT INTO urls (url, kind, first_seen, last_fetched, last_changed, content_hash) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, kind or 'unknown', now, now, now, content_hash)
+                )
+                return True
+
+            changed = row[0] != content_hash
+            if changed:
+                self.conn.execute(
+                    "UPDATE urls SET last_fetched = ?, last_changed = ?, content_hash = ? WHERE url = ?",
+                    (now, now, content_hash, url)
+                )
+            else:
+                self.conn.execute("UPDATE urls SET last_fetched = ? WHERE url = ?", (now, url))
+            return changed
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def _states(self, urls: List[str]) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """Look up (last_fetched, lastmod) for URLs in chunks below SQLite's variable limit"""
+        states = {}
+        with self.lock:
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for url, last_fetched, lastmod in self.conn.execute(
+                    f"SELECT url, last_fetched, lastmod FROM urls WHERE url IN ({placeholders})", chunk
+                ):
+                    states[url] = (last_fetched, lastmod)
+        return states
@@ -0,0 +1,160 @@
+"""
+Streaming Exporters
+===================
+Write scraped records to disk as they are produced.
+
+Each record is converted to a dict once and serialized once per format, then
+fanned out to every requested output (JSON array, JSONL, CSV, or Parquet and
+Arrow IPC through columnar.py). Files are opened on the first record and
+flushed after every record, so memory never holds the whole result set and a
+crash keeps everything scraped so far.
+A JSON array cut off by a crash is still readable by import_to_supabase.py;
+JSONL files are complete up to the last record. Columnar files are written
+a row group at a time and only become readable once closed.
+
+Usage:
+    from exporters import StreamingExporter
+
+    with StreamingExporter(outputs_for('leagues', ['json', 'csv']), label='leagues') as out:
+        for url in urls:
+            league = scraper.scrape_league_page(url)
+            if league:
+                out.write(league)
+"""
+
+import csv
+import json
+import logging
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+from columnar import COLUMNAR_FORMATS, ColumnarWriter
+from records import Record
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('json', 'jsonl', 'csv', 'parquet', 'arrow')
+TEXT_FORMATS = ('json', 'jsonl')  # Serialized once per record and shared between outputs
+
+
+def outputs_for(stem: Union[str, Path], formats: Iterable[str]) -> Dict[str, str]:
+    """Map each format to '<stem>.<format>'"""
+    return {f'{stem}.{fmt}': fmt for fmt in dict.fromkeys(formats)}
+
+
+def to_dict(record: Any) -> Dict:
+    """Convert a scraped record (records.py type, other dataclass or dict) to a plain dict"""
+    if isinstance(record, Record):
+        return record.to_dict()
+    if is_dataclass(record):
+        return asdict(record)
+    return dict(record)
+
+
+class _Output:
+    """One output file, opened lazily on the first record"""
+
+    def __init__(self, path: Path, fmt: str):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}', expected one of {', '.join(FORMATS)}")
+        self.path = Path(path)
+        self.format = fmt
+        self.file = None
+        self.csv_writer: Optional[csv.DictWriter] = None
+        self.columnar = None
+        self.count = 0
+
+    def write(self, record: Dict, encoded: str):
+        if self.format in COLUMNAR_FORMATS:
+            if self.columnar is None:
+                self.columnar = ColumnarWriter(self.path, self.format)
+            self.columnar.write(record)
+            self.count += 1
+            return
+
+        if self.file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.file = open(self.path, 'w', newline='' if self.format == 'csv' else None, encoding='utf-8')
+            if self.format == 'json':
+                self.file.write('[')
+
+        if self.format == 'csv':
+            if self.csv_writer is None:
+                self.csv_writer = csv.DictWriter(self.file, fieldnames=list(record), extrasaction='ignore')
+                self.csv_writer.writeheader()
+            self.csv_writer.writerow(record)
+        elif self.format == 'json':
+            self.file.write((',\n' if self.count else '\n') + encoded)
+        else:
+            self.file.write(encoded + '\n')
+
+        self.count += 1
+        self.file.flush()
+
+    def close(self):
+        if self.columnar is not None:
+            self.columnar.close()
+            self.columnar = None
+        if self.file is None:
+            return
+        if self.format == 'json':
+            self.file.write('\n]')
+        self.file.close()
+        self.file = None
+
+
+class StreamingExporter:
+    """Fan records out to several files as they arrive"""
+
+    def __init__(self, outputs: Dict[Union[str, Path], str], label: str = 'records'):
+        """
+        Args:
+            outputs: Output path -> format ('json', 'jsonl' or 'csv')
+            label: What the records are, for log messages (e.g. 'leagues')
+        """
+        self.outputs: List[_Output] = [_Output(Path(path), fmt) for path, fmt in outputs.items()]
+        self.label = label
+        self.count = 0
+
+    def write(self, record: Any):
+        """Convert a record once and append it to every output"""
+        data = to_dict(record)
+        encoded: Dict[str, str] = {}
+        for output in self.outputs:
+            if output.format not in encoded and output.format in TEXT_FORMATS:
+                encoded[output.format] = self._encode(data, output.format)
+            output.write(data, encoded.get(output.format, ''))
+        self.count += 1
+
+    def write_many(self, records: Iterable[Any]):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        """Finish every file and log what was written"""
+        for output in self.outputs:
+            output.close()
+
+        if not self.count:
+            logger.warning(f"No {self.label} to export")
+            return
+        for output in self.outputs:
+            logger.info(f"💾 Saved {self.count} {self.label} to {output.path}")
+
+    @property
+    def paths(self) -> List[Path]:
+        return [output.path for output in self.outputs]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _encode(data: Dict, fmt: str) -> str:
+        if fmt == 'json':
+            # Same layout json.dump(records, indent=2) produces for a list
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+            return '\n'.join('  ' + line for line in text.split('\n'))
+        return json.dumps(data, ensure_ascii=False)
@@ -0,0 +1,186 @@
+"""
+Flag Football Finder - Shared Scraper Code
+==========================================
+Fetching, incremental-crawl bookkeeping, output files and command-line
+options shared by the flagfootballfinder.com league and team scrapers.
+
+A scraper sets the frontier URL kind and a module-level parse function, so
+the pipeline's worker processes can run it:
+
+    class FFFTeamScraper(FFFPageScraper):
+        kind = 'team'
+        parse_page = staticmethod(parse_team_page)
+"""
+
+import argparse
+import requests
+import logging
+from pathlib import Path
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Type
+from rate_limiter import get_rate_limiter
+from http_cache import DEFAULT_CACHE_DIR, ResponseCache, fetch_page
+from crawl_frontier import DEFAULT_FRONTIER_DB, CrawlFrontier
+from html_parser import DEFAULT_PARSER, PARSER_CHOICES, HTMLNode, parse_html
+from exporters import FORMATS, StreamingExporter, outputs_for
+from records import Record
+from pipeline import DEFAULT_FETCH_WORKERS, DEFAULT_PARSE_WORKERS, FetchParsePipeline
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+OUTPUT_DIR = Path('../../scraped_data/raw')
+OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+
+class FFFPageScraper:
+    """Cached, frontier-aware scraper for one kind of flagfootballfinder.com page"""
+
+    kind = 'page'  # Frontier URL kind and output file suffix, e.g. 'league'
+    parse_page: Callable[..., Optional[Record]]  # (url, content, parser) -> record
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR, offline: bool = False,
+                 frontier: Optional[CrawlFrontier] = None, parser: str = DEFAULT_PARSER):
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'FlagFootballDirectory/1.0 (Educational purposes)',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+        })
+        self.rate_limiter = get_rate_limiter()
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.offline = offline
+        self.frontier = frontier
+        self.parser = parser
+        self.pending_hashes: Dict[str, str] = {}  # Fetched pages not yet recorded in the frontier
+
+    def fetch(self, url: str) -> Optional[bytes]:
+        """Fetch a page body (revalidating any cached copy) with error handling"""
+        try:
+            page = fetch_page(self.session, url, cache=self.cache,
+                              rate_limiter=self.rate_limiter, offline=self.offline)
+            if self.frontier:
+                if self.frontier.unchanged(url, page.content_hash):
+                    # Incremental run: the page is byte-for-byte what we parsed last time
+                    logger.info(f"Unchanged since last crawl: {url}")
+                    return None
+                # Recorded by record_parsed() once the page has actually parsed
+                self.pending_hashes[url] = page.content_hash
+            return page.content
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {e}")
+            return None
+
+    def record_parsed(self, url: str, record):
+        """
+        Store a fetched page's hash in the frontier once it has parsed
+
+        A page that failed to parse keeps its old hash, so --incremental
+        retries it instead of treating it as unchanged.
+        """
+        content_hash = self.pending_hashes.pop(url, None)
+        if content_hash and record is not None:
+            self.frontier.record_fetch(url, content_hash, self.kind)
+
+    def due(self, urls: List[str], max_age_days: Optional[float] = None) -> List[str]:
+        """Narrow URLs to those the frontier says are worth fetching (all of them without one)"""
+        if not self.frontier:
+            return urls
+        return self.frontier.due(urls, self.kind, max_age_days=max_age_days)
+
+    def get_page(self, url: str) -> Optional[HTMLNode]:
+        """Fetch and parse a page"""
+        content = self.fetch(url)
+        if content is None:
+            return None
+        page = parse_html(content, self.parser)
+        self.record_parsed(url, page)
+        return page
+
+    def scrape_page(self, url: str) -> Optional[Record]:
+        """Scrape a single page"""
+        content = self.fetch(url)
+        if content is None:
+            return None
+        record = self.parse_page(url, content, self.parser)
+        self.record_parsed(url, record)
+        return record
+
+    def scrape_pages(self, urls: Iterable[str], fetch_workers: int = DEFAULT_FETCH_WORKERS,
+                     parse_workers: int = DEFAULT_PARSE_WORKERS) -> Iterator[Record]:
+        """Scrape many pages, fetching on threads and parsing on every core"""
+        pipeline = FetchParsePipeline(self.fetch, partial(self.parse_page, parser=self.parser),
+                                      fetch_workers=fetch_workers, parse_workers=parse_workers,
+                                      on_parsed=self.record_parsed)
+        return pipeline.imap(urls)
+
+    def open_results(self, output_prefix: str, formats: Optional[List[str]] = None) -> StreamingExporter:
+        """Open timestamped output files that records are written to as they are scraped"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        stem = OUTPUT_DIR / f'{output_prefix}_{timestamp}_{self.kind}s'
+        return StreamingExporter(outputs_for(stem, formats or ['json']), label=f'{self.kind}s')
+
+    def save_results(self, records: List[Record], output_prefix: str, formats: Optional[List[str]] = None):
+        """Save scraped data to files"""
+        with self.open_results(output_prefix, formats) as results:
+            results.write_many(records)
+
+
+def add_crawl_arguments(parser: argparse.ArgumentParser, kind: str):
+    """Add the URL, cache, frontier, parser, output and worker options both scrapers share"""
+    parser.add_argument('--urls', nargs='+', help=f'Specific {kind} URLs to scrape')
+    parser.add_argument('--urls-file', help=f'File containing {kind} URLs (one per line)')
+    parser.add_argument('--rate-limit', action='append', metavar='DOMAIN=RPS',
+                        help='Requests per second for a domain (repeatable)')
+    parser.add_argument('--cache-dir', default=str(DEFAULT_CACHE_DIR), help='HTTP response cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Always refetch pages, bypassing the cache')
+    parser.add_argument('--offline', action='store_true', help='Parse cached pages only, without any network access')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Only fetch new, changed or stale URLs, and only parse pages whose content changed')
+    parser.add_argument('--frontier-db', default=str(DEFAULT_FRONTIER_DB), help='Crawl frontier database for --incremental')
+    parser.add_argument('--max-age-days', type=float, default=7,
+                        help='With --incremental, revalidate URLs last fetched more than this many days ago')
+    parser.add_argument('--parser', choices=PARSER_CHOICES, default=DEFAULT_PARSER,
+                        help='HTML parser backend (auto = fastest installed)')
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['json'],
+                        help=f'Output formats, written as each {kind} is scraped')
+    parser.add_argument('--fetch-workers', type=int, default=DEFAULT_FETCH_WORKERS,
+                        help='Threads downloading pages (each domain is still rate limited)')
+    parser.add_argument('--parse-workers', type=int, default=DEFAULT_PARSE_WORKERS,
+                        help='Processes parsing downloaded pages (0 = parse on the main thread)')
+
+
+def check_crawl_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace):
+    """Reject conflicting options and apply --rate-limit"""
+    try:
+        get_rate_limiter().configure(args.rate_limit)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.offline and args.no_cache:
+        parser.error('--offline needs the cache; drop --no-cache')
+    if args.offline and args.incremental:
+        parser.error('--incremental tracks network fetches; drop --offline')
+
+
+def scraper_from_args(scraper_class: Type[FFFPageScraper], args: argparse.Namespace) -> FFFPageScraper:
+    """Build a scraper with the cache and frontier the options ask for"""
+    return scraper_class(
+        cache_dir=None if args.no_cache else Path(args.cache_dir),
+        offline=args.offline,
+        frontier=CrawlFrontier(Path(args.frontier_db)) if args.incremental else None,
+        parser=args.parser
+    )
+
+
+def read_urls(args: argparse.Namespace) -> Optional[List[str]]:
+    """URLs from --urls-file or --urls, or None if neither was given"""
+    if args.urls_file:
+        logger.info(f"Reading URLs from {args.urls_file}...")
+        with open(args.urls_file, 'r') as f:
+            urls = [line.strip() for line in f if line.strip()]
+        logger.info(f"Found {len(urls)} URLs in file")
+        return urls
+    if args.urls:
+        logger.info(f"Scraping {len(args.urls)} URLs from arguments")
+        return args.urls
+    return None
@@ -6,206 +6,92 @@ Scrape team data from flagfootballfinder.com
 Usage:
     python fff_team_scraper.py --urls "URL1" "URL2"
     python fff_team_scraper.py --urls-file fff_team_urls.txt
+    python fff_team_scraper.py --urls-file fff_team_urls.txt --offline
+    python fff_team_scraper.py --urls-file fff_team_urls.txt --incremental
+    python fff_team_scraper.py --urls-file fff_team_urls.txt --fetch-workers 8 --parse-workers 4
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
-import re
-import time
 import logging
-from pathlib import Path
-from datetime import datetime
-from typing import List, Dict
+from typing import Optional
+from html_parser import DEFAULT_PARSER, parse_html
+from records import TeamData
+from field_extractor import extract_fields
+from fff_common import (FFFPageScraper, add_crawl_arguments, check_crawl_arguments,
+                        read_urls, scraper_from_args)
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Configuration
-OUTPUT_DIR = Path('../../scraped_data/raw')
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-
-class FFFTeamScraper:
-    """Scraper for team pages on flagfootballfinder.com"""
-    
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'FlagFootballDirectory/1.0 (Educational purposes)',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
-        })
-        self.delay = 2
+def parse_team_page(url: str, content: bytes, parser: str = DEFAULT_PARSER) -> Optional[TeamData]:
+    """Extract a team from a fetched page (runs in pipeline worker processes)"""
+    page = parse_html(content, parser)
+    
+    try:
+        # Extract team name
+        name_elem = page.select_one('h1')
+        name = name_elem.text.strip() if name_elem else None
         
-    def get_page(self, url: str):
-        """Fetch a page with error handling"""
-        try:
-            logger.info(f"Fetching: {url}")
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            time.sleep(self.delay)
-            return BeautifulSoup(response.content, 'html.parser')
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {e}")
+        if not name:
+            # Try getting from title
+            title = page.select_one('title')
+            if title:
+                name = title.text.split('|')[0].strip()
+        
+        if not name:
+            logger.warning(f"No name found for {url}")
             return None
-    
-    def extract_location(self, text: str) -> tuple:
-        """Extract city and state from text"""
-        pattern = r'(?:in\s+)?([A-Za-z\s]+),\s*([A-Z]{2})'
-        match = re.search(pattern, text)
-        if match:
-            return match.group(1).strip(), match.group(2).strip()
-        return None, None
-    
-    def extract_age_groups(self, text: str) -> List[str]:
-        """Extract age groups from text"""
-        age_groups = []
         
-        # Pattern 1: ages X to Y, ages X-Y
-        match = re.search(r'ages?\s+(\d+)\s*(?:to|-)\s*(\d+)', text, re.IGNORECASE)
-        if match:
-            start = int(match.group(1))
-            end = int(match.group(2))
-            age_groups = [f"{age}U" for age in range(start, end + 1, 2)]
+        # Get full text content
+        text = page.text
         
-        # Pattern 2: specific divisions like "5U", "8U"
-        divisions = re.findall(r'\b(\d+U)\b', text)
-        if divisions:
-            age_groups.extend(divisions)
+        # Every regex-derived field in one pass over the text
+        fields = extract_fields(text)
+        city, state = fields.city, fields.state
         
-        return list(set(age_groups)) if age_groups else []
-    
-    def extract_formats(self, text: str) -> List[str]:
-        """Extract game formats from text"""
-        formats = []
-        if '5v5' in text.lower() or '5 v 5' in text.lower():
-            formats.append('5v5')
-        if '7v7' in text.lower() or '7 v 7' in text.lower():
-            formats.append('7v7')
-        return formats if formats else ['7v7']  # Default
-    
-    def extract_gender(self, text: str) -> str:
-        """Extract gender from text"""
-        text_lower = text.lower()
+        if not city or not state:
+            logger.warning(f"No location found for {name}")
+            return None
         
-        if 'all-girls' in text_lower or 'girls only' in text_lower or 'girls-only' in text_lower:
-            return 'F'
-        elif 'boys only' in text_lower or 'boys-only' in text_lower:
-            return 'M'
-        elif 'co-ed' in text_lower or 'coed' in text_lower or 'mixed' in text_lower:
-            return 'coed'
+        # Extract about/description
+        about = None
+        desc_elem = page.select_one('p')
+        if desc_elem:
+            about = desc_elem.text.strip()[:500]  # First 500 chars
         
-        return 'coed'  # Default
-    
-    def extract_comp_level(self, text: str) -> List[str]:
-        """Extract competitive level from text"""
-        text_lower = text.lower()
-        levels = []
+        # Build team data
+        team = TeamData(
+            name=name,
+            city=city,
+            state=state,
+            gender=fields.gender or 'coed',  # Default to coed
+            age_groups=fields.age_groups,
+            formats=fields.formats or ['7v7'],  # Default to 7v7
+            comp_levels=fields.comp_levels or ['rec'],  # Default to recreational
+            contact_type='non-contact',
+            website=url,
+            contact_email=fields.email,
+            about=about,
+            source='flagfootballfinder.com'
+        )
         
-        if 'competitive' in text_lower or 'elite' in text_lower or 'travel' in text_lower:
-            levels.append('competitive')
-        if 'recreational' in text_lower or 'beginner' in text_lower:
-            levels.append('rec')
+        logger.info(f"✅ Scraped team: {name} in {city}, {state}")
+        return team
         
-        return levels if levels else ['rec']  # Default to recreational
+    except Exception as e:
+        logger.error(f"Error parsing team page {url}: {e}")
+        return None
+
+
+class FFFTeamScraper(FFFPageScraper):
+    """Scraper for team pages on flagfootballfinder.com"""
     
-    def scrape_team_page(self, url: str) -> Dict:
-        """Scrape a single team page"""
-        soup = self.get_page(url)
-        if not soup:
-            return None
-        
-        try:
-            # Extract team name
-            name_elem = soup.find('h1')
-            name = name_elem.text.strip() if name_elem else None
-            
-            if not name:
-                # Try getting from title
-                title = soup.find('title')
-                if title:
-                    name = title.text.split('|')[0].strip()
-            
-            if not name:
-                logger.warning(f"No name found for {url}")
-                return None
-            
-            # Get full text content
-            text = soup.get_text()
-            
-            # Extract location
-            city, state = self.extract_location(text)
-            
-            if not city or not state:
-                logger.warning(f"No location found for {name}")
-                return None
-            
-            # Extract age groups
-            age_groups = self.extract_age_groups(text)
-            
-            # Extract formats
-            formats = self.extract_formats(text)
-            
-            # Extract gender
-            gender = self.extract_gender(text)
-            
-            # Extract competitive level
-            comp_levels = self.extract_comp_level(text)
-            
-            # Look for contact email
-            email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-            email_match = re.search(email_pattern, text)
-            contact_email = email_match.group(0) if email_match else None
-            
-            # Extract about/description
-            about = None
-            desc_elem = soup.find('p')
-            if desc_elem:
-                about = desc_elem.text.strip()[:500]  # First 500 chars
-            
-            # Build team data
-            team = {
-                'name': name,
-                'city': city,
-                'state': state,
-                'gender': gender,
-                'age_groups': age_groups,
-                'formats': formats,
-                'comp_levels': comp_levels,
-                'contact_type': 'non-contact',
-                'website': url,
-                'contact_email': contact_email,
-                'about': about,
-                'source': 'flagfootballfinder.com'
-            }
-            
-            logger.info(f"✅ Scraped team: {name} in {city}, {state}")
-            return team
-            
-        except Exception as e:
-            logger.error(f"Error parsing team page {url}: {e}")
-            return None
+    kind = 'team'
+    parse_page = staticmethod(parse_team_page)
     
-    def save_results(self, teams: List[Dict], output_prefix: str):
-        """Save scraped data to files"""
-        if not teams:
-            logger.warning("No teams to save")
-            return
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Save as JSON
-        json_file = OUTPUT_DIR / f'{output_prefix}_{timestamp}_teams.json'
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(teams, f, indent=2, ensure_ascii=False)
-        logger.info(f"💾 Saved {len(teams)} teams to {json_file}")
-        
-        # Save in Supabase-ready format
-        supabase_file = OUTPUT_DIR / f'{output_prefix}_{timestamp}_teams_supabase.json'
-        with open(supabase_file, 'w', encoding='utf-8') as f:
-            json.dump(teams, f, indent=2, ensure_ascii=False)
-        logger.info(f"💾 Saved Supabase format to {supabase_file}")
+    scrape_team_page = FFFPageScraper.scrape_page
+    scrape_team_pages = FFFPageScraper.scrape_pages
 
 
 def main():
@@ -214,46 +100,31 @@ def main():
     
     parser = argparse.ArgumentParser(description='Scrape teams from flagfootballfinder.com')
     parser.add_argument('--output', default='flagfootballfinder_teams', help='Output filename prefix')
-    parser.add_argument('--urls', nargs='+', help='Specific team URLs to scrape')
-    parser.add_argument('--urls-file', help='File containing team URLs (one per line)')
+    add_crawl_arguments(parser, 'team')
     
     args = parser.parse_args()
+    check_crawl_arguments(parser, args)
     
     logger.info("="*60)
     logger.info("FLAG FOOTBALL FINDER - TEAM SCRAPER")
     logger.info("="*60)
     
-    scraper = FFFTeamScraper()
+    scraper = scraper_from_args(FFFTeamScraper, args)
     
     # Collect URLs to scrape
-    urls_to_scrape = []
-    
-    if args.urls_file:
-        # Read URLs from file
-        logger.info(f"Reading URLs from {args.urls_file}...")
-        with open(args.urls_file, 'r') as f:
-            urls_to_scrape = [line.strip() for line in f if line.strip()]
-        logger.info(f"Found {len(urls_to_scrape)} URLs in file")
-    elif args.urls:
-        # Use URLs provided as arguments
-        urls_to_scrape = args.urls
-        logger.info(f"Scraping {len(urls_to_scrape)} URLs from arguments")
-    else:
+    urls_to_scrape = read_urls(args)
+    if urls_to_scrape is None:
         logger.error("No URLs provided! Use --urls or --urls-file")
         return
+    urls_to_scrape = scraper.due(urls_to_scrape, max_age_days=args.max_age_days)
     
-    # Scrape the teams
-    teams = []
-    for url in urls_to_scrape:
-        team = scraper.scrape_team_page(url)
-        if team:
-            teams.append(team)
-    
-    # Save results
-    scraper.save_results(teams, args.output)
+    # Scrape the teams, saving each one as soon as it is parsed
+    with scraper.open_results(args.output, args.format) as results:
+        teams = scraper.scrape_team_pages(urls_to_scrape, args.fetch_workers, args.parse_workers)
+        results.write_many(teams)
     
     logger.info("="*60)
-    logger.info(f"✅ Scraping complete! Found {len(teams)} teams")
+    logger.info(f"✅ Scraping complete! Found {results.count} teams")
     logger.info("="*60)
     logger.info("\nNext steps:")
     logger.info("1. Review the output file")
@@ -4,30 +4,31 @@ Flag Football Finder - URL Discovery with Selenium
 Automatically discover all league and team URLs from flagfootballfinder.com
 
 This script:
-1. Loads the directory pages with Selenium (handles JavaScript)
-2. Scrolls to load all content (handles infinite scroll/pagination)
-3. Extracts all league and team URLs
-4. Saves them to files for further scraping
+1. Reads robots.txt and sitemap.xml over plain HTTP (no browser needed)
+2. Falls back to loading the directory pages with Selenium (handles JavaScript)
+   for any URL type the sitemap does not list
+3. Scrolls to load all content (handles infinite scroll/pagination)
+4. Extracts all league and team URLs
+5. Saves them to files for further scraping
 
 Usage:
     python fff_url_discovery.py --type leagues
     python fff_url_discovery.py --type teams
     python fff_url_discovery.py --type all
+    python fff_url_discovery.py --type all --method sitemap --sitemap-file sitemap.xml
+    python fff_url_discovery.py --type all --method selenium --headless --workers 3 --block-resources
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-import time
 import json
 import logging
 from pathlib import Path
-from typing import List, Set
+from typing import Dict, List, Optional
 import argparse
+from selenium_helpers import DEFAULT_MAX_WAIT, PageReadiness, collect_links
+from browser_pool import DEFAULT_RECYCLE_AFTER, BrowserPool
+from sitemap_discovery import FFF_BASE_URL, SitemapDiscovery
+from crawl_frontier import DEFAULT_FRONTIER_DB, CrawlFrontier
 
 # Setup logging
 logging.basicConfig(
@@ -44,51 +45,66 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 class FFFUrlDiscovery:
     """Discover all league and team URLs from Flag Football Finder"""
     
-    def __init__(self, headless: bool = True):
-        """Initialize Selenium WebDriver"""
-        chrome_options = Options()
-        
-        if headless:
-            chrome_options.add_argument('--headless=new')
-        
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+    def __init__(self, headless: bool = True, max_wait: float = DEFAULT_MAX_WAIT,
+                 pool: Optional[BrowserPool] = None):
+        """
+        Initialize URL discovery
         
-        # Automatically manage ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 10)
+        Args:
+            headless: Run Chrome without a window (ignored when pool is given)
+            max_wait: Upper bound in seconds on waiting for a page to render
+            pool: Shared browser pool; a single-driver pool is created if omitted
+        """
+        self.pool = pool or BrowserPool(size=1, headless=headless)
+        self.owns_pool = pool is None
+        self.max_wait = max_wait
         
-        logger.info("✅ Selenium WebDriver initialized")
+        logger.info("✅ URL discovery initialized")
     
     def __del__(self):
         """Clean up WebDriver"""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        if getattr(self, 'owns_pool', False):
+            self.pool.close()
+    
+    def discover(self, url_types: List[str]) -> Dict[str, List[str]]:
+        """
+        Discover several URL types in parallel across the browser pool
+        
+        Args:
+            url_types: Any of 'leagues', 'teams', 'organizations'
+        
+        Returns:
+            Dictionary of URL type -> discovered URLs
+        """
+        discoverers = {
+            'leagues': self._discover_league_urls,
+            'teams': self._discover_team_urls,
+            'organizations': self._discover_organization_urls,
+        }
+        results = self.pool.map(lambda driver, url_type: discoverers[url_type](driver), url_types)
+        return dict(zip(url_types, results))
     
-    def scroll_to_load_all(self, pause_time: float = 2.0, max_scrolls: int = 50):
+    def scroll_to_load_all(self, driver, pause_time: float = 2.0, max_scrolls: int = 50):
         """
         Scroll down to load all content (handles infinite scroll)
         
         Args:
-            pause_time: Seconds to wait between scrolls
+            driver: WebDriver showing the directory page
+            pause_time: Longest to wait for new content after each scroll
             max_scrolls: Maximum number of scroll attempts
         """
         logger.info("Scrolling to load all content...")
+        ready = PageReadiness(driver, max_wait=self.max_wait)
         
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
+        last_height = driver.execute_script("return document.body.scrollHeight")
         scrolls = 0
         
         while scrolls < max_scrolls:
             # Scroll to bottom
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(pause_time)
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             
-            # Calculate new scroll height
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
+            # Wait for new content, returning as soon as the page grows
+            new_height = ready.page_growth(last_height, timeout=pause_time)
             
             # Check if we've reached the bottom
             if new_height == last_height:
@@ -103,13 +119,15 @@ class FFFUrlDiscovery:
         
         logger.info("✅ Finished loading all content")
     
-    def click_load_more_buttons(self, max_clicks: int = 20):
+    def click_load_more_buttons(self, driver, max_clicks: int = 20):
         """
         Click 'Load More' or 'Show More' buttons repeatedly
         
         Args:
+            driver: WebDriver showing the directory page
             max_clicks: Maximum number of times to click
         """
+        ready = PageReadiness(driver, max_wait=self.max_wait)
         clicks = 0
         
         # Common load more button selectors
@@ -127,13 +145,13 @@ class FFFUrlDiscovery:
             for selector in button_selectors:
                 try:
                     # Try to find and click button
-                    buttons = self.driver.find_elements(By.XPATH, f"//*[contains(text(), 'Load More') or contains(text(), 'Show More')]")
+                    buttons = driver.find_elements(By.XPATH, f"//*[contains(text(), 'Load More') or contains(text(), 'Show More')]")
                     
                     if buttons:
                         button = buttons[0]
                         if button.is_displayed() and button.is_enabled():
                             button.click()
-                            time.sleep(2)
+                            ready.settled(timeout=2)
                             clicks += 1
                             button_found = True
                             logger.info(f"Clicked 'Load More' button ({clicks} times)")
@@ -152,45 +170,34 @@ class FFFUrlDiscovery:
         Returns:
             List of unique league URLs
         """
+        with self.pool.driver() as driver:
+            return self._discover_league_urls(driver)
+    
+    def _discover_league_urls(self, driver) -> List[str]:
+        """Collect league URLs on a borrowed driver"""
+        ready = PageReadiness(driver, max_wait=self.max_wait)
         url = "https://www.flagfootballfinder.com/youth-flag-football-leagues"
         logger.info(f"🔍 Discovering league URLs from: {url}")
         
         try:
             # Load the page
-            self.driver.get(url)
+            driver.get(url)
             logger.info("Page loaded, waiting for content...")
             
             # Wait for content to load
-            time.sleep(3)
+            ready.settled()
             
             # Scroll to load all content
-            self.scroll_to_load_all(pause_time=2, max_scrolls=30)
+            self.scroll_to_load_all(driver, pause_time=2, max_scrolls=30)
             
             # Try to click any "Load More" buttons
-            self.click_load_more_buttons(max_clicks=10)
-            
-            # Give it one more second to load
-            time.sleep(2)
-            
-            # Extract all league links
-            league_urls = set()
-            
-            # Find all links that contain '/leagues/'
-            links = self.driver.find_elements(By.TAG_NAME, 'a')
+            self.click_load_more_buttons(driver, max_clicks=10)
             
-            for link in links:
-                try:
-                    href = link.get_attribute('href')
-                    if href and '/leagues/' in href and href not in league_urls:
-                        # Clean URL (remove query params if any)
-                        clean_url = href.split('?')[0].split('#')[0]
-                        if clean_url.endswith('/leagues/') or len(clean_url.split('/leagues/')[1]) > 0:
-                            league_urls.add(clean_url)
-                except:
-                    continue
+            # Let anything triggered by the last scroll/click finish
+            ready.settled()
             
-            # Convert to sorted list
-            league_urls = sorted(list(league_urls))
+            # Extract all league links in one round-trip
+            league_urls = collect_links(driver, contains=['/leagues/'])
             
             logger.info(f"✅ Found {len(league_urls)} unique league URLs")
             return league_urls
@@ -206,45 +213,34 @@ class FFFUrlDiscovery:
         Returns:
             List of unique team URLs
         """
+        with self.pool.driver() as driver:
+            return self._discover_team_urls(driver)
+    
+    def _discover_team_urls(self, driver) -> List[str]:
+        """Collect team URLs on a borrowed driver"""
+        ready = PageReadiness(driver, max_wait=self.max_wait)
         url = "https://www.flagfootballfinder.com/youth-flag-football-teams"
         logger.info(f"🔍 Discovering team URLs from: {url}")
         
         try:
             # Load the page
-            self.driver.get(url)
+            driver.get(url)
             logger.info("Page loaded, waiting for content...")
             
             # Wait for content to load
-            time.sleep(3)
+            ready.settled()
             
             # Scroll to load all content
-            self.scroll_to_load_all(pause_time=2, max_scrolls=30)
+            self.scroll_to_load_all(driver, pause_time=2, max_scrolls=30)
             
             # Try to click any "Load More" buttons
-            self.click_load_more_buttons(max_clicks=10)
+            self.click_load_more_buttons(driver, max_clicks=10)
             
-            # Give it one more second to load
-            time.sleep(2)
-            
-            # Extract all team links
-            team_urls = set()
-            
-            # Find all links that contain '/teams/'
-            links = self.driver.find_elements(By.TAG_NAME, 'a')
-            
-            for link in links:
-                try:
-                    href = link.get_attribute('href')
-                    if href and '/teams/' in href and href not in team_urls:
-                        # Clean URL (remove query params if any)
-                        clean_url = href.split('?')[0].split('#')[0]
-                        if clean_url.endswith('/teams/') or len(clean_url.split('/teams/')[1]) > 0:
-                            team_urls.add(clean_url)
-                except:
-                    continue
+            # Let anything triggered by the last scroll/click finish
+            ready.settled()
             
-            # Convert to sorted list
-            team_urls = sorted(list(team_urls))
+            # Extract all team links in one round-trip
+            team_urls = collect_links(driver, contains=['/flag-football-team/', '/teams/'])
             
             logger.info(f"✅ Found {len(team_urls)} unique team URLs")
             return team_urls
@@ -260,30 +256,22 @@ class FFFUrlDiscovery:
         Returns:
             List of unique organization URLs
         """
+        with self.pool.driver() as driver:
+            return self._discover_organization_urls(driver)
+    
+    def _discover_organization_urls(self, driver) -> List[str]:
+        """Collect organization URLs on a borrowed driver"""
+        ready = PageReadiness(driver, max_wait=self.max_wait)
         url = "https://www.flagfootballfinder.com"
         logger.info(f"🔍 Discovering organization URLs from: {url}")
         
         try:
             # Load the page
-            self.driver.get(url)
-            time.sleep(3)
-            
-            # Extract all organization links
-            org_urls = set()
-            
-            # Find all links that contain '/organizations/'
-            links = self.driver.find_elements(By.TAG_NAME, 'a')
-            
-            for link in links:
-                try:
-                    href = link.get_attribute('href')
-                    if href and '/organizations/' in href and href not in org_urls:
-                        clean_url = href.split('?')[0].split('#')[0]
-                        org_urls.add(clean_url)
-                except:
-                    continue
+            driver.get(url)
+            ready.settled()
             
-            org_urls = sorted(list(org_urls))
+            # Extract all organization links in one round-trip
+            org_urls = collect_links(driver, contains=['/organizations/'])
             
             logger.info(f"✅ Found {len(org_urls)} unique organization URLs")
             return org_urls
@@ -322,11 +310,60 @@ def main():
         default='all',
         help='Type of URLs to discover'
     )
+    parser.add_argument(
+        '--method',
+        choices=['auto', 'sitemap', 'selenium'],
+        default='auto',
+        help='sitemap: HTTP only; selenium: render directory pages; '
+             'auto: sitemap first, Selenium for types the sitemap does not list'
+    )
+    parser.add_argument(
+        '--sitemap-file',
+        action='append',
+        default=[],
+        metavar='PATH',
+        help='Read a local sitemap instead of the live one (repeatable)'
+    )
+    parser.add_argument(
+        '--frontier-db',
+        default=str(DEFAULT_FRONTIER_DB),
+        help='Crawl frontier database that records discovered URLs and sitemap lastmods'
+    )
     parser.add_argument(
         '--headless',
         action='store_true',
         help='Run browser in headless mode (no visible window)'
     )
+    parser.add_argument(
+        '--max-wait',
+        type=float,
+        default=DEFAULT_MAX_WAIT,
+        help='Upper bound in seconds on waiting for each page to render'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of headless browsers discovering in parallel'
+    )
+    parser.add_argument(
+        '--recycle-after',
+        type=int,
+        default=DEFAULT_RECYCLE_AFTER,
+        help='Pages each browser renders before it is restarted (0 = never)'
+    )
+    parser.add_argument(
+        '--block-resources',
+        action='store_true',
+        help='Skip images, fonts, CSS, media and third-party scripts'
+    )
+    parser.add_argument(
+        '--allow-host',
+        action='append',
+        default=[],
+        metavar='HOST',
+        help='Host to never block with --block-resources (repeatable)'
+    )
     
     args = parser.parse_args()
     
@@ -334,31 +371,49 @@ def main():
     logger.info("FLAG FOOTBALL FINDER - URL DISCOVERY")
     logger.info("="*70)
     
-    # Initialize scraper
-    discoverer = FFFUrlDiscovery(headless=args.headless)
+    url_types = ['leagues', 'teams', 'organizations'] if args.type == 'all' else [args.type]
+    results: Dict[str, List[str]] = {}
+    lastmods: Dict[str, str] = {}
     
-    try:
-        # Discover URLs based on type
-        if args.type in ['leagues', 'all']:
-            logger.info("\n" + "="*70)
-            logger.info("DISCOVERING LEAGUE URLs")
-            logger.info("="*70)
-            league_urls = discoverer.discover_league_urls()
-            discoverer.save_urls(league_urls, 'fff_league_urls')
+    if args.method in ['auto', 'sitemap']:
+        logger.info("\n" + "="*70)
+        logger.info("READING SITEMAPS")
+        logger.info("="*70)
         
-        if args.type in ['teams', 'all']:
+        sitemap_results = SitemapDiscovery().discover(FFF_BASE_URL, url_types, args.sitemap_file)
+        for url_type, entries in sitemap_results.items():
+            if entries or args.method == 'sitemap':
+                results[url_type] = [entry.url for entry in entries]
+                lastmods.update({entry.url: entry.lastmod for entry in entries if entry.lastmod})
+    
+    # The pool only launches Chrome if Selenium discovery actually runs
+    pool = BrowserPool(
+        size=args.workers,
+        headless=args.headless,
+        recycle_after=args.recycle_after,
+        block_resources=args.block_resources,
+        allow_hosts=args.allow_host
+    )
+    discoverer = FFFUrlDiscovery(max_wait=args.max_wait, pool=pool)
+    
+    try:
+        # Render directory pages for anything the sitemap did not cover
+        selenium_types = [url_type for url_type in url_types if url_type not in results]
+        if selenium_types:
             logger.info("\n" + "="*70)
-            logger.info("DISCOVERING TEAM URLs")
+            logger.info(f"DISCOVERING {', '.join(selenium_types).upper()} URLs WITH SELENIUM")
             logger.info("="*70)
-            team_urls = discoverer.discover_team_urls()
-            discoverer.save_urls(team_urls, 'fff_team_urls')
+            
+            results.update(discoverer.discover(selenium_types))
         
-        if args.type in ['organizations', 'all']:
-            logger.info("\n" + "="*70)
-            logger.info("DISCOVERING ORGANIZATION URLs")
-            logger.info("="*70)
-            org_urls = discoverer.discover_organization_urls()
-            discoverer.save_urls(org_urls, 'fff_organization_urls')
+        # Remember every URL so incremental scrapes know what is new or changed
+        frontier = CrawlFrontier(Path(args.frontier_db))
+        for url_type in url_types:
+            kind = url_type.rstrip('s')
+            new_urls = frontier.add(results[url_type], kind, lastmods)
+            logger.info(f"🧭 {new_urls} {url_type} URLs are new since the last discovery")
+            discoverer.save_urls(results[url_type], f'fff_{kind}_urls')
+        frontier.close()
         
         logger.info("\n" + "="*70)
         logger.info("✅ URL DISCOVERY COMPLETE!")
@@ -384,7 +439,7 @@ def main():
         
     finally:
         # Cleanup
-        del discoverer
+        pool.close()
 
 
 if __name__ == '__main__':
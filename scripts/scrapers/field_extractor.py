@@ -0,0 +1,298 @@
+"""
+Field Extractor
+===============
+Pull every regex-derived field out of a page's text in one pass.
+
+The scrapers used to run a separate search per field (email, phone, price,
+location, age groups, formats, season, gender, competitive level), each
+re-scanning the whole page text, several with patterns rebuilt on every call
+or with repeated text.lower(). Here every field is one named alternative of
+a single precompiled pattern; one finditer() over the text dispatches each
+match to its field, and extract_fields() returns them all together.
+
+Location matches are anchored on the ", ST" or ", State" part. The city is
+the longest city the gazetteer knows in that state ending at the comma
+(see gazetteer.py), so the words before it never leak into the name. For
+places the gazetteer lacks, the capitalized words before the comma are used,
+but only when the page names no known city at all.
+
+Usage:
+    from field_extractor import extract_fields
+
+    fields = extract_fields(page.text)
+    fields.email, fields.city, fields.state, fields.age_groups, fields.season
+
+    python field_extractor.py --benchmark page.html other_page.html
+"""
+
+import argparse
+import re
+import string
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from gazetteer import STATE_BY_NAME, US_STATES, city_before
+
+# Approximate season windows (month-day)
+SEASON_DATES = {
+    'spring': ('03-01', '05-31'),
+    'summer': ('06-01', '08-31'),
+    'fall': ('09-01', '11-30'),
+    'winter': ('12-01', '02-28'),
+}
+
+# Keyword -> value for the keyword fields
+GENDER_KEYWORDS = {
+    'all-girls': 'F', 'girls only': 'F', 'girls-only': 'F',
+    'boys only': 'M', 'boys-only': 'M',
+    'co-ed': 'coed', 'coed': 'coed', 'mixed': 'coed',
+}
+GENDER_PRIORITY = ('F', 'M', 'coed')
+COMP_LEVEL_KEYWORDS = {
+    'competitive': 'competitive', 'elite': 'competitive', 'travel': 'competitive',
+    'recreational': 'rec', 'beginner': 'rec',
+}
+COMP_LEVEL_ORDER = ('competitive', 'rec')
+
+
+def _keywords(words) -> str:
+    # Longest first, so 'girls-only' is preferred over a shorter overlapping word
+    return '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+
+# One pattern for every field, matched against the ASCII-lowercased text so no
+# alternative needs re.IGNORECASE. Alternatives that start with a fixed
+# character come first; the rest only start after a non-alphanumeric. Emails
+# and locations are anchored on '@' and ', ST' and read backwards from there.
+# finditer() never revisits consumed text, so parts another field may also
+# need are only looked at, not consumed: the state after a comma (", co-ed"
+# is not Colorado) and the upper bound of an age range ("Ages 5-12U").
+FIELD_PATTERN = re.compile('|'.join([
+    r'@(?P<email>[a-z0-9.-]+\.[a-z]{2,})\b',
+    r'\$\s*(?P<price>\d+(?:,\d{3})*(?:\.\d{2})?)',
+    r',(?=\s*(?:(?P<state_name>' + _keywords(STATE_BY_NAME) + r')|(?P<state>[a-z]{2}))\b)',
+    r'(?P<area_phone>\(\d{3}\)[-.\s]?\d{3}[-.\s]?\d{4})\b',
+    r'(?<![a-z0-9])(?:' + '|'.join([
+        r'(?P<phone>\d{3}[-.\s]?\d{3}[-.\s]?\d{4})\b',
+        r'(?P<division>\d+u)\b',
+        r'(?P<format>[57])\s?v\s?(?P=format)\b',
+        r'ages?\s+(?P<age_from>\d+)\s*(?:to|-)\s*(?=(?P<age_to>\d+))',
+        r'(?P<season>spring|summer|fall|winter)\b',
+        r'(?P<adult>adults?)\b',
+        r'(?P<gender>' + _keywords(GENDER_KEYWORDS) + r')',
+        r'(?P<comp_level>' + _keywords(COMP_LEVEL_KEYWORDS) + r')',
+    ]) + r')',
+]))
+
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+EMAIL_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + '._%+-')
+# Up to three capitalized words at the end of a line: a city the gazetteer lacks
+UNKNOWN_CITY = re.compile(r"(?<![A-Za-z'.-])(?:[A-Z][A-Za-z'.-]*[ \t]+){0,2}[A-Z][A-Za-z'.-]*[ \t]*$")
+MAX_CITY_LENGTH = 40
+
+
+@dataclass(slots=True)
+class PageFields:
+    """Everything extract_fields() found in one page's text"""
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    price: Optional[float] = None
+    city: Optional[str] = None
+    state: Optional[str] = None
+    age_groups: List[str] = field(default_factory=list)  # e.g. ['6U', '8U'], youngest first
+    formats: List[str] = field(default_factory=list)  # '5v5' / '7v7'
+    season: Optional[str] = None  # first season named: spring, summer, fall or winter
+    gender: Optional[str] = None  # 'F', 'M' or 'coed' if the page says so
+    comp_levels: List[str] = field(default_factory=list)  # 'competitive' / 'rec'
+    adult: bool = False  # mentions adult divisions
+
+    def season_dates(self, year: Optional[int] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Approximate (start, end) dates of the season, or (None, None)"""
+        if not self.season:
+            return None, None
+        year = year or datetime.now().year
+        start, end = SEASON_DATES[self.season]
+        return f"{year}-{start}", f"{year}-{end}"
+
+
+def _run_before(text: str, end: int, chars: frozenset) -> int:
+    """Start of the run of chars that ends at text[end]"""
+    start = end
+    while start > 0 and text[start - 1] in chars:
+        start -= 1
+    return start
+
+
+def _unknown_city_before(text: str, comma: int) -> Optional[str]:
+    """The capitalized words ending at text[comma], for cities not in the gazetteer"""
+    match = UNKNOWN_CITY.search(text, max(0, comma - MAX_CITY_LENGTH), comma)
+    return ' '.join(match.group(0).split()) if match else None
+
+
+def extract_fields(text: str) -> PageFields:
+    """Scan text once and return every field found"""
+    fields = PageFields()
+    if not text:
+        return fields
+
+    ages = set()
+    formats = set()
+    genders = set()
+    levels = set()
+    unknown_location = None
+
+    # Same length as text, so match offsets index the original too
+    lowered = text.translate(ASCII_LOWER)
+    for match in FIELD_PATTERN.finditer(lowered):
+        kind = match.lastgroup
+        if kind == 'email':
+            local_start = _run_before(text, match.start(), EMAIL_LOCAL_CHARS)
+            if fields.email is None and local_start < match.start():
+                fields.email = text[local_start:match.end()]
+        elif kind == 'price':
+            if fields.price is None:
+                fields.price = float(match.group('price').replace(',', ''))
+        elif kind in ('state', 'state_name'):
+            if fields.state is not None:
+                continue
+            if kind == 'state':
+                # Codes must be written in capitals: ", in" is not Indiana
+                state = text[match.start('state'):match.end('state')]
+            else:
+                state = STATE_BY_NAME[match.group('state_name')]
+            if state not in US_STATES:
+                continue
+            city = city_before(text, match.start(), state)
+            if city:
+                fields.city, fields.state = city, state
+            elif unknown_location is None:
+                city = _unknown_city_before(text, match.start())
+                if city:
+                    unknown_location = city, state
+        elif kind in ('phone', 'area_phone'):
+            if fields.phone is None:
+                fields.phone = text[match.start(kind):match.end(kind)]
+        elif kind == 'division':
+            ages.add(match.group('division').upper())
+        elif kind == 'format':
+            formats.add(f"{match.group('format')}v{match.group('format')}")
+        elif kind == 'age_to':
+            start, end = int(match.group('age_from')), int(match.group('age_to'))
+            ages.update(f"{age}U" for age in range(start, end + 1, 2))
+        elif kind == 'season':
+            if fields.season is None:
+                fields.season = match.group('season')
+        elif kind == 'adult':
+            fields.adult = True
+        elif kind == 'gender':
+            genders.add(GENDER_KEYWORDS[match.group('gender')])
+        elif kind == 'comp_level':
+            levels.add(COMP_LEVEL_KEYWORDS[match.group('comp_level')])
+
+    if fields.state is None and unknown_location:
+        fields.city, fields.state = unknown_location
+    fields.age_groups = sorted(ages, key=lambda age: int(age[:-1]))
+    fields.formats = sorted(formats)
+    fields.gender = next((gender for gender in GENDER_PRIORITY if gender in genders), None)
+    fields.comp_levels = [level for level in COMP_LEVEL_ORDER if level in levels]
+    return fields
+
+
+def _per_field_baseline(text: str) -> Dict:
+    """The old approach, one search per field with patterns built per call, for --benchmark"""
+    result = {}
+    result['email'] = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    result['phone'] = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', text)
+    result['price'] = re.search(r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)', text)
+    states = '|'.join(sorted(US_STATES))
+    result['location'] = re.search(r'([A-Za-z\s]+),\s*(' + states + r')\b', text)
+    result['ages'] = re.search(r'ages?\s+(\d+)\s*(?:to|-)\s*(\d+)', text, re.IGNORECASE)
+    result['divisions'] = re.findall(r'\b(\d+U)\b', text)
+    result['formats'] = [f for f, words in (('5v5', ('5v5', '5 v 5')), ('7v7', ('7v7', '7 v 7')))
+                         if any(word in text.lower() for word in words)]
+    result['season'] = re.search(r'(spring|summer|fall|winter)\s+(?:season)?', text, re.IGNORECASE)
+    result['gender'] = [word for word in GENDER_KEYWORDS if word in text.lower()]
+    result['comp_levels'] = [word for word in COMP_LEVEL_KEYWORDS if word in text.lower()]
+    return result
+
+
+def compare_with_baseline(text: str) -> List[str]:
+    """
+    Fields the per-field searches find that extract_fields() misses or reads differently
+
+    Locations are not compared: the baseline takes every word before the
+    comma as the city, which the gazetteer lookup deliberately does not.
+    """
+    fields = extract_fields(text)
+    baseline = _per_field_baseline(text)
+    mismatches = []
+
+    def differs(name: str, expected, actual):
+        mismatches.append(f"{name}: per-field found {expected!r}, single-pass has {actual!r}")
+
+    if baseline['email'] and baseline['email'].group(0) != fields.email:
+        differs('email', baseline['email'].group(0), fields.email)
+    if baseline['phone'] and baseline['phone'].group(0) != fields.phone:
+        differs('phone', baseline['phone'].group(0), fields.phone)
+    if baseline['price'] and float(baseline['price'].group(1).replace(',', '')) != fields.price:
+        differs('price', baseline['price'].group(1), fields.price)
+
+    ages = {division.upper() for division in baseline['divisions']}
+    if baseline['ages']:
+        start, end = int(baseline['ages'].group(1)), int(baseline['ages'].group(2))
+        ages.update(f"{age}U" for age in range(start, end + 1, 2))
+    if not ages <= set(fields.age_groups):
+        differs('age_groups', sorted(ages, key=lambda age: int(age[:-1])), fields.age_groups)
+
+    if not set(baseline['formats']) <= set(fields.formats):
+        differs('formats', baseline['formats'], fields.formats)
+    if baseline['season'] and baseline['season'].group(1).lower() != fields.season:
+        differs('season', baseline['season'].group(1).lower(), fields.season)
+
+    genders = {GENDER_KEYWORDS[word] for word in baseline['gender']}
+    gender = next((gender for gender in GENDER_PRIORITY if gender in genders), None)
+    if gender != fields.gender:
+        differs('gender', gender, fields.gender)
+    levels = {COMP_LEVEL_KEYWORDS[word] for word in baseline['comp_levels']}
+    if not levels <= set(fields.comp_levels):
+        differs('comp_levels', sorted(levels), fields.comp_levels)
+
+    return mismatches
+
+
+def benchmark(text: str, rounds: int = 50) -> Dict[str, float]:
+    """Average seconds per page for the per-field searches and the single pass"""
+    results = {}
+    for name, extract in (('per-field', _per_field_baseline), ('single-pass', extract_fields)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            extract(text)
+        results[name] = (time.perf_counter() - start) / rounds
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark single-pass field extraction on saved pages')
+    parser.add_argument('--benchmark', nargs='+', required=True, metavar='FILE',
+                        help='HTML (or plain text) files to extract from')
+    parser.add_argument('--rounds', type=int, default=50, help='Extractions per file and method')
+    args = parser.parse_args()
+
+    from html_parser import parse_html
+
+    for path in args.benchmark:
+        with open(path, 'rb') as f:
+            text = parse_html(f.read()).text
+        results = benchmark(text, args.rounds)
+        print(f"{path} ({len(text) // 1024} KB of text)")
+        for name, seconds in results.items():
+            print(f"  {name:12} {seconds * 1000:8.3f} ms")
+        print(f"  speedup      {results['per-field'] / results['single-pass']:8.1f}x")
+        print(f"  fields       {extract_fields(text)}")
+        for mismatch in compare_with_baseline(text):
+            print(f"  ⚠️  {mismatch}")
+
+
+if __name__ == '__main__':
+    main()
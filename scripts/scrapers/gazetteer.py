@@ -0,0 +1,222 @@
+"""
+Gazetteer
+=========
+Match US city/state pairs in text against a bundled list of places.
+
+us_cities.csv (next to this module) lists about 4,600 US cities, towns and
+suburbs with their state. At import they are loaded once into a trie of
+reversed, lowercased names. A location in page text is anchored on its
+", ST" or ", State Name" part, and the city is found by walking the trie
+backwards from the comma. Each anchor costs at most the length of the
+longest city name, so a whole page is scanned in linear time.
+
+Only cities that really exist in the matched state are returned, in their
+canonical spelling. The words around a city ("Fun league in Austin, TX")
+never end up in the city name, and "Springfield, IL" and "Springfield, MO"
+stay different places.
+
+Usage:
+    from gazetteer import canonical_city, city_before, find_locations
+
+    find_locations("Games in Round Rock, TX and Austin, Texas")  # [('Round Rock', 'TX'), ('Austin', 'TX')]
+    canonical_city('saint  louis', 'MO')  # 'St. Louis'
+
+    python gazetteer.py "Fun league in Austin, TX"
+"""
+
+import argparse
+import csv
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_GAZETTEER_FILE = Path(__file__).with_name('us_cities.csv')
+
+# 50 states + DC, as in lib/states.ts
+US_STATES = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
+    'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'DC': 'District of Columbia',
+    'FL': 'Florida', 'GA': 'Georgia', 'HI': 'Hawaii', 'ID': 'Idaho', 'IL': 'Illinois',
+    'IN': 'Indiana', 'IA': 'Iowa', 'KS': 'Kansas', 'KY': 'Kentucky', 'LA': 'Louisiana',
+    'ME': 'Maine', 'MD': 'Maryland', 'MA': 'Massachusetts', 'MI': 'Michigan', 'MN': 'Minnesota',
+    'MS': 'Mississippi', 'MO': 'Missouri', 'MT': 'Montana', 'NE': 'Nebraska', 'NV': 'Nevada',
+    'NH': 'New Hampshire', 'NJ': 'New Jersey', 'NM': 'New Mexico', 'NY': 'New York',
+    'NC': 'North Carolina', 'ND': 'North Dakota', 'OH': 'Ohio', 'OK': 'Oklahoma', 'OR': 'Oregon',
+    'PA': 'Pennsylvania', 'RI': 'Rhode Island', 'SC': 'South Carolina', 'SD': 'South Dakota',
+    'TN': 'Tennessee', 'TX': 'Texas', 'UT': 'Utah', 'VT': 'Vermont', 'VA': 'Virginia',
+    'WA': 'Washington', 'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming',
+}
+STATE_BY_NAME = {name.lower(): code for code, name in US_STATES.items()}
+
+# Spellings of a leading abbreviation that all mean the same place
+PREFIX_VARIANTS = {
+    'st. ': ('st ', 'saint '),
+    'mt. ': ('mt ', 'mount '),
+    'ft. ': ('ft ', 'fort '),
+}
+
+# ", TX" or ", Texas", longest names first so "West Virginia" wins over "Virginia"
+STATE_ANCHOR = re.compile(
+    r',\s*(?:(?P<code>[A-Z]{2})|(?i:(?P<name>'
+    + '|'.join(re.escape(name) for name in sorted(STATE_BY_NAME, key=len, reverse=True))
+    + r')))\b'
+)
+
+_PLACES = None  # Trie key holding {state: canonical name} where a city name ends
+
+
+def normalize_city(name: str) -> str:
+    """Lowercase a city name and collapse its whitespace"""
+    return ' '.join(name.lower().split())
+
+
+def state_code(state: str) -> Optional[str]:
+    """Two-letter code for a state code or full state name, or None"""
+    state = ' '.join(state.split())
+    if state.upper() in US_STATES:
+        return state.upper()
+    return STATE_BY_NAME.get(state.lower())
+
+
+class Gazetteer:
+    """US city/state pairs in a reversed-name trie"""
+
+    def __init__(self, places: Iterable[Tuple[str, str]] = ()):
+        """
+        Args:
+            places: (city, state code) pairs; the first spelling of a city is canonical
+        """
+        self.trie: Dict = {}
+        self.names: Dict[Tuple[str, str], str] = {}  # (normalized name, state) -> canonical
+        for city, state in places:
+            self.add(city, state)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_GAZETTEER_FILE) -> 'Gazetteer':
+        """Build a gazetteer from a city,state CSV file"""
+        with open(path, newline='', encoding='utf-8') as f:
+            return cls((row['city'], row['state']) for row in csv.DictReader(f))
+
+    def add(self, city: str, state: str):
+        """Add a city, under its own spelling and any abbreviation variants"""
+        normalized = normalize_city(city)
+        for spelling in self._spellings(normalized):
+            if (spelling, state) in self.names:
+                continue
+            self.names[spelling, state] = city
+            node = self.trie
+            for char in reversed(spelling):
+                node = node.setdefault(char, {})
+            node.setdefault(_PLACES, {})[state] = city
+
+    def city_before(self, text: str, end: int, state: str) -> Optional[str]:
+        """
+        The longest known city in state that ends at text[end] (ignoring
+        whitespace before end) and starts at a word boundary
+
+        Returns:
+            The city's canonical name, or None
+        """
+        while end > 0 and text[end - 1].isspace():
+            end -= 1
+
+        city = None
+        for places in self._walk_back(text, end):
+            if state in places:
+                city = places[state]
+        return city
+
+    def find_locations(self, text: str) -> List[Tuple[str, str]]:
+        """Every known (city, state code) pair written as "City, ST" or "City, State" in text"""
+        locations = []
+        for match in STATE_ANCHOR.finditer(text):
+            code = match.group('code')
+            state = code if code else STATE_BY_NAME[match.group('name').lower()]
+            if state not in US_STATES:
+                continue
+            city = self.city_before(text, match.start(), state)
+            if city:
+                locations.append((city, state))
+        return locations
+
+    def match_city(self, name: str, state: str) -> Optional[str]:
+        """
+        Canonical name of the known city a scraped city string names
+
+        Only the whole string is matched, ignoring case, whitespace and
+        St./Saint style abbreviations. A string that merely ends in a known
+        city ("East Los Angeles") is a different place and does not match;
+        picking a city out of surrounding words is find_locations()' job.
+        """
+        code = state_code(state or '')
+        if not name or not code:
+            return None
+        return self.names.get((normalize_city(name), code))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _walk_back(self, text: str, end: int) -> Iterator[Dict[str, str]]:
+        """Follow text backwards from end through the trie, yielding each complete city name"""
+        node = self.trie
+        position = end
+        while position > 0:
+            char = text[position - 1]
+            if char.isspace():
+                # Any run of whitespace matches the single space in a name
+                while position > 1 and text[position - 2].isspace():
+                    position -= 1
+                char = ' '
+            node = node.get(char.lower())
+            if node is None:
+                return
+            position -= 1
+            places = node.get(_PLACES)
+            if places and (position == 0 or not text[position - 1].isalnum()):
+                yield places
+
+    @staticmethod
+    def _spellings(normalized: str) -> List[str]:
+        spellings = [normalized]
+        for prefix, variants in PREFIX_VARIANTS.items():
+            if normalized.startswith(prefix):
+                rest = normalized[len(prefix):]
+                spellings.extend(variant + rest for variant in variants)
+        return spellings
+
+
+# Built once, shared by every scraper and the importer
+GAZETTEER = Gazetteer.load()
+
+
+def city_before(text: str, end: int, state: str) -> Optional[str]:
+    """Known city in state ending at text[end], from the bundled gazetteer"""
+    return GAZETTEER.city_before(text, end, state)
+
+
+def find_locations(text: str) -> List[Tuple[str, str]]:
+    """Known (city, state) pairs in text, from the bundled gazetteer"""
+    return GAZETTEER.find_locations(text)
+
+
+def canonical_city(name: str, state: str) -> str:
+    """The gazetteer spelling of a city, or the name with its whitespace tidied if unknown"""
+    return GAZETTEER.match_city(name, state) or ' '.join(name.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find US city/state pairs with the bundled gazetteer')
+    parser.add_argument('text', nargs='*', help='Text to search')
+    parser.add_argument('--file', nargs='+', default=[], help='Text or HTML files to search')
+    args = parser.parse_args()
+
+    print(f"{len(GAZETTEER)} place names loaded from {DEFAULT_GAZETTEER_FILE.name}")
+    for text in args.text:
+        print(f"{text!r}: {find_locations(text)}")
+    for path in args.file:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            print(f"{path}: {find_locations(f.read())}")
+
+
+if __name__ == '__main__':
+    main()
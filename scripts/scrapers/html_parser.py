@@ -0,0 +1,227 @@
+"""
+HTML Parser Backends
+====================
+One small query API over interchangeable HTML parsers.
+
+Scrapers parse pages with parse_html() and query the result with CSS
+selectors only (select, select_one, text, get_text, attr), so the engine
+underneath can be swapped per scraper or with --parser:
+
+    selectolax   lexbor-based C parser, much the fastest
+    lxml         BeautifulSoup on lxml's C parser
+    html.parser  BeautifulSoup on Python's pure-Python parser (slowest)
+
+BeautifulSoup backends run selectors precompiled by soupsieve, once per
+process, instead of re-parsing the CSS on every query.
+
+'auto' picks the fastest one installed. Every backend returns the same text
+for a node as BeautifulSoup's get_text(): <script>, <style> and <template>
+contents are left out.
+
+Usage:
+    from html_parser import DEFAULT_PARSER, parse_html
+
+    page = parse_html(response.content, parser='selectolax')
+    name = page.select_one('h1').text.strip()
+    links = [a.attr('href') for a in page.select('div.league-card a[href]')]
+
+    python html_parser.py --benchmark page.html
+"""
+
+import argparse
+import time
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
+
+PARSERS = ('selectolax', 'lxml', 'html.parser')
+PARSER_CHOICES = ('auto',) + PARSERS
+DEFAULT_PARSER = 'auto'
+
+# Elements whose contents BeautifulSoup's get_text() skips
+NON_TEXT_TAGS = ['script', 'style', 'template']
+
+
+def _installed(parser: str) -> bool:
+    try:
+        if parser == 'selectolax':
+            import selectolax.lexbor  # noqa: F401
+        elif parser == 'lxml':
+            import lxml  # noqa: F401
+            import bs4  # noqa: F401
+        else:
+            import bs4  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_parsers() -> List[str]:
+    """Installed backends, fastest first"""
+    return [parser for parser in PARSERS if _installed(parser)]
+
+
+@lru_cache(maxsize=None)
+def resolve_parser(parser: Optional[str] = None) -> str:
+    """Turn None/'auto' into the fastest installed backend and check the rest"""
+    if not parser or parser == 'auto':
+        installed = available_parsers()
+        if not installed:
+            raise ImportError("No HTML parser installed: pip install selectolax (or beautifulsoup4)")
+        return installed[0]
+    if parser not in PARSERS:
+        raise ValueError(f"Unknown HTML parser '{parser}', expected auto or one of {', '.join(PARSERS)}")
+    if not _installed(parser):
+        raise ImportError(f"HTML parser '{parser}' is not installed")
+    return parser
+
+
+@lru_cache(maxsize=None)
+def compiled_selector(css: str):
+    """A soupsieve selector compiled once and reused for every BeautifulSoup query"""
+    import soupsieve
+    return soupsieve.compile(css)
+
+
+class HTMLNode(ABC):
+    """An element (or whole document) with the query API scrapers use"""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def select(self, css: str) -> List['HTMLNode']:
+        """All descendants matching a CSS selector"""
+
+    @abstractmethod
+    def select_one(self, css: str) -> Optional['HTMLNode']:
+        """First descendant matching a CSS selector, or None"""
+
+    @property
+    @abstractmethod
+    def text(self) -> str:
+        """All text inside the node, concatenated as in the page"""
+
+    @abstractmethod
+    def get_text(self, separator: str = '') -> str:
+        """All text inside the node, with separator between its text nodes"""
+
+    @abstractmethod
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """An attribute value (class comes back as one space-separated string)"""
+
+    def __getitem__(self, name: str) -> str:
+        value = self.attr(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+
+class SoupNode(HTMLNode):
+    """BeautifulSoup backend (html.parser or lxml)"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, css: str) -> List[HTMLNode]:
+        return [SoupNode(node) for node in compiled_selector(css).select(self.node)]
+
+    def select_one(self, css: str) -> Optional[HTMLNode]:
+        node = compiled_selector(css).select_one(self.node)
+        return SoupNode(node) if node is not None else None
+
+    @property
+    def text(self) -> str:
+        return self.node.get_text()
+
+    def get_text(self, separator: str = '') -> str:
+        return self.node.get_text(separator)
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.node.get(name, default)
+        return ' '.join(value) if isinstance(value, list) else value
+
+
+class LexborNode(HTMLNode):
+    """selectolax (lexbor) backend"""
+
+    __slots__ = ('node',)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, css: str) -> List[HTMLNode]:
+        return [LexborNode(node) for node in self.node.css(css)]
+
+    def select_one(self, css: str) -> Optional[HTMLNode]:
+        node = self.node.css_first(css)
+        return LexborNode(node) if node is not None else None
+
+    @property
+    def text(self) -> str:
+        return self.node.text(deep=True)
+
+    def get_text(self, separator: str = '') -> str:
+        return self.node.text(deep=True, separator=separator)
+
+    def attr(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.node.attributes.get(name, default)
+        # Valueless attributes (<a href>) come back as None
+        return '' if value is None and name in self.node.attributes else value
+
+
+def parse_html(content: Union[bytes, str], parser: Optional[str] = DEFAULT_PARSER) -> HTMLNode:
+    """
+    Parse a page with the chosen backend
+
+    Args:
+        content: Raw HTML (bytes are decoded by the parser, as BeautifulSoup does)
+        parser: 'auto', 'selectolax', 'lxml' or 'html.parser'
+
+    Returns:
+        The document as an HTMLNode
+    """
+    parser = resolve_parser(parser)
+    if parser == 'selectolax':
+        from selectolax.lexbor import LexborHTMLParser
+        tree = LexborHTMLParser(content)
+        tree.strip_tags(NON_TEXT_TAGS)
+        return LexborNode(tree.root)
+
+    from bs4 import BeautifulSoup
+    return SoupNode(BeautifulSoup(content, parser))
+
+
+def benchmark(content: bytes, parsers: List[str], rounds: int = 20) -> Dict[str, float]:
+    """Average seconds to parse content and pull its text with each backend"""
+    results = {}
+    for parser in parsers:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            page = parse_html(content, parser)
+            page.select_one('h1')
+            page.text
+        results[parser] = (time.perf_counter() - start) / rounds
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare HTML parser backends on saved pages')
+    parser.add_argument('--benchmark', nargs='+', required=True, metavar='FILE', help='HTML files to parse')
+    parser.add_argument('--rounds', type=int, default=20, help='Parses per file and backend')
+    args = parser.parse_args()
+
+    parsers = available_parsers()
+    for path in args.benchmark:
+        with open(path, 'rb') as f:
+            content = f.read()
+        results = benchmark(content, parsers, args.rounds)
+        slowest = max(results.values())
+        print(f"{path} ({len(content) // 1024} KB)")
+        for name, seconds in results.items():
+            print(f"  {name:12} {seconds * 1000:8.2f} ms  {slowest / seconds:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
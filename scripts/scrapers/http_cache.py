@@ -0,0 +1,184 @@
+"""
+HTTP Response Cache
+===================
+Content-addressed on-disk cache for scraped pages.
+
+Bodies are stored once under the SHA-256 of their content, and a small JSON
+index entry per URL records the body hash plus the ETag / Last-Modified
+validators. Repeat crawls revalidate with If-None-Match / If-Modified-Since,
+so unchanged pages come back as 304s, and parser changes can be re-run
+fully offline against the cached bodies.
+
+Layout:
+    <cache_dir>/objects/ab/abcdef...   raw response bodies
+    <cache_dir>/index/0123...json      per-URL metadata
+
+Usage:
+    from http_cache import ResponseCache, fetch_page
+
+    cache = ResponseCache()
+    response = fetch_page(session, url, cache=cache, rate_limiter=limiter)
+    page = parse_html(response.content)
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+
+from atomic_write import write_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path('../../scraped_data/cache/http')
+
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a URL has never been cached"""
+
+
+@dataclass
+class CachedPage:
+    """A page body plus how it was obtained"""
+    url: str
+    content: bytes
+    content_hash: str
+    status: str  # 'fetched', 'not-modified' or 'offline'
+
+
+class ResponseCache:
+    """Content-addressed response bodies with per-URL validators"""
+
+    def __init__(self, cache_dir: Path = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / 'objects'
+        self.index_dir = self.cache_dir / 'index'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """Return the index entry for a URL, or None if it is not cached"""
+        index_file = self._index_path(url)
+        if not index_file.exists():
+            return None
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache entry for {url}: {e}")
+            return None
+        if not self._object_path(entry['content_hash']).exists():
+            return None
+        return entry
+
+    def read_body(self, entry: Dict) -> bytes:
+        """Read the body referenced by an index entry"""
+        return self._object_path(entry['content_hash']).read_bytes()
+
+    def store(self, url: str, content: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> Dict:
+        """Store a response body and its validators"""
+        content_hash = hashlib.sha256(content).hexdigest()
+        object_file = self._object_path(content_hash)
+        if not object_file.exists():
+            object_file.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(object_file, content)
+
+        now = datetime.now().isoformat()
+        entry = {
+            'url': url,
+            'content_hash': content_hash,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': now,
+            'validated_at': now,
+        }
+        self._write_entry(url, entry)
+        return entry
+
+    def mark_validated(self, url: str, entry: Dict) -> Dict:
+        """Record a successful revalidation (304) of a cached entry"""
+        entry['validated_at'] = datetime.now().isoformat()
+        self._write_entry(url, entry)
+        return entry
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for an entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _write_entry(self, url: str, entry: Dict):
+        data = json.dumps(entry, indent=2).encode('utf-8')
+        write_atomic(self._index_path(url), data)
+
+    def _index_path(self, url: str) -> Path:
+        return self.index_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.objects_dir / content_hash[:2] / content_hash
+
+
+def fetch_page(session: requests.Session, url: str, cache: Optional[ResponseCache] = None,
+               rate_limiter=None, offline: bool = False, timeout: int = 10) -> CachedPage:
+    """
+    Fetch a URL through the cache
+
+    Args:
+        session: requests session to send the request with
+        url: URL to fetch
+        cache: Response cache, or None to always fetch
+        rate_limiter: Rate limiter consulted only before network requests
+        offline: Serve from the cache only, never touch the network
+        timeout: Request timeout in seconds
+
+    Returns:
+        CachedPage with the body and whether it came from the network
+
+    Raises:
+        CacheMiss: offline mode and the URL is not cached
+        requests.RequestException: the request failed
+    """
+    entry = cache.lookup(url) if cache else None
+
+    if offline:
+        if not entry:
+            raise CacheMiss(f"{url} is not in the cache")
+        return CachedPage(url, cache.read_body(entry), entry['content_hash'], 'offline')
+
+    if rate_limiter:
+        rate_limiter.acquire(url)
+
+    logger.info(f"Fetching: {url}")
+    response = session.get(url, headers=ResponseCache.conditional_headers(entry), timeout=timeout)
+
+    if response.status_code == 304 and entry:
+        logger.info(f"Not modified: {url}")
+        cache.mark_validated(url, entry)
+        return CachedPage(url, cache.read_body(entry), entry['content_hash'], 'not-modified')
+
+    response.raise_for_status()
+    content = response.content
+
+    if cache:
+        entry = cache.store(
+            url,
+            content,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+        )
+        content_hash = entry['content_hash']
+    else:
+        content_hash = hashlib.sha256(content).hexdigest()
+
+    return CachedPage(url, content, content_hash, 'fetched')
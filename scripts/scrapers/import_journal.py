@@ -0,0 +1,123 @@
+"""
+Import Journal
+==============
+Local record of what import_to_supabase.py has already written, so an
+interrupted import can resume where it stopped.
+
+Every scraped record is identified by the SHA-256 of its JSON content. After
+rows are committed their hashes are journaled, and a batch whose rows all
+went in is journaled as a whole. With --resume, fully committed batches are
+skipped before any work is done, and the rows already written from a
+partially committed batch are dropped. Entries are scoped to the target
+database, so a test import never marks rows done for production.
+
+Usage:
+    from import_journal import ImportJournal
+
+    journal = ImportJournal(target=SUPABASE_URL)
+    hashes = [ImportJournal.record_hash(item) for item in chunk]
+    if not journal.batch_committed('leagues', ImportJournal.batch_hash(hashes)):
+        ...
+        journal.record_rows('leagues', committed_hashes)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+DEFAULT_JOURNAL_PATH = Path('../../scraped_data/cache/import_journal.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS committed_rows (
+    target TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    row_hash TEXT NOT NULL,
+    committed_at TEXT NOT NULL,
+    PRIMARY KEY (target, table_name, row_hash)
+);
+CREATE TABLE IF NOT EXISTS committed_batches (
+    target TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    batch_hash TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    committed_at TEXT NOT NULL,
+    PRIMARY KEY (target, table_name, batch_hash)
+);
+"""
+
+
+class ImportJournal:
+    """SQLite journal of committed import rows and batches"""
+
+    def __init__(self, path: Path = DEFAULT_JOURNAL_PATH, target: str = ''):
+        """
+        Args:
+            path: Journal database file
+            target: Identifies the destination database (URL or local path)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.target = target
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(_SCHEMA)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def record_hash(record: Dict) -> str:
+        """Content hash of one scraped record"""
+        data = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def batch_hash(row_hashes: List[str]) -> str:
+        """Content hash of a batch, from its row hashes in order"""
+        return hashlib.sha256(''.join(row_hashes).encode('ascii')).hexdigest()
+
+    def batch_committed(self, table: str, batch_hash: str) -> bool:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM committed_batches WHERE target = ? AND table_name = ? AND batch_hash = ?",
+                (self.target, table, batch_hash)
+            ).fetchone()
+        return row is not None
+
+    def committed_rows(self, table: str, row_hashes: Iterable[str]) -> Set[str]:
+        """Return the subset of row_hashes already committed"""
+        row_hashes = list(row_hashes)
+        committed = set()
+        with self.lock:
+            for start in range(0, len(row_hashes), 500):
+                chunk = row_hashes[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                committed.update(row for (row,) in self.conn.execute(
+                    f"SELECT row_hash FROM committed_rows WHERE target = ? AND table_name = ? "
+                    f"AND row_hash IN ({placeholders})",
+                    [self.target, table, *chunk]
+                ))
+        return committed
+
+    def record_rows(self, table: str, row_hashes: Iterable[str]):
+        now = datetime.now().isoformat()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO committed_rows (target, table_name, row_hash, committed_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(self.target, table, row_hash, now) for row_hash in row_hashes]
+            )
+
+    def record_batch(self, table: str, batch_hash: str, row_count: int):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO committed_batches (target, table_name, batch_hash, row_count, committed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.target, table, batch_hash, row_count, datetime.now().isoformat())
+            )
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
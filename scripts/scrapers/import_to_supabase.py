@@ -3,19 +3,51 @@ Import Scraped Data to Supabase
 ================================
 This script imports scraped data (leagues, events, teams) into your Supabase database.
 
+Input files (JSON arrays or JSONL, optionally gzipped) are streamed rather
+than loaded whole, so memory use stays flat however large the export is.
+Records are validated and prepared in chunks and sent as multi-row inserts.
+If a batch is rejected it is split in half and retried, so one bad row only
+fails itself instead of the whole batch.
+
+With --upsert, rows are matched on a per-table natural key (normalized name
+plus city, or name plus start date plus state for events). Only existing rows
+that changed are sent, and their slug and verified flag are kept, so
+re-running an import updates in place instead of inserting duplicates.
+Every import writes name_key, so rows inserted without --upsert are found by
+later upserts. Run supabase/import_natural_keys.sql once before importing.
+
+City names are resolved against the bundled US gazetteer (gazetteer.py),
+so "austin" and "AUSTIN " both map to the one Austin, TX row. Unknown places
+keep their own name rather than being merged into a city they end with.
+
+Committed rows are recorded in a local import journal; after a crash,
+--resume skips everything that already went in.
+
 Usage:
     python import_to_supabase.py --file scraped_leagues.json --type leagues
     python import_to_supabase.py --file scraped_events.json --type events
+    python import_to_supabase.py --file scraped_leagues.json --type leagues --batch-size 1000
+    python import_to_supabase.py --file scraped_leagues.json --type leagues --upsert
+    python import_to_supabase.py --file leagues.json events.json teams.json --type leagues events teams --workers 8
+    python import_to_supabase.py --file scraped_leagues.json --type leagues --resume
+    python import_to_supabase.py --file scraped_leagues.jsonl.gz --type leagues
+    python import_to_supabase.py --file scraped_leagues.json --type leagues --local-db import_test.db
 """
 
-import json
+import itertools
 import os
-from supabase import create_client, Client
+import re
 from dotenv import load_dotenv
 import logging
-from typing import List, Dict
+import threading
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import argparse
 from slugify import slugify
+from import_journal import DEFAULT_JOURNAL_PATH, ImportJournal
+from record_reader import load_records
+from gazetteer import canonical_city
 
 # Load environment variables
 from pathlib import Path
@@ -26,280 +58,674 @@ load_dotenv(PROJECT_ROOT / '.env.local')
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Supabase client
+# Supabase credentials
 SUPABASE_URL = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')  # Use service role key for imports
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("Missing Supabase credentials in environment variables")
+DEFAULT_BATCH_SIZE = 500  # Rows per insert request
+
+# Columns identifying the same real-world record across imports
+NATURAL_KEYS = {
+    'leagues': ('name_key', 'city_id'),
+    'events': ('name_key', 'start_date', 'state'),
+    'teams': ('name_key', 'city_id'),
+}
+
+# Columns an upsert never overwrites on existing rows
+PRESERVED_COLUMNS = {'slug', 'verified'}
+
+KEY_LOOKUP_CHUNK = 200  # name_keys per existing-row lookup request
+PAGE_SIZE = 1000  # Rows per request when reading a whole table
+
+# Tables whose rows reference a city
+CITY_TABLES = {'leagues', 'teams'}
+
+
+def create_supabase_client():
+    """Create the Supabase client from environment credentials"""
+    from supabase import create_client
+    
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("Missing Supabase credentials in environment variables")
+    
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def normalize_name(name: str) -> str:
+    """Natural-key form of a name (matches the SQL in import_natural_keys.sql)"""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def city_key(name: str, state: str) -> tuple:
+    """Cache key for a city: case- and whitespace-insensitive name plus state"""
+    return ' '.join(name.lower().split()), state.strip().upper()
+
+
+class SlugIndex:
+    """Slugs already used in a table, handing out the next free -N suffix"""
+    
+    def __init__(self, slugs: Iterable[str] = ()):
+        self.used = set(slugs)
+        self.next_suffix: Dict[str, int] = {}
+    
+    def reserve(self, slug: str) -> str:
+        """Claim slug, or the first free slug-N after it"""
+        if slug not in self.used:
+            self.used.add(slug)
+            return slug
+        
+        suffix = self.next_suffix.get(slug, 2)
+        while f"{slug}-{suffix}" in self.used:
+            suffix += 1
+        self.next_suffix[slug] = suffix + 1
+        
+        candidate = f"{slug}-{suffix}"
+        self.used.add(candidate)
+        return candidate
+    
+    def __len__(self) -> int:
+        return len(self.used)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """
+    Yield successive lists of up to size items
+    
+    If reading items raises, the items read so far are yielded as a last,
+    short chunk before the error propagates, so they are not lost.
+    """
+    iterator = iter(items)
+    while True:
+        chunk = []
+        try:
+            for item in itertools.islice(iterator, size):
+                chunk.append(item)
+        except Exception:
+            if chunk:
+                yield chunk
+            raise
+        if not chunk:
+            return
+        yield chunk
 
 
 class DataImporter:
     """Import scraped data into Supabase"""
     
-    def __init__(self):
-        self.supabase = supabase
-        self.city_cache = {}  # Cache city lookups
+    def __init__(self, client=None, batch_size: int = DEFAULT_BATCH_SIZE, upsert: bool = False,
+                 workers: int = 1, journal: Optional[ImportJournal] = None, resume: bool = False):
+        """
+        Args:
+            client: Supabase client (or a LocalClient); created from the environment if omitted
+            batch_size: Rows sent per insert request
+            upsert: Update rows matching NATURAL_KEYS instead of inserting duplicates
+            workers: Batches imported concurrently; all workers share the
+                client's HTTP connection pool, so this also bounds open connections
+            journal: Records committed rows and batches (no journaling if None)
+            resume: Skip rows and batches the journal already has
+        """
+        self.supabase = client or create_supabase_client()
+        self.batch_size = max(1, batch_size)
+        self.upsert = upsert
+        self.workers = max(1, workers)
+        self.journal = journal
+        self.resume = resume
+        self.city_lock = threading.RLock()  # One worker creates a given city
+        self.slug_lock = threading.Lock()
+        self.city_cache = {}  # (normalized name, state) -> city id
+        self.city_slugs = SlugIndex()
+        self.cities_loaded = False
+        self.slug_indexes: Dict[str, SlugIndex] = {}  # table -> slugs in use
     
-    def load_data(self, filename: str) -> List[Dict]:
-        """Load data from JSON file"""
-        with open(filename, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    def load_data(self, filename: str) -> Iterator[Dict]:
+        """Stream records from a JSONL or JSON-array file, optionally gzipped"""
+        return load_records(filename)
     
-    def get_or_create_city(self, city_name: str, state: str) -> int:
-        """Get city_id or create new city if it doesn't exist"""
+    def fetch_all(self, table: str, columns: str) -> Iterator[Dict]:
+        """Stream every row of a table, one page per request"""
+        start = 0
+        while True:
+            result = self.supabase.table(table).select(columns).range(start, start + PAGE_SIZE - 1).execute()
+            yield from result.data
+            if len(result.data) < PAGE_SIZE:
+                return
+            start += PAGE_SIZE
+    
+    def load_cities(self):
+        """Index the whole cities table by (normalized name, state) in one paged read"""
+        self.city_cache = {}
+        slugs = []
+        for city in self.fetch_all('cities', 'id,name,state,slug'):
+            self.city_cache[city_key(city['name'], city['state'])] = city['id']
+            slugs.append(city['slug'])
+        self.city_slugs = SlugIndex(slugs)
+        self.cities_loaded = True
+        logger.info(f"Loaded {len(self.city_cache)} cities")
+    
+    def resolve_cities(self, items: List[Dict], dry_run: bool = False):
+        """
+        Make sure every city referenced by items has an id, creating all
+        missing cities with a single bulk insert
         
-        # Check cache first
-        cache_key = f"{city_name.lower()}-{state.upper()}"
-        if cache_key in self.city_cache:
-            return self.city_cache[cache_key]
+        If the insert is rejected (e.g. someone else created one of the
+        cities meanwhile), the city index is reloaded and the insert retried once.
+        Holds city_lock throughout so concurrent workers never create the
+        same city twice.
+        """
+        with self.city_lock:
+            self._resolve_cities(items, dry_run, retry=True)
+    
+    def _resolve_cities(self, items: List[Dict], dry_run: bool, retry: bool):
+        if not self.cities_loaded:
+            self.load_cities()
         
-        # Try to find existing city
-        result = self.supabase.table('cities').select('id').eq('name', city_name).eq('state', state).execute()
+        missing = {}
+        for item in items:
+            if item.get('name') and item.get('city') and item.get('state'):
+                name = canonical_city(item['city'], item['state'])
+                key = city_key(name, item['state'])
+                if key not in self.city_cache and key not in missing:
+                    missing[key] = name
         
-        if result.data:
-            city_id = result.data[0]['id']
-            self.city_cache[cache_key] = city_id
-            return city_id
+        if not missing:
+            return
         
-        # Create new city
-        slug = slugify(f"{city_name}-{state}")
+        if dry_run:
+            for key, name in missing.items():
+                logger.info(f"[DRY RUN] Would create city: {name}, {key[1]}")
+                self.city_cache[key] = None
+            return
         
-        # Check if slug already exists, append number if needed
-        existing = self.supabase.table('cities').select('id').eq('slug', slug).execute()
-        if existing.data:
-            slug = f"{slug}-{len(existing.data) + 1}"
+        new_cities = []
+        for (_, state), name in missing.items():
+            slug = self.city_slugs.reserve(slugify(f"{name}-{state}"))
+            new_cities.append({'name': name, 'state': state, 'slug': slug})
         
-        new_city = {
-            'name': city_name,
-            'state': state.upper(),
-            'slug': slug
-        }
+        try:
+            result = self.supabase.table('cities').insert(new_cities).execute()
+        except Exception as e:
+            if not retry:
+                raise
+            logger.warning(f"City insert rejected, reloading cities and retrying: {e}")
+            self.load_cities()
+            return self._resolve_cities(items, dry_run, retry=False)
         
-        result = self.supabase.table('cities').insert(new_city).execute()
-        city_id = result.data[0]['id']
-        self.city_cache[cache_key] = city_id
+        for city in result.data:
+            self.city_cache[city_key(city['name'], city['state'])] = city['id']
         
-        logger.info(f"Created new city: {city_name}, {state}")
-        return city_id
+        logger.info(f"Created {len(new_cities)} new cities")
     
-    def import_leagues(self, data: List[Dict], dry_run: bool = False) -> Dict:
-        """Import league data"""
-        stats = {'success': 0, 'failed': 0, 'skipped': 0}
+    def slug_index(self, table: str) -> SlugIndex:
+        """Slugs in use in a table, loaded with one paged read per import run (call with slug_lock held)"""
+        if table not in self.slug_indexes:
+            self.slug_indexes[table] = SlugIndex(row['slug'] for row in self.fetch_all(table, 'slug'))
+            logger.info(f"Loaded {len(self.slug_indexes[table])} {table} slugs")
+        return self.slug_indexes[table]
+    
+    def assign_slugs(self, table: str, rows: List[Dict]) -> List[Dict]:
+        """Replace each row's base slug with a unique one before it is inserted"""
+        with self.slug_lock:
+            index = self.slug_index(table)
+            for row in rows:
+                row['slug'] = index.reserve(row['slug'])
+        return rows
+    
+    def get_or_create_city(self, city_name: str, state: str) -> int:
+        """Get city_id, creating the city if it doesn't exist"""
+        city_name = canonical_city(city_name, state)
+        key = city_key(city_name, state)
+        with self.city_lock:
+            if key not in self.city_cache:
+                self.resolve_cities([{'name': city_name, 'city': city_name, 'state': state}])
+            return self.city_cache[key]
+    
+    def import_records(self, table: str, data: Iterable[Dict],
+                       prepare: Callable[[Dict], Optional[Dict]], dry_run: bool = False) -> Dict:
+        """
+        Prepare records in chunks and insert each chunk with one request
         
-        for item in data:
-            try:
-                # Validate required fields
-                if not item.get('name') or not item.get('city') or not item.get('state'):
-                    logger.warning(f"Skipping league with missing required fields: {item.get('name', 'Unknown')}")
-                    stats['skipped'] += 1
-                    continue
-                
-                # Get or create city
-                city_id = self.get_or_create_city(item['city'], item['state'])
-                
-                # Generate slug
-                slug = slugify(item['name'])
-                
-                # Check if league already exists
-                existing = self.supabase.table('leagues').select('id').eq('slug', slug).execute()
-                if existing.data:
-                    slug = f"{slug}-{existing.data[0]['id']}"
-                
-                # Prepare league data
-                league_data = {
-                    'name': item['name'],
-                    'slug': slug,
-                    'city_id': city_id,
-                    'website': item.get('website'),
-                    'fees': item.get('fees'),
-                    'season_start': item.get('season_start'),
-                    'season_end': item.get('season_end'),
-                    'divisions': item.get('divisions', []),
-                    'nights': item.get('nights', []),
-                    'formats': item.get('formats', []),
-                    'contact_type': item.get('contact_type'),
-                    'comp_levels': item.get('comp_levels', []),
-                    'signup_url': item.get('signup_url'),
-                    'about': item.get('about'),
-                    'contact_name': item.get('contact_name'),
-                    'contact_email': item.get('contact_email'),
-                    'contact_phone': item.get('contact_phone'),
-                    'verified': False  # Scraped data starts as unverified
-                }
-                
-                if dry_run:
-                    logger.info(f"[DRY RUN] Would import: {league_data['name']}")
-                    stats['success'] += 1
-                else:
-                    # Insert into database
-                    result = self.supabase.table('leagues').insert(league_data).execute()
-                    logger.info(f"Imported league: {league_data['name']}")
-                    stats['success'] += 1
-                
-            except Exception as e:
-                logger.error(f"Error importing league {item.get('name', 'Unknown')}: {e}")
-                stats['failed'] += 1
+        With more than one worker, chunks are imported concurrently; at most
+        two chunks per worker are read ahead of the ones in flight.
         
+        Args:
+            table: Destination table
+            data: Scraped records
+            prepare: Turns a record into a row, or returns None to skip it
+            dry_run: Prepare rows without inserting them
+        
+        Returns:
+            Success/failed/skipped counts
+        """
+        stats = self.new_stats()
+        with self.batch_runner(stats) as submit:
+            for chunk in chunked(data, self.batch_size):
+                submit(table, chunk, prepare, dry_run)
         return stats
     
-    def import_events(self, data: List[Dict], dry_run: bool = False) -> Dict:
-        """Import event data (tournaments and clinics)"""
-        stats = {'success': 0, 'failed': 0, 'skipped': 0}
+    def import_files(self, files: Iterable[Tuple[str, str]], dry_run: bool = False) -> Tuple[Dict, List[str]]:
+        """
+        Import (filename, table) pairs through one shared pool of workers
         
-        for item in data:
-            try:
-                # Validate required fields
-                if not item.get('name') or not item.get('state') or not item.get('start_date'):
-                    logger.warning(f"Skipping event with missing required fields: {item.get('name', 'Unknown')}")
-                    stats['skipped'] += 1
-                    continue
-                
-                # Generate slug
-                slug = slugify(item['name'])
-                
-                # Check if event already exists
-                existing = self.supabase.table('events').select('id').eq('slug', slug).execute()
-                if existing.data:
-                    slug = f"{slug}-{existing.data[0]['id']}"
-                
-                # Prepare event data
-                event_data = {
-                    'name': item['name'],
-                    'slug': slug,
-                    'kind': item.get('kind', 'tournament'),
-                    'state': item['state'].upper(),
-                    'location': item.get('location'),
-                    'start_date': item['start_date'],
-                    'end_date': item.get('end_date'),
-                    'fee': item.get('fee'),
-                    'divisions': item.get('divisions', []),
-                    'formats': item.get('formats', []),
-                    'contact_type': item.get('contact_type'),
-                    'comp_levels': item.get('comp_levels', []),
-                    'website': item.get('website'),
-                    'signup_url': item.get('signup_url'),
-                    'about': item.get('about'),
-                    'contact_name': item.get('contact_name'),
-                    'contact_email': item.get('contact_email'),
-                    'contact_phone': item.get('contact_phone'),
-                    'verified': False  # Scraped data starts as unverified
-                }
-                
-                if dry_run:
-                    logger.info(f"[DRY RUN] Would import: {event_data['name']}")
-                    stats['success'] += 1
-                else:
-                    # Insert into database
-                    result = self.supabase.table('events').insert(event_data).execute()
-                    logger.info(f"Imported event: {event_data['name']}")
-                    stats['success'] += 1
-                
-            except Exception as e:
-                logger.error(f"Error importing event {item.get('name', 'Unknown')}: {e}")
-                stats['failed'] += 1
+        Files are read one after another, but a file's batches do not have
+        to finish before the next file's are submitted, so with several
+        workers batches from different files are written concurrently.
+        
+        Returns:
+            Combined counts, and the files that stopped early on malformed input
+        """
+        prepares = {'leagues': self.prepare_league, 'events': self.prepare_event, 'teams': self.prepare_team}
+        stats = self.new_stats()
+        unreadable = []
+        with self.batch_runner(stats) as submit:
+            for filename, table in files:
+                logger.info(f"Streaming records from {filename}")
+                try:
+                    for chunk in chunked(self.load_data(filename), self.batch_size):
+                        submit(table, chunk, prepares[table], dry_run)
+                except ValueError as e:
+                    # Records before the malformed one were still submitted; --resume skips them on a rerun
+                    logger.error(f"❌ Stopped early: {e}")
+                    unreadable.append(filename)
+        return stats, unreadable
+    
+    @contextmanager
+    def batch_runner(self, stats: Dict) -> Iterator[Callable]:
+        """
+        Yield a submit(table, chunk, prepare, dry_run) that runs import_batch
+        on the worker pool and adds its counts to stats
         
+        submit() blocks once two chunks per worker are waiting. Leaving the
+        block waits for every submitted batch, also when it exits with an error.
+        """
+        def merge(batch_stats: Dict):
+            for key, count in batch_stats.items():
+                stats[key] += count
+        
+        if self.workers == 1:
+            yield lambda *batch: merge(self.import_batch(*batch))
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = set()
+            
+            def submit(*batch):
+                nonlocal pending
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        merge(future.result())
+                pending.add(executor.submit(self.import_batch, *batch))
+            
+            try:
+                yield submit
+            finally:
+                for future in pending:
+                    merge(future.result())
+    
+    def new_stats(self) -> Dict:
+        stats = {'success': 0, 'failed': 0, 'skipped': 0, 'resumed': 0}
+        if self.upsert:
+            stats.update({'updated': 0, 'unchanged': 0})
         return stats
     
-    def import_teams(self, data: List[Dict], dry_run: bool = False) -> Dict:
-        """Import team data"""
-        stats = {'success': 0, 'failed': 0, 'skipped': 0}
+    def import_batch(self, table: str, chunk: List[Dict],
+                     prepare: Callable[[Dict], Optional[Dict]], dry_run: bool = False) -> Dict:
+        """Resolve cities for, prepare and write one chunk of records"""
+        stats = self.new_stats()
+        
+        # Resume: skip a batch the journal says is fully committed
+        record_hashes = [ImportJournal.record_hash(item) for item in chunk] if self.journal else []
+        batch_hash = ImportJournal.batch_hash(record_hashes) if self.journal else None
+        done = set()
+        if self.journal and self.resume and not dry_run:
+            if self.journal.batch_committed(table, batch_hash):
+                stats['resumed'] += len(chunk)
+                return stats
+            done = self.journal.committed_rows(table, record_hashes)
         
-        for item in data:
+        if table in CITY_TABLES:
+            pending = [item for index, item in enumerate(chunk) if not done or record_hashes[index] not in done]
             try:
-                # Validate required fields
-                if not item.get('name') or not item.get('city') or not item.get('state'):
-                    logger.warning(f"Skipping team with missing required fields: {item.get('name', 'Unknown')}")
-                    stats['skipped'] += 1
-                    continue
-                
-                # Get or create city
-                city_id = self.get_or_create_city(item['city'], item['state'])
-                
-                # Generate slug
-                slug = slugify(item['name'])
-                
-                # Check if team already exists
-                existing = self.supabase.table('teams').select('id').eq('slug', slug).execute()
-                if existing.data:
-                    slug = f"{slug}-{existing.data[0]['id']}"
-                
-                # Prepare team data
-                team_data = {
-                    'name': item['name'],
-                    'slug': slug,
-                    'city_id': city_id,
-                    'gender': item.get('gender'),
-                    'age_groups': item.get('age_groups', []),
-                    'comp_levels': item.get('comp_levels', []),
-                    'formats': item.get('formats', []),
-                    'contact_type': item.get('contact_type'),
-                    'about': item.get('about'),
-                    'accomplishments': item.get('accomplishments'),
-                    'website': item.get('website'),
-                    'signup_url': item.get('signup_url'),
-                    'contact_name': item.get('contact_name'),
-                    'contact_email': item.get('contact_email'),
-                    'contact_phone': item.get('contact_phone'),
-                    'verified': False  # Scraped data starts as unverified
-                }
-                
-                if dry_run:
-                    logger.info(f"[DRY RUN] Would import: {team_data['name']}")
-                    stats['success'] += 1
-                else:
-                    # Insert into database
-                    result = self.supabase.table('teams').insert(team_data).execute()
-                    logger.info(f"Imported team: {team_data['name']}")
-                    stats['success'] += 1
-                
+                self.resolve_cities(pending, dry_run)
+            except Exception as e:
+                # Rows fall back to creating their own city below
+                logger.error(f"Error creating cities for this batch: {e}")
+        
+        rows = []
+        row_hashes = {}
+        for index, item in enumerate(chunk):
+            if done and record_hashes[index] in done:
+                stats['resumed'] += 1
+                continue
+            
+            try:
+                row = prepare(item)
             except Exception as e:
-                logger.error(f"Error importing team {item.get('name', 'Unknown')}: {e}")
+                logger.error(f"Error preparing {table[:-1]} {item.get('name', 'Unknown')}: {e}")
                 stats['failed'] += 1
+                continue
+            
+            if row is None:
+                stats['skipped'] += 1
+            elif dry_run:
+                logger.info(f"[DRY RUN] Would import: {row['name']}")
+                stats['success'] += 1
+            else:
+                rows.append(row)
+                if self.journal:
+                    row_hashes[id(row)] = record_hashes[index]
+        
+        if rows and self.upsert:
+            written = self.upsert_batch(table, rows, stats)
+        elif rows:
+            existing = []
+            written = self.insert_batch(table, self.assign_slugs(table, rows), stats, existing=existing)
+            if existing:
+                logger.info(f"Skipped {len(existing)} {table} already stored (--upsert updates them)")
+                stats['skipped'] += len(existing)
+                written += existing  # Nothing left to do for them on --resume
+        else:
+            written = []
+        
+        if self.journal and not dry_run:
+            self.journal.record_rows(table, [row_hashes[id(row)] for row in written])
+            if not stats['failed']:
+                self.journal.record_batch(table, batch_hash, len(chunk))
         
         return stats
-
+    
+    def insert_batch(self, table: str, rows: List[Dict], stats: Dict,
+                     on_conflict: Optional[str] = None, existing: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Write rows in one request, bisecting the batch to isolate failing rows
+        
+        Without on_conflict, rows whose natural key (NATURAL_KEYS[table]) is
+        already stored are left alone by the database rather than rejecting
+        the batch, and are handed back through existing.
+        
+        Args:
+            on_conflict: Natural key columns to upsert on (insert new rows only if None)
+            existing: Collects the rows skipped because their natural key is already stored
+        
+        Returns:
+            The rows that were written
+        """
+        try:
+            query = self.supabase.table(table)
+            if on_conflict:
+                query.upsert(rows, on_conflict=on_conflict).execute()
+                stats['updated'] += len(rows)
+                logger.info(f"Updated {len(rows)} {table}")
+                written = rows
+            else:
+                result = query.upsert(rows, on_conflict=','.join(NATURAL_KEYS[table]),
+                                      ignore_duplicates=True).execute()
+                # Only inserted rows come back; slugs are unique, so they tell the rows apart
+                inserted = {row['slug'] for row in result.data}
+                written = [row for row in rows if row['slug'] in inserted]
+                if existing is not None:
+                    existing.extend(row for row in rows if row['slug'] not in inserted)
+                logger.info(f"Imported {len(written)} {table}")
+            stats['success'] += len(written)
+            return written
+        except Exception as e:
+            if len(rows) == 1:
+                logger.error(f"Error importing {table[:-1]} {rows[0].get('name', 'Unknown')}: {e}")
+                stats['failed'] += 1
+                return []
+            
+            middle = len(rows) // 2
+            logger.warning(f"Batch of {len(rows)} {table} rejected, retrying as {middle} + {len(rows) - middle}: {e}")
+            return (self.insert_batch(table, rows[:middle], stats, on_conflict, existing)
+                    + self.insert_batch(table, rows[middle:], stats, on_conflict, existing))
+    
+    def upsert_batch(self, table: str, rows: List[Dict], stats: Dict, retry: bool = True) -> List[Dict]:
+        """
+        Insert new rows and upsert the existing ones that changed
+        
+        Rows are matched to existing records on NATURAL_KEYS[table]. Rows
+        with nothing new are not sent at all. Changed rows are sent whole:
+        Postgres checks NOT NULL on the proposed insert row before ON CONFLICT
+        turns it into an update, so a partial row would be rejected. slug and
+        verified keep their stored values.
+        
+        A new row whose key another worker stored after fetch_existing() is
+        skipped by the insert and goes through this once more as an update.
+        
+        Returns:
+            The rows now stored (written or already up to date)
+        """
+        key = NATURAL_KEYS[table]
+        
+        # Later duplicates in the input win, like successive imports would
+        unique_rows = {tuple(row[column] for column in key): row for row in rows}
+        if len(unique_rows) < len(rows):
+            logger.warning(f"Ignoring {len(rows) - len(unique_rows)} duplicate {table} in this batch")
+            stats['skipped'] += len(rows) - len(unique_rows)
+        
+        existing = self.fetch_existing(table, key, [row['name_key'] for row in unique_rows.values()])
+        
+        stored = []
+        new_rows = []
+        updates = []
+        sources = {}  # id(update row) -> scraped row
+        for natural_key, row in unique_rows.items():
+            current = existing.get(natural_key)
+            if current is None:
+                new_rows.append(row)
+                continue
+            
+            changed = any(
+                column not in PRESERVED_COLUMNS and current.get(column) != value
+                for column, value in row.items()
+            )
+            if not changed:
+                stats['unchanged'] += 1
+                stats['success'] += 1
+                stored.append(row)
+                continue
+            
+            update = dict(row)
+            for column in PRESERVED_COLUMNS:
+                if column in current:
+                    update[column] = current[column]
+                else:
+                    update.pop(column, None)
+            updates.append(update)
+            sources[id(update)] = row
+        
+        if new_rows:
+            taken = []
+            stored += self.insert_batch(table, self.assign_slugs(table, new_rows), stats, existing=taken)
+            if taken and retry:
+                logger.info(f"{len(taken)} new {table} were stored meanwhile, updating them instead")
+                stored += self.upsert_batch(table, taken, stats, retry=False)
+            elif taken:
+                logger.error(f"Could not insert or match {len(taken)} {table}: {', '.join(row['name'] for row in taken)}")
+                stats['failed'] += len(taken)
+        if updates:
+            written = self.insert_batch(table, updates, stats, on_conflict=','.join(key))
+            stored += [sources[id(update)] for update in written]
+        return stored
+    
+    def fetch_existing(self, table: str, key: tuple, name_keys: List[str]) -> Dict[tuple, Dict]:
+        """Load existing rows for the given name_keys, indexed by natural key"""
+        existing = {}
+        for names in chunked(sorted(set(name_keys)), KEY_LOOKUP_CHUNK):
+            result = self.supabase.table(table).select('*').in_('name_key', names).execute()
+            for row in result.data:
+                existing[tuple(row.get(column) for column in key)] = row
+        return existing
+    
+    def prepare_league(self, item: Dict) -> Optional[Dict]:
+        """Validate a scraped league and build its row"""
+        # Validate required fields
+        if not item.get('name') or not item.get('city') or not item.get('state'):
+            logger.warning(f"Skipping league with missing required fields: {item.get('name', 'Unknown')}")
+            return None
+        
+        # Get or create city
+        city_id = self.get_or_create_city(item['city'], item['state'])
+        
+        return {
+            'name': item['name'],
+            'slug': slugify(item['name']),  # Made unique when the row is inserted
+            'name_key': normalize_name(item['name']),  # Natural key for --upsert
+            'city_id': city_id,
+            'website': item.get('website'),
+            'fees': item.get('fees'),
+            'season_start': item.get('season_start'),
+            'season_end': item.get('season_end'),
+            'divisions': item.get('divisions', []),
+            'nights': item.get('nights', []),
+            'formats': item.get('formats', []),
+            'contact_type': item.get('contact_type'),
+            'comp_levels': item.get('comp_levels', []),
+            'signup_url': item.get('signup_url'),
+            'about': item.get('about'),
+            'contact_name': item.get('contact_name'),
+            'contact_email': item.get('contact_email'),
+            'contact_phone': item.get('contact_phone'),
+            'verified': False  # Scraped data starts as unverified
+        }
+    
+    def prepare_event(self, item: Dict) -> Optional[Dict]:
+        """Validate a scraped event and build its row"""
+        # Validate required fields
+        if not item.get('name') or not item.get('state') or not item.get('start_date'):
+            logger.warning(f"Skipping event with missing required fields: {item.get('name', 'Unknown')}")
+            return None
+        
+        return {
+            'name': item['name'],
+            'slug': slugify(item['name']),  # Made unique when the row is inserted
+            'name_key': normalize_name(item['name']),  # Natural key for --upsert
+            'kind': item.get('kind', 'tournament'),
+            'state': item['state'].upper(),
+            'location': item.get('location'),
+            'start_date': item['start_date'],
+            'end_date': item.get('end_date'),
+            'fee': item.get('fee'),
+            'divisions': item.get('divisions', []),
+            'formats': item.get('formats', []),
+            'contact_type': item.get('contact_type'),
+            'comp_levels': item.get('comp_levels', []),
+            'website': item.get('website'),
+            'signup_url': item.get('signup_url'),
+            'about': item.get('about'),
+            'contact_name': item.get('contact_name'),
+            'contact_email': item.get('contact_email'),
+            'contact_phone': item.get('contact_phone'),
+            'verified': False  # Scraped data starts as unverified
+        }
+    
+    def prepare_team(self, item: Dict) -> Optional[Dict]:
+        """Validate a scraped team and build its row"""
+        # Validate required fields
+        if not item.get('name') or not item.get('city') or not item.get('state'):
+            logger.warning(f"Skipping team with missing required fields: {item.get('name', 'Unknown')}")
+            return None
+        
+        # Get or create city
+        city_id = self.get_or_create_city(item['city'], item['state'])
+        
+        return {
+            'name': item['name'],
+            'slug': slugify(item['name']),  # Made unique when the row is inserted
+            'name_key': normalize_name(item['name']),  # Natural key for --upsert
+            'city_id': city_id,
+            'gender': item.get('gender'),
+            'age_groups': item.get('age_groups', []),
+            'comp_levels': item.get('comp_levels', []),
+            'formats': item.get('formats', []),
+            'contact_type': item.get('contact_type'),
+            'about': item.get('about'),
+            'accomplishments': item.get('accomplishments'),
+            'website': item.get('website'),
+            'signup_url': item.get('signup_url'),
+            'contact_name': item.get('contact_name'),
+            'contact_email': item.get('contact_email'),
+            'contact_phone': item.get('contact_phone'),
+            'verified': False  # Scraped data starts as unverified
+        }
+    
+    def import_leagues(self, data: Iterable[Dict], dry_run: bool = False) -> Dict:
+        """Import league data"""
+        return self.import_records('leagues', data, self.prepare_league, dry_run)
+    
+    def import_events(self, data: Iterable[Dict], dry_run: bool = False) -> Dict:
+        """Import event data (tournaments and clinics)"""
+        return self.import_records('events', data, self.prepare_event, dry_run)
+    
+    def import_teams(self, data: Iterable[Dict], dry_run: bool = False) -> Dict:
+        """Import team data"""
+        return self.import_records('teams', data, self.prepare_team, dry_run)
 
 def main():
     """Main import function"""
     parser = argparse.ArgumentParser(description='Import scraped data to Supabase')
-    parser.add_argument('--file', required=True, help='JSON file to import')
-    parser.add_argument('--type', required=True, choices=['leagues', 'events', 'teams'], 
-                       help='Type of data to import')
+    parser.add_argument('--file', required=True, nargs='+', help='JSON, JSONL or .gz file(s) to import')
+    parser.add_argument('--type', required=True, nargs='+', choices=['leagues', 'events', 'teams'], 
+                       help='Type of data to import (one for all files, or one per file)')
     parser.add_argument('--dry-run', action='store_true', help='Test run without importing')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Rows sent per insert request')
+    parser.add_argument('--upsert', action='store_true',
+                        help='Update existing rows by natural key instead of inserting duplicates')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Batches imported concurrently, across all files (also caps open database connections)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip rows and batches a previous (interrupted) run already committed')
+    parser.add_argument('--journal', default=str(DEFAULT_JOURNAL_PATH),
+                        help='Import journal database recording committed rows')
+    parser.add_argument('--no-journal', action='store_true', help='Do not record committed rows')
+    parser.add_argument('--local-db', metavar='PATH',
+                        help='Import into a local SQLite database instead of Supabase (for testing)')
     
     args = parser.parse_args()
+    if len(args.type) not in (1, len(args.file)):
+        parser.error('--type takes one type for all files, or one type per file')
+    types = args.type * len(args.file) if len(args.type) == 1 else args.type
+    if args.resume and args.no_journal:
+        parser.error('--resume needs the journal; drop --no-journal')
     
     # Initialize importer
-    importer = DataImporter()
+    if args.local_db:
+        from local_client import LocalClient
+        client = LocalClient(args.local_db)
+        logger.info(f"Importing into local database {args.local_db}")
+    else:
+        client = create_supabase_client()
     
-    # Load data
-    logger.info(f"Loading data from {args.file}")
-    data = importer.load_data(args.file)
-    logger.info(f"Loaded {len(data)} records")
+    journal = None
+    if not args.no_journal:
+        target = f"local:{Path(args.local_db).resolve()}" if args.local_db else SUPABASE_URL
+        journal = ImportJournal(Path(args.journal), target=target)
     
-    # Import based on type
-    if args.type == 'leagues':
-        stats = importer.import_leagues(data, dry_run=args.dry_run)
-    elif args.type == 'events':
-        stats = importer.import_events(data, dry_run=args.dry_run)
-    elif args.type == 'teams':
-        stats = importer.import_teams(data, dry_run=args.dry_run)
+    importer = DataImporter(client, batch_size=args.batch_size, upsert=args.upsert,
+                            workers=args.workers, journal=journal, resume=args.resume)
+    stats, unreadable = importer.import_files(zip(args.file, types), dry_run=args.dry_run)
     
     # Print summary
     logger.info("\n" + "="*50)
     logger.info("IMPORT SUMMARY")
     logger.info("="*50)
     logger.info(f"Success: {stats['success']}")
+    if args.upsert:
+        logger.info(f"  Updated: {stats['updated']}")
+        logger.info(f"  Unchanged: {stats['unchanged']}")
     logger.info(f"Failed: {stats['failed']}")
     logger.info(f"Skipped: {stats['skipped']}")
+    if args.resume:
+        logger.info(f"Already imported (resumed): {stats['resumed']}")
     logger.info("="*50)
     
     if args.dry_run:
         logger.info("\nThis was a DRY RUN. No data was imported.")
         logger.info("Run without --dry-run to actually import data.")
+    
+    if unreadable:
+        raise SystemExit(f"Malformed input, not fully imported: {', '.join(unreadable)}")
 
 
 if __name__ == '__main__':
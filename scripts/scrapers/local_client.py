@@ -0,0 +1,225 @@
+"""
+Local Database Client
+=====================
+SQLite stand-in for the parts of the Supabase client the importer uses.
+
+Lets import_to_supabase.py run end to end without a Supabase project, e.g.
+to test batching or measure import throughput. Tables are created on first
+use and gain columns as new keys appear; list and dict values are stored as
+JSON and decoded again on read. Multi-row inserts are atomic, like a single
+PostgREST request, upserts honor on_conflict and ignore_duplicates, and
+unique slugs, natural keys and the NOT NULL columns of supabase/schema.sql
+are enforced so constraint failures can be exercised. As in Postgres, an upsert row must
+satisfy NOT NULL even when it ends up updating an existing row.
+
+Usage:
+    from local_client import LocalClient
+
+    client = LocalClient('import_test.db')
+    client.table('cities').insert([{'name': 'Austin', 'state': 'TX', 'slug': 'austin-tx'}]).execute()
+    rows = client.table('cities').select('id,slug').eq('state', 'TX').execute().data
+
+    python import_to_supabase.py --file leagues.json --type leagues --local-db import_test.db
+"""
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# NOT NULL columns created with each table, as in supabase/schema.sql
+NOT_NULL_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    'cities': ('name', 'state', 'slug'),
+    'leagues': ('name',),
+    'events': ('state', 'name', 'start_date'),
+}
+
+# Unique constraints created with each table
+UNIQUE_KEYS: Dict[str, List[Tuple[str, ...]]] = {
+    'cities': [('slug',)],
+    'leagues': [('slug',), ('name_key', 'city_id')],
+    'events': [('slug',), ('name_key', 'start_date', 'state')],
+    'teams': [('slug',), ('name_key', 'city_id')],
+}
+
+
+class LocalAPIError(Exception):
+    """A rejected request, mirroring postgrest's APIError"""
+
+
+@dataclass
+class LocalResponse:
+    data: List[Dict]
+
+
+class LocalQuery:
+    """Chainable query with the supabase-py builder interface"""
+
+    def __init__(self, client: 'LocalClient', table: str):
+        self.client = client
+        self.table = table
+        self.operation = 'select'
+        self.columns = '*'
+        self.rows: List[Dict] = []
+        self.on_conflict: Optional[str] = None
+        self.ignore_duplicates = False
+        self.filters: List[Tuple[str, str, Any]] = []
+        self.offset: Optional[int] = None
+        self.limit_count: Optional[int] = None
+
+    def select(self, columns: str = '*', **kwargs) -> 'LocalQuery':
+        self.operation = 'select'
+        self.columns = columns
+        return self
+
+    def insert(self, rows, **kwargs) -> 'LocalQuery':
+        self.operation = 'insert'
+        self.rows = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict: str = '', ignore_duplicates: bool = False, **kwargs) -> 'LocalQuery':
+        self.operation = 'upsert'
+        self.rows = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def eq(self, column: str, value: Any) -> 'LocalQuery':
+        self.filters.append((column, '=', value))
+        return self
+
+    def in_(self, column: str, values: Sequence) -> 'LocalQuery':
+        self.filters.append((column, 'IN', list(values)))
+        return self
+
+    def range(self, start: int, end: int) -> 'LocalQuery':
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    def limit(self, count: int) -> 'LocalQuery':
+        self.limit_count = count
+        return self
+
+    def execute(self) -> LocalResponse:
+        with self.client.lock:
+            if self.operation in ('insert', 'upsert'):
+                return LocalResponse(self.client._insert(self.table, self.rows, self.on_conflict,
+                                                         self.ignore_duplicates))
+            return LocalResponse(self.client._select(self))
+
+
+class LocalClient:
+    """SQLite database behind a supabase-py style table() API"""
+
+    def __init__(self, path: str = ':memory:'):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.lock = threading.RLock()
+        self.table_columns: Dict[str, Dict[str, str]] = {}
+
+    def table(self, name: str) -> LocalQuery:
+        return LocalQuery(self, name)
+
+    def _ensure_table(self, table: str, rows: Sequence[Dict] = ()):
+        """Create the table and add any columns the rows introduce"""
+        if table not in self.table_columns:
+            required = ''.join(f', "{column}" NOT NULL' for column in NOT_NULL_COLUMNS.get(table, ()))
+            self.conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}" (id INTEGER PRIMARY KEY AUTOINCREMENT{required})'
+            )
+            self.table_columns[table] = {
+                row['name']: row['type'] for row in self.conn.execute(f'PRAGMA table_info("{table}")')
+            }
+
+        columns = self.table_columns[table]
+        for row in rows:
+            for column, value in row.items():
+                if column not in columns:
+                    column_type = 'JSON' if isinstance(value, (list, dict)) else ''
+                    self.conn.execute(f'ALTER TABLE "{table}" ADD COLUMN "{column}" {column_type}')
+                    columns[column] = column_type
+
+        for key in UNIQUE_KEYS.get(table, []):
+            if all(column in columns for column in key):
+                name = f"{table}_{'_'.join(key)}_key"
+                quoted = ', '.join(f'"{column}"' for column in key)
+                self.conn.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "{name}" ON "{table}" ({quoted})')
+
+    def _insert(self, table: str, rows: List[Dict], on_conflict: Optional[str] = None,
+                ignore_duplicates: bool = False) -> List[Dict]:
+        """
+        Insert (or upsert on the on_conflict columns) all rows or none of them
+
+        With ignore_duplicates, rows that conflict on on_conflict are left
+        out instead of updating, and only the rows actually inserted are
+        returned, as PostgREST does for resolution=ignore-duplicates.
+        """
+        self._ensure_table(table, rows)
+        inserted = []
+        try:
+            with self.conn:
+                for row in rows:
+                    columns = list(row)
+                    quoted = ', '.join(f'"{c}"' for c in columns)
+                    sql = f'INSERT INTO "{table}" ({quoted}) VALUES ({", ".join("?" * len(columns))})'
+                    if on_conflict:
+                        target = ', '.join(f'"{c.strip()}"' for c in on_conflict.split(','))
+                        if ignore_duplicates:
+                            sql += f' ON CONFLICT ({target}) DO NOTHING RETURNING id'
+                        else:
+                            updates = ', '.join(f'"{c}" = excluded."{c}"' for c in columns)
+                            sql += f' ON CONFLICT ({target}) DO UPDATE SET {updates} RETURNING id'
+                    cursor = self.conn.execute(sql, [self._encode(row[c]) for c in columns])
+                    if not on_conflict:
+                        inserted.append({'id': cursor.lastrowid, **row})
+                        continue
+                    returned = cursor.fetchone()
+                    if returned is not None:
+                        inserted.append({'id': returned[0], **row})
+        except sqlite3.DatabaseError as e:
+            raise LocalAPIError(str(e)) from e
+        return inserted
+
+    def _select(self, query: LocalQuery) -> List[Dict]:
+        self._ensure_table(query.table)
+        columns = self.table_columns[query.table]
+        selected = '*' if query.columns.strip() == '*' else ', '.join(
+            f'"{c.strip()}"' for c in query.columns.split(',') if c.strip() in columns
+        )
+
+        sql = f'SELECT {selected or "id"} FROM "{query.table}"'
+        params: List[Any] = []
+        clauses = []
+        for column, operator, value in query.filters:
+            if column not in columns:
+                return []
+            if operator == 'IN':
+                clauses.append(f'"{column}" IN ({", ".join("?" * len(value))})')
+                params.extend(self._encode(v) for v in value)
+            else:
+                clauses.append(f'"{column}" = ?')
+                params.append(self._encode(value))
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY id'
+        if query.limit_count is not None:
+            sql += f' LIMIT {int(query.limit_count)} OFFSET {int(query.offset or 0)}'
+
+        return [
+            {key: self._decode(row[key], columns.get(key)) for key in row.keys()}
+            for row in self.conn.execute(sql, params)
+        ]
+
+    @staticmethod
+    def _encode(value: Any) -> Any:
+        if isinstance(value, (list, dict)):
+            return json.dumps(value)
+        return value
+
+    @staticmethod
+    def _decode(value: Any, column_type: Optional[str]) -> Any:
+        if column_type == 'JSON' and isinstance(value, str):
+            return json.loads(value)
+        return value
@@ -4,21 +4,29 @@ NFL FLAG Scraper
 Scrape NFL FLAG leagues from play.nflflag.com
 
 The site uses a league finder tool that may require Selenium for dynamic content.
+Once nflflag_selenium_scraper.py --capture-api has recorded the finder's JSON
+endpoint, ZIP searches replay that endpoint over plain HTTP instead.
 
 Usage:
     python nflflag_scraper.py --state CA
     python nflflag_scraper.py --zip 90210
+    python nflflag_scraper.py --zip 90001 10001 60601
+    python nflflag_scraper.py --urls-file ../../scraped_data/raw/nflflag_urls.txt --parse-workers 4
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
-import re
-import time
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from functools import partial
+from typing import Iterable, Iterator, List, Dict, Optional
+from rate_limiter import get_rate_limiter
+from api_capture import find_records, load_json, replay_endpoint
+from exporters import StreamingExporter
+from records import LeagueData
+from html_parser import DEFAULT_PARSER, PARSER_CHOICES, HTMLNode, parse_html
+from field_extractor import extract_fields
+from pipeline import DEFAULT_FETCH_WORKERS, DEFAULT_PARSE_WORKERS, FetchParsePipeline
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -27,46 +35,99 @@ logger = logging.getLogger(__name__)
 # Configuration
 OUTPUT_DIR = Path('../../scraped_data/raw')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+API_ENDPOINT_FILE = OUTPUT_DIR / 'nflflag_api_endpoint.json'
+
+# Candidate JSON keys for each league field, most specific first
+API_FIELDS = {
+    'name': ['leagueName', 'programName', 'name', 'title'],
+    'city': ['city', 'cityName', 'locality'],
+    'state': ['state', 'stateCode', 'stateAbbreviation', 'region'],
+    'website': ['leagueUrl', 'registrationUrl', 'website', 'url', 'link'],
+    'contact_email': ['email', 'contactEmail'],
+    'contact_phone': ['phone', 'contactPhone', 'phoneNumber'],
+}
+
+
+def parse_league_page(url: str, content: bytes, parser: str = DEFAULT_PARSER) -> Optional[LeagueData]:
+    """Extract a league from a fetched page (runs in pipeline worker processes)"""
+    page = parse_html(content, parser)
+    
+    try:
+        # Extract league information
+        # This needs to be customized based on actual page structure
+        name_elem = page.select_one('h1')
+        name = name_elem.text.strip() if name_elem else None
+        fields = extract_fields(page.get_text('\n'))
+        
+        league = LeagueData(
+            name=name or 'NFL FLAG League',
+            city=fields.city,
+            state=fields.state,
+            source='nflflag.com',
+            website=url,
+            contact_email=fields.email,
+            contact_phone=fields.phone,
+            formats=['5v5'],  # NFL FLAG typically uses 5v5
+            contact_type='non-contact',
+            comp_levels=['rec', 'competitive']
+        )
+        
+        return league
+        
+    except Exception as e:
+        logger.error(f"Error parsing league page {url}: {e}")
+        return None
 
 
 class NFLFlagScraper:
     """Scraper for NFL FLAG leagues"""
     
-    def __init__(self):
+    def __init__(self, endpoint_file: Path = API_ENDPOINT_FILE, parser: str = DEFAULT_PARSER):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'FlagFootballDirectory/1.0 (Educational purposes)',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
         })
-        self.delay = 2
+        self.rate_limiter = get_rate_limiter()
         self.base_url = "https://play.nflflag.com"
+        self.endpoint = load_json(endpoint_file) if Path(endpoint_file).exists() else None
+        self.parser = parser
     
-    def get_page(self, url: str):
-        """Fetch a page with error handling"""
+    def fetch(self, url: str) -> Optional[bytes]:
+        """Fetch a page body with error handling"""
         try:
+            self.rate_limiter.acquire(url)
             logger.info(f"Fetching: {url}")
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            time.sleep(self.delay)
-            return BeautifulSoup(response.content, 'html.parser')
+            return response.content
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
     
-    def search_by_location(self, zip_code: str = None, state: str = None) -> List[Dict]:
+    def get_page(self, url: str) -> Optional[HTMLNode]:
+        """Fetch and parse a page"""
+        content = self.fetch(url)
+        return parse_html(content, self.parser) if content is not None else None
+    
+    def search_by_location(self, zip_code: str = None, state: str = None) -> List[LeagueData]:
         """
         Search for leagues by location
         
         Note: NFL FLAG's league finder may use JavaScript/API calls.
         This is a basic implementation - may need Selenium for full functionality.
+        When a captured API endpoint is available, ZIP searches use it directly.
         """
+        if zip_code and self.endpoint:
+            return self.search_api(zip_code)
+        
         leagues = []
         
         # Try the league finder page
         finder_url = f"{self.base_url}/"
-        soup = self.get_page(finder_url)
+        page = self.get_page(finder_url)
         
-        if not soup:
+        if not page:
             logger.error("Could not load NFL FLAG league finder")
             return leagues
         
@@ -78,42 +139,86 @@ class NFLFlagScraper:
         
         return leagues
     
-    def scrape_league_page(self, url: str) -> Dict:
-        """Scrape a single league page"""
-        soup = self.get_page(url)
-        if not soup:
-            return None
+    def search_api(self, zip_code: str) -> List[LeagueData]:
+        """Replay the captured league finder API for one ZIP code"""
+        if not self.endpoint.get('parameterized'):
+            logger.warning("Captured endpoint does not take a ZIP code; results may not vary by location")
         
         try:
-            # Extract league information
-            # This needs to be customized based on actual page structure
-            
-            league = {
-                'name': 'NFL FLAG League',
-                'source': 'nflflag.com',
-                'website': url,
-                'formats': ['5v5'],  # NFL FLAG typically uses 5v5
-                'contact_type': 'non-contact',
-                'comp_levels': ['rec', 'competitive']
-            }
-            
-            return league
-            
+            data = replay_endpoint(self.session, self.endpoint, zip_code, rate_limiter=self.rate_limiter)
         except Exception as e:
-            logger.error(f"Error parsing league page {url}: {e}")
+            logger.error(f"Error calling league finder API for {zip_code}: {e}")
+            return []
+        
+        leagues = [league for league in map(self._league_from_api, find_records(data)) if league]
+        logger.info(f"✅ Found {len(leagues)} leagues near {zip_code}")
+        return leagues
+    
+    def _league_from_api(self, record: Dict) -> Optional[LeagueData]:
+        """Map one API record onto our league fields"""
+        def pick(field):
+            for key in API_FIELDS[field]:
+                value = record.get(key)
+                if isinstance(value, (str, int, float)) and str(value).strip():
+                    return str(value).strip()
             return None
-
+        
+        name = pick('name')
+        if not name:
+            return None
+        
+        return LeagueData(
+            name=name,
+            city=pick('city'),
+            state=pick('state'),
+            website=pick('website') or self.base_url,
+            contact_email=pick('contact_email'),
+            contact_phone=pick('contact_phone'),
+            source='nflflag.com',
+            formats=['5v5'],  # NFL FLAG typically uses 5v5
+            contact_type='non-contact',
+            comp_levels=['rec', 'competitive']
+        )
+    
+    def scrape_league_page(self, url: str) -> Optional[LeagueData]:
+        """Scrape a single league page"""
+        content = self.fetch(url)
+        if content is None:
+            return None
+        return parse_league_page(url, content, self.parser)
+    
+    def scrape_league_pages(self, urls: Iterable[str], fetch_workers: int = DEFAULT_FETCH_WORKERS,
+                            parse_workers: int = DEFAULT_PARSE_WORKERS) -> Iterator[LeagueData]:
+        """Scrape many league pages, fetching on threads and parsing on every core"""
+        pipeline = FetchParsePipeline(self.fetch, partial(parse_league_page, parser=self.parser),
+                                      fetch_workers=fetch_workers, parse_workers=parse_workers)
+        return pipeline.imap(urls)
 
 def main():
     """Main execution"""
     import argparse
     
     parser = argparse.ArgumentParser(description='Scrape NFL FLAG leagues')
-    parser.add_argument('--zip', help='ZIP code to search')
+    parser.add_argument('--zip', nargs='+', help='ZIP code(s) to search')
     parser.add_argument('--state', help='State abbreviation (e.g., CA)')
     parser.add_argument('--output', default='nflflag', help='Output filename prefix')
+    parser.add_argument('--endpoint-file', default=str(API_ENDPOINT_FILE),
+                        help='Endpoint captured by nflflag_selenium_scraper.py --capture-api')
+    parser.add_argument('--rate-limit', action='append', metavar='DOMAIN=RPS',
+                        help='Requests per second for a domain (repeatable)')
+    parser.add_argument('--parser', choices=PARSER_CHOICES, default=DEFAULT_PARSER,
+                        help='HTML parser backend (auto = fastest installed)')
+    parser.add_argument('--urls-file', help='League page URLs to scrape, e.g. saved by nflflag_selenium_scraper.py')
+    parser.add_argument('--fetch-workers', type=int, default=DEFAULT_FETCH_WORKERS,
+                        help='Threads downloading league pages (each domain is still rate limited)')
+    parser.add_argument('--parse-workers', type=int, default=DEFAULT_PARSE_WORKERS,
+                        help='Processes parsing league pages (0 = parse on the main thread)')
     
     args = parser.parse_args()
+    try:
+        get_rate_limiter().configure(args.rate_limit)
+    except ValueError as e:
+        parser.error(str(e))
     
     logger.info("="*60)
     logger.info("NFL FLAG SCRAPER")
@@ -124,30 +229,42 @@ def main():
     logger.info("   For best results, use Selenium-based scraper")
     logger.info("")
     
-    scraper = NFLFlagScraper()
+    scraper = NFLFlagScraper(endpoint_file=Path(args.endpoint_file), parser=args.parser)
     
-    # Search for leagues
-    leagues = scraper.search_by_location(
-        zip_code=args.zip,
-        state=args.state
-    )
+    if args.urls_file:
+        # Scrape known league pages
+        with open(args.urls_file, 'r') as f:
+            urls = [line.strip() for line in f if line.strip()]
+        logger.info(f"Scraping {len(urls)} league pages from {args.urls_file}")
+        found = scraper.scrape_league_pages(urls, args.fetch_workers, args.parse_workers)
+    else:
+        # Search for leagues (one request per ZIP when the API is known)
+        found = (league for zip_code in args.zip or [None]
+                 for league in scraper.search_by_location(zip_code=zip_code, state=args.state))
+    
+    leagues = []
+    seen = set()
+    for league in found:
+        key = (league.name, league.website)
+        if key not in seen:
+            seen.add(key)
+            leagues.append(league)
     
     if leagues:
         # Save results
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         output_file = OUTPUT_DIR / f'{args.output}_{timestamp}_leagues.json'
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(leagues, f, indent=2)
-        
-        logger.info(f"✅ Saved {len(leagues)} leagues to {output_file}")
+        with StreamingExporter({output_file: 'json'}, label='leagues') as results:
+            results.write_many(leagues)
     else:
         logger.warning("No leagues found")
         logger.info("")
         logger.info("💡 Recommendations:")
         logger.info("   1. Use Selenium scraper for NFL FLAG")
         logger.info("   2. Check play.nflflag.com manually")
-        logger.info("   3. Look for their API endpoint")
+        logger.info("   3. Capture their API endpoint:")
+        logger.info("      python nflflag_selenium_scraper.py --zip 90210 --capture-api")
 
 
 if __name__ == '__main__':
@@ -13,25 +13,29 @@ Usage:
     python nflflag_selenium_scraper.py --zip 90210
     python nflflag_selenium_scraper.py --city "Los Angeles" --state CA
     python nflflag_selenium_scraper.py --state CA --all
+    python nflflag_selenium_scraper.py --zip 90001 90210 10001 --workers 4 --block-resources
+    python nflflag_selenium_scraper.py --zip 90210 --workers 4 --parse-workers 4
+    python nflflag_selenium_scraper.py --zip 90210 --capture-api
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-import time
-import json
+from selenium.common.exceptions import NoSuchElementException
 import logging
-import re
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 import argparse
+from functools import partial
+from rate_limiter import get_rate_limiter
+from selenium_helpers import DEFAULT_MAX_WAIT, PageReadiness, collect_links
+from browser_pool import DEFAULT_RECYCLE_AFTER, BrowserPool
+from api_capture import capture_json_responses, find_search_endpoint, save_json
+from exporters import FORMATS, StreamingExporter, outputs_for
+from records import LeagueData
+from field_extractor import extract_fields
+from html_parser import DEFAULT_PARSER, PARSER_CHOICES, parse_html
+from pipeline import DEFAULT_PARSE_WORKERS, FetchParsePipeline
 
 # Setup logging
 logging.basicConfig(
@@ -43,50 +47,112 @@ logger = logging.getLogger(__name__)
 # Configuration
 OUTPUT_DIR = Path('../../scraped_data/raw')
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+API_ENDPOINT_FILE = OUTPUT_DIR / 'nflflag_api_endpoint.json'
 
+# Divisions assumed when a league page lists none
+DEFAULT_AGE_GROUPS = ('6U', '8U', '10U', '12U', '14U')
 
-class NFLFlagSeleniumScraper:
-    """Selenium-based scraper for NFL FLAG leagues"""
+
+# Where the league name appears on a league page, most specific first
+NAME_SELECTORS = ['h1', '.league-name', '[data-league-name]', '.title']
+
+
+def extract_description(text: str) -> Optional[str]:
+    """Extract description/about text"""
+    # Get first few sentences that look like a description
+    sentences = text.split('.')
+    description_parts = []
+    
+    for sentence in sentences[:5]:
+        sentence = sentence.strip()
+        if len(sentence) > 30 and 'flag football' in sentence.lower():
+            description_parts.append(sentence)
     
-    def __init__(self, headless: bool = True):
-        """Initialize Selenium WebDriver"""
-        chrome_options = Options()
+    description = '. '.join(description_parts[:3])
+    return description[:500] if description else None
+
+
+def parse_league_page(url: str, content: bytes, parser: str = DEFAULT_PARSER) -> Optional[LeagueData]:
+    """Extract a league from a rendered page (runs in pipeline worker processes)"""
+    page = parse_html(content, parser)
+    
+    try:
+        # Extract league name
+        name = None
+        for selector in NAME_SELECTORS:
+            elem = page.select_one(selector)
+            if elem and elem.text.strip():
+                name = elem.text.strip()
+                break
         
-        if headless:
-            chrome_options.add_argument('--headless=new')
+        if not name:
+            logger.warning(f"⚠️  Could not find league name for {url}")
+            return None
         
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--disable-software-rasterizer')
-        chrome_options.add_argument('--disable-webgl')
-        chrome_options.add_argument('--disable-3d-apis')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36')
+        # Page text for parsing, one line per text node like Selenium's element.text
+        body = page.select_one('body') or page
+        page_text = body.get_text('\n')
+        
+        # Every regex-derived field in one pass over the text
+        fields = extract_fields(page_text)
+        city, state = fields.city, fields.state
+        season_start, season_end = fields.season_dates()
+        
+        # Build league data
+        league = LeagueData(
+            name=name,
+            city=city,
+            state=state,
+            website=url,
+            source='nflflag.com',
+            formats=['5v5'],  # NFL FLAG typically uses 5v5
+            contact_type='non-contact',
+            comp_levels=['rec', 'competitive'],
+            divisions=fields.age_groups or list(DEFAULT_AGE_GROUPS),
+            season_start=season_start,
+            season_end=season_end,
+            contact_email=fields.email,
+            contact_phone=fields.phone,
+            about=extract_description(page_text),
+            league_type='youth',
+            organization='NFL FLAG'
+        )
         
-        # Disable WebGL entirely
-        chrome_options.add_experimental_option('prefs', {
-            'webgl.disabled': True
-        })
+        logger.info(f"✅ Scraped: {name} in {city}, {state}")
+        return league
         
-        # Suppress WebGL error messages
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    except Exception as e:
+        logger.error(f"❌ Error parsing league page {url}: {e}")
+        return None
+
+
+class NFLFlagSeleniumScraper:
+    """Selenium-based scraper for NFL FLAG leagues"""
+    
+    def __init__(self, headless: bool = True, max_wait: float = DEFAULT_MAX_WAIT,
+                 pool: Optional[BrowserPool] = None, parser: str = DEFAULT_PARSER):
+        """
+        Initialize the scraper
         
-        # Automatically manage ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 15)
+        Args:
+            headless: Run Chrome without a window (ignored when pool is given)
+            max_wait: Upper bound in seconds on waiting for a page to render
+            pool: Shared browser pool; a single-driver pool is created if omitted
+            parser: html_parser backend for the rendered league pages
+        """
+        self.pool = pool or BrowserPool(size=1, headless=headless)
+        self.owns_pool = pool is None
+        self.max_wait = max_wait
+        self.parser = parser
         
         self.base_url = "https://play.nflflag.com"
-        logger.info("✅ Selenium WebDriver initialized")
+        self.rate_limiter = get_rate_limiter()
+        logger.info("✅ Selenium scraper initialized")
     
     def __del__(self):
         """Clean up WebDriver"""
-        if hasattr(self, 'driver'):
-            try:
-                self.driver.quit()
-            except:
-                pass
+        if getattr(self, 'owns_pool', False):
+            self.pool.close()
     
     def search_by_location(self, zip_code: str = None, city: str = None, state: str = None) -> List[str]:
         """
@@ -113,10 +179,45 @@ class NFLFlagSeleniumScraper:
             logger.info("⚠️  Skipping search - provide a ZIP code for best results")
             return []
         
+        with self.pool.driver() as driver:
+            return self._search_zip(driver, zip_code)
+    
+    def search_zip_codes(self, zip_codes: List[str]) -> List[str]:
+        """Search several ZIP codes in parallel across the browser pool"""
+        results = self.pool.map(self._search_zip, zip_codes)
+        return sorted({url for urls in results for url in urls})
+    
+    def capture_search_api(self, zip_code: str) -> Optional[Dict]:
+        """
+        Run one ZIP search and record the JSON API behind the league finder
+        
+        The pool must be created with capture_network=True. Every JSON
+        response is saved for inspection, and the search request is saved
+        as an endpoint template that nflflag_scraper.py replays over HTTP.
+        
+        Returns:
+            The endpoint template, or None if nothing was captured
+        """
+        with self.pool.driver() as driver:
+            driver.get_log('performance')  # Drop traffic from earlier pages
+            self._search_zip(driver, zip_code)
+            responses = capture_json_responses(driver)
+        
+        save_json(responses, OUTPUT_DIR / f'nflflag_api_responses_{zip_code}.json')
+        
+        endpoint = find_search_endpoint(responses, zip_code)
+        if endpoint:
+            save_json(endpoint, API_ENDPOINT_FILE)
+        return endpoint
+    
+    def _search_zip(self, driver, zip_code: str) -> List[str]:
+        """Run one ZIP code search on a borrowed driver"""
+        ready = PageReadiness(driver, max_wait=self.max_wait)
+        
         try:
             # Load the league finder page
-            self.driver.get(self.base_url)
-            time.sleep(3)  # Let page load
+            self.rate_limiter.acquire(self.base_url)
+            driver.get(self.base_url)
             
             logger.info(f"🔎 Searching for ZIP: {zip_code}")
             
@@ -130,9 +231,21 @@ class NFLFlagSeleniumScraper:
                 '.zip-input'
             ]
             
+            # Selectors for league links in the search results
+            link_selectors = [
+                'a[href*="league"]',
+                'a[href*="detail"]',
+                '.league-link',
+                '.result a',
+                '[data-league]'
+            ]
+            
+            # Proceed as soon as any candidate input is rendered
+            ready.wait_for_any(zip_selectors)
+            
             for selector in zip_selectors:
                 try:
-                    zip_input = self.driver.find_element(By.CSS_SELECTOR, selector)
+                    zip_input = driver.find_element(By.CSS_SELECTOR, selector)
                     if zip_input.is_displayed():
                         logger.info(f"✅ Found ZIP input: {selector}")
                         break
@@ -141,77 +254,63 @@ class NFLFlagSeleniumScraper:
             
             if not zip_input:
                 logger.error("❌ Could not find ZIP code input")
-                self.driver.save_screenshot('../../scraped_data/raw/nflflag_debug.png')
-                logger.info("💾 Saved screenshot to: ../../scraped_data/raw/nflflag_debug.png")
+                path = self._save_screenshot(driver, 'debug', zip_code)
+                logger.info(f"💾 Saved screenshot to: {path}")
                 return []
             
             # Enter ZIP code
             zip_input.clear()
             zip_input.send_keys(zip_code)
-            time.sleep(1)
             
             # Press Enter to search
             zip_input.send_keys(Keys.RETURN)
             
             logger.info("⏳ Waiting for results to load...")
-            time.sleep(5)  # Wait for results
+            ready.wait_for_any(link_selectors)
+            ready.settled()
             
             # WebGL error is expected and harmless - ignore it
             logger.info("ℹ️  Ignoring WebGL errors (map feature) - extracting text data instead")
             
             # Take screenshot of results
-            self.driver.save_screenshot('../../scraped_data/raw/nflflag_results.png')
+            self._save_screenshot(driver, 'results', zip_code)
             logger.info("💾 Saved results screenshot")
             
-            # Extract league links
-            league_urls = set()
-            
-            # Try to find league links
-            link_selectors = [
-                'a[href*="league"]',
-                'a[href*="detail"]',
-                '.league-link',
-                '.result a',
-                '[data-league]'
-            ]
-            
-            for selector in link_selectors:
-                try:
-                    links = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    for link in links:
-                        href = link.get_attribute('href')
-                        if href and ('league' in href.lower() or 'detail' in href.lower()):
-                            league_urls.add(href)
-                except:
-                    continue
+            # Extract league links in one round-trip
+            league_urls = collect_links(
+                driver,
+                contains=['league', 'detail'],
+                selectors=link_selectors,
+                keep_query=True
+            )
             
             # Also try to get all visible links
             if not league_urls:
                 logger.info("🔍 Trying to find any links on the page...")
-                all_links = self.driver.find_elements(By.TAG_NAME, 'a')
-                for link in all_links:
-                    try:
-                        href = link.get_attribute('href')
-                        text = link.text.strip()
-                        if href and link.is_displayed():
-                            logger.info(f"   Found link: {text[:50]} -> {href[:80]}")
-                            if 'league' in href.lower() or 'detail' in href.lower():
-                                league_urls.add(href)
-                    except:
-                        continue
+                visible_links = collect_links(driver, visible_only=True, keep_query=True)
+                for href in visible_links:
+                    logger.info(f"   Found link: {href[:80]}")
+                league_urls = [href for href in visible_links
+                               if 'league' in href.lower() or 'detail' in href.lower()]
             
-            league_urls = sorted(list(league_urls))
             logger.info(f"✅ Found {len(league_urls)} league URLs")
             
             return league_urls
             
         except Exception as e:
             logger.error(f"❌ Error searching: {e}")
-            self.driver.save_screenshot('../../scraped_data/raw/nflflag_error.png')
+            self._save_screenshot(driver, 'error', zip_code)
             logger.info("💾 Saved error screenshot")
             return []
     
-    def scrape_league_page(self, url: str) -> Optional[Dict]:
+    @staticmethod
+    def _save_screenshot(driver, kind: str, zip_code: str) -> Path:
+        """Screenshot named per ZIP so parallel pool workers don't overwrite each other"""
+        path = OUTPUT_DIR / f'nflflag_{kind}_{zip_code}.png'
+        driver.save_screenshot(str(path))
+        return path
+    
+    def scrape_league_page(self, url: str) -> Optional[LeagueData]:
         """
         Scrape details from a single league page
         
@@ -221,167 +320,53 @@ class NFLFlagSeleniumScraper:
         Returns:
             Dictionary of league data
         """
-        logger.info(f"🔍 Scraping: {url}")
-        
-        try:
-            self.driver.get(url)
-            time.sleep(3)
-            
-            # Extract league name
-            name = None
-            name_selectors = ['h1', '.league-name', '[data-league-name]', '.title']
-            for selector in name_selectors:
-                try:
-                    elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if elem.text.strip():
-                        name = elem.text.strip()
-                        break
-                except:
-                    continue
-            
-            if not name:
-                logger.warning(f"⚠️  Could not find league name for {url}")
-                return None
-            
-            # Get page text for parsing
-            page_text = self.driver.find_element(By.TAG_NAME, 'body').text
-            
-            # Extract location
-            city, state = self.extract_location(page_text)
-            
-            # Extract other details
-            age_groups = self.extract_age_groups(page_text)
-            season_info = self.extract_season(page_text)
-            contact_info = self.extract_contact(page_text)
-            
-            # Build league data
-            league = {
-                'name': name,
-                'city': city,
-                'state': state,
-                'website': url,
-                'source': 'nflflag.com',
-                'formats': ['5v5'],  # NFL FLAG typically uses 5v5
-                'contact_type': 'non-contact',
-                'comp_levels': ['rec', 'competitive'],
-                'divisions': age_groups,
-                'season_start': season_info.get('start'),
-                'season_end': season_info.get('end'),
-                'contact_email': contact_info.get('email'),
-                'contact_phone': contact_info.get('phone'),
-                'about': self.extract_description(page_text),
-                'league_type': 'youth',
-                'organization': 'NFL FLAG'
-            }
-            
-            logger.info(f"✅ Scraped: {name} in {city}, {state}")
-            return league
-            
-        except Exception as e:
-            logger.error(f"❌ Error scraping {url}: {e}")
+        content = self.render(url)
+        if content is None:
             return None
+        return parse_league_page(url, content, self.parser)
     
-    def extract_location(self, text: str) -> tuple:
-        """Extract city and state from text"""
-        # Pattern: City, ST
-        pattern = r'([A-Z][a-zA-Z\s]+),\s*([A-Z]{2})\b'
-        matches = re.findall(pattern, text)
-        
-        if matches:
-            # Return the first match that looks like a city, state pair
-            for city, state in matches:
-                city = city.strip()
-                if len(city) > 2 and state.isupper():
-                    return city, state
-        
-        return None, None
+    def scrape_league_pages(self, urls: List[str], parse_workers: int = DEFAULT_PARSE_WORKERS) -> List[LeagueData]:
+        """Scrape many league pages in parallel across the browser pool"""
+        return list(self.iter_league_pages(urls, parse_workers))
     
-    def extract_age_groups(self, text: str) -> List[str]:
-        """Extract age groups/divisions"""
-        age_groups = []
-        
-        # Look for patterns like "5U", "8U", etc.
-        divisions = re.findall(r'\b(\d+U)\b', text)
-        age_groups.extend(divisions)
-        
-        # Look for age ranges like "ages 5-12"
-        age_range = re.search(r'ages?\s+(\d+)\s*[-to]+\s*(\d+)', text, re.IGNORECASE)
-        if age_range:
-            start = int(age_range.group(1))
-            end = int(age_range.group(2))
-            for age in range(start, end + 1, 2):
-                age_groups.append(f"{age}U")
-        
-        return sorted(list(set(age_groups))) if age_groups else ['6U', '8U', '10U', '12U', '14U']
-    
-    def extract_season(self, text: str) -> Dict:
-        """Extract season dates"""
-        season_info = {'start': None, 'end': None}
-        
-        # Look for season keywords
-        seasons = {
-            'spring': ('03-01', '05-31'),
-            'summer': ('06-01', '08-31'),
-            'fall': ('09-01', '11-30'),
-            'winter': ('12-01', '02-28')
-        }
-        
-        text_lower = text.lower()
-        for season, (start, end) in seasons.items():
-            if season in text_lower:
-                year = datetime.now().year
-                season_info['start'] = f"{year}-{start}"
-                season_info['end'] = f"{year}-{end}"
-                break
+    def iter_league_pages(self, urls: List[str], parse_workers: int = DEFAULT_PARSE_WORKERS) -> Iterator[LeagueData]:
+        """
+        Scrape league pages in parallel, yielding each league as soon as it is ready
         
-        return season_info
+        Every pool driver renders pages on its own thread while the rendered
+        HTML is parsed in worker processes, so the browsers never wait on parsing.
+        """
+        pipeline = FetchParsePipeline(self.render, partial(parse_league_page, parser=self.parser),
+                                      fetch_workers=self.pool.size, parse_workers=parse_workers)
+        return pipeline.imap(urls)
     
-    def extract_contact(self, text: str) -> Dict:
-        """Extract contact information"""
-        contact = {'email': None, 'phone': None}
-        
-        # Email pattern
-        email_match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-        if email_match:
-            contact['email'] = email_match.group(0)
-        
-        # Phone pattern
-        phone_match = re.search(r'\b(?:\d{3}[-.]?)?\d{3}[-.]?\d{4}\b', text)
-        if phone_match:
-            contact['phone'] = phone_match.group(0)
-        
-        return contact
+    def render(self, url: str) -> Optional[bytes]:
+        """Load a league page on a borrowed driver and return the rendered HTML"""
+        logger.info(f"🔍 Scraping: {url}")
+        try:
+            with self.pool.driver() as driver:
+                ready = PageReadiness(driver, max_wait=self.max_wait)
+                self.rate_limiter.acquire(url)
+                driver.get(url)
+                ready.wait_for_any(NAME_SELECTORS)
+                ready.settled()
+                return driver.page_source.encode('utf-8')
+        except Exception as e:
+            logger.error(f"❌ Error scraping {url}: {e}")
+            return None
     
-    def extract_description(self, text: str) -> str:
-        """Extract description/about text"""
-        # Get first few sentences that look like a description
-        sentences = text.split('.')
-        description_parts = []
-        
-        for sentence in sentences[:5]:
-            sentence = sentence.strip()
-            if len(sentence) > 30 and 'flag football' in sentence.lower():
-                description_parts.append(sentence)
-        
-        description = '. '.join(description_parts[:3])
-        return description[:500] if description else None
+    def open_results(self, output_prefix: str, formats: Optional[List[str]] = None) -> StreamingExporter:
+        """Open timestamped output files that leagues are written to as they are scraped"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        stem = OUTPUT_DIR / f'{output_prefix}_{timestamp}_leagues'
+        return StreamingExporter(outputs_for(stem, formats or ['json']), label='leagues')
     
-    def save_results(self, leagues: List[Dict], output_prefix: str):
+    def save_results(self, leagues: List[LeagueData], output_prefix: str, formats: Optional[List[str]] = None):
         """Save scraped leagues to file"""
-        if not leagues:
-            logger.warning("⚠️  No leagues to save")
-            return
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        
-        # Save as JSON
-        json_file = OUTPUT_DIR / f'{output_prefix}_{timestamp}_leagues.json'
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(leagues, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"💾 Saved {len(leagues)} leagues to {json_file}")
+        with self.open_results(output_prefix, formats) as results:
+            results.write_many(leagues)
         
-        return json_file
+        return results.paths[0] if results.count else None
 
 
 def main():
@@ -389,14 +374,38 @@ def main():
     parser = argparse.ArgumentParser(
         description='Scrape NFL FLAG leagues using Selenium'
     )
-    parser.add_argument('--zip', help='ZIP code to search')
+    parser.add_argument('--zip', nargs='+', help='ZIP code(s) to search')
     parser.add_argument('--city', help='City name')
     parser.add_argument('--state', help='State abbreviation (e.g., CA)')
     parser.add_argument('--output', default='nflflag', help='Output filename prefix')
     parser.add_argument('--headless', action='store_true', help='Run in headless mode')
     parser.add_argument('--debug', action='store_true', help='Save debug screenshots')
+    parser.add_argument('--rate-limit', action='append', metavar='DOMAIN=RPS',
+                        help='Requests per second for a domain (repeatable)')
+    parser.add_argument('--max-wait', type=float, default=DEFAULT_MAX_WAIT,
+                        help='Upper bound in seconds on waiting for each page to render')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of headless browsers rendering pages in parallel')
+    parser.add_argument('--parse-workers', type=int, default=DEFAULT_PARSE_WORKERS,
+                        help='Processes parsing rendered league pages (0 = parse on the main thread)')
+    parser.add_argument('--parser', choices=PARSER_CHOICES, default=DEFAULT_PARSER,
+                        help='HTML parser backend (auto = fastest installed)')
+    parser.add_argument('--recycle-after', type=int, default=DEFAULT_RECYCLE_AFTER,
+                        help='Pages each browser renders before it is restarted (0 = never)')
+    parser.add_argument('--block-resources', action='store_true',
+                        help='Skip images, fonts, CSS, media and third-party scripts')
+    parser.add_argument('--allow-host', action='append', default=[], metavar='HOST',
+                        help='Host to never block with --block-resources (repeatable)')
+    parser.add_argument('--capture-api', action='store_true',
+                        help='Record the JSON search API for the first ZIP and exit')
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['json'],
+                        help='Output formats, written as each league is scraped')
     
     args = parser.parse_args()
+    try:
+        get_rate_limiter().configure(args.rate_limit)
+    except ValueError as e:
+        parser.error(str(e))
     
     logger.info("="*70)
     logger.info("NFL FLAG SELENIUM SCRAPER")
@@ -413,16 +422,30 @@ def main():
         return
     
     # Initialize scraper
-    scraper = NFLFlagSeleniumScraper(headless=args.headless)
+    pool = BrowserPool(
+        size=args.workers,
+        headless=args.headless,
+        recycle_after=args.recycle_after,
+        block_resources=args.block_resources,
+        allow_hosts=args.allow_host,
+        capture_network=args.capture_api
+    )
+    scraper = NFLFlagSeleniumScraper(max_wait=args.max_wait, pool=pool, parser=args.parser)
     
     try:
+        if args.capture_api:
+            logger.info(f"\n📡 Capturing the league finder API with ZIP {args.zip[0]}...")
+            endpoint = scraper.capture_search_api(args.zip[0])
+            if not endpoint:
+                logger.warning("⚠️  No JSON API traffic was captured")
+                return
+            logger.info("\n🎯 Next: sweep ZIP codes without a browser:")
+            logger.info("   python nflflag_scraper.py --zip 90001 10001 60601")
+            return
+        
         # Search for leagues
         logger.info("\n🔍 Searching for leagues...")
-        league_urls = scraper.search_by_location(
-            zip_code=args.zip,
-            city=args.city,
-            state=args.state
-        )
+        league_urls = scraper.search_zip_codes(args.zip)
         
         if not league_urls:
             logger.warning("⚠️  No league URLs found")
@@ -439,24 +462,18 @@ def main():
         logger.info(f"💾 Saved URLs to {urls_file}")
         
         # Scrape each league
-        logger.info(f"\n📥 Scraping {len(league_urls)} leagues...")
-        leagues = []
-        
-        for i, url in enumerate(league_urls, 1):
-            logger.info(f"\n[{i}/{len(league_urls)}] Scraping league...")
-            league = scraper.scrape_league_page(url)
-            if league:
-                leagues.append(league)
-            time.sleep(2)  # Be respectful
+        logger.info(f"\n📥 Scraping {len(league_urls)} leagues with {args.workers} browser(s)...")
+        with scraper.open_results(args.output, args.format) as results:
+            results.write_many(scraper.iter_league_pages(league_urls, args.parse_workers))
         
-        # Save results
-        if leagues:
-            output_file = scraper.save_results(leagues, args.output)
+        # Report results
+        if results.count:
+            output_file = results.paths[0]
             
             logger.info("\n" + "="*70)
             logger.info("✅ SCRAPING COMPLETE!")
             logger.info("="*70)
-            logger.info(f"\nScraped {len(leagues)} leagues from NFL FLAG")
+            logger.info(f"\nScraped {results.count} leagues from NFL FLAG")
             logger.info(f"\n📊 Results saved to: {output_file}")
             logger.info("\n🎯 Next steps:")
             logger.info("   1. Review the output file")
@@ -468,7 +485,7 @@ def main():
         
     finally:
         # Cleanup
-        del scraper
+        pool.close()
 
 
 if __name__ == '__main__':
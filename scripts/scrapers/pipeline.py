@@ -0,0 +1,185 @@
+"""
+Fetch/Parse Pipeline
+====================
+Download pages on I/O threads and parse them on every core.
+
+Scrapers used to fetch, parse and extract one page at a time on one thread,
+so the CPU-bound parse held up the next request. The pipeline splits that in
+two stages:
+
+    fetch threads  --(url, bytes)-->  bounded queue  -->  parser processes
+
+Fetch threads call fetch(url) (rate limited, cached, frontier-aware) and hand
+the raw body to a bounded queue; the main thread feeds the queue into a
+ProcessPoolExecutor that runs parse(url, content) and yields each record as
+soon as it is ready. When the parsers fall behind, the full queue makes the
+fetch threads wait instead of buffering the whole crawl in memory.
+
+parse must be a picklable module-level function (or functools.partial of one)
+returning a record or None. With parse_workers=0 pages are parsed on the main
+thread, which is handy for debugging.
+
+Usage:
+    from functools import partial
+    from pipeline import FetchParsePipeline
+
+    pipeline = FetchParsePipeline(scraper.fetch, partial(parse_league_page, parser='selectolax'),
+                                  fetch_workers=4, parse_workers=8)
+    for league in pipeline.imap(urls):
+        results.write(league)
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, Iterator, Optional, Set, TypeVar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCH_WORKERS = 4
+DEFAULT_PARSE_WORKERS = os.cpu_count() or 1
+DEFAULT_QUEUE_SIZE = 32  # Fetched pages waiting for a parser
+
+POLL_INTERVAL = 0.1  # Seconds between checks for finished parses and shutdown
+
+R = TypeVar('R')
+
+_DONE = None  # Put on the page queue by each fetch thread when it runs out of URLs
+
+
+class FetchParsePipeline:
+    """Threaded fetching feeding a process pool of parsers"""
+
+    def __init__(self, fetch: Callable[[str], Optional[bytes]],
+                 parse: Callable[[str, bytes], Optional[R]],
+                 fetch_workers: int = DEFAULT_FETCH_WORKERS,
+                 parse_workers: int = DEFAULT_PARSE_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 on_parsed: Optional[Callable[[str, Optional[R]], None]] = None):
+        """
+        Args:
+            fetch: Returns a page body, or None to skip the URL (called on fetch threads)
+            parse: Turns (url, body) into a record or None (called in worker processes)
+            fetch_workers: Concurrent downloads (the rate limiter still paces each domain)
+            parse_workers: Parser processes (0 = parse on the calling thread)
+            queue_size: Fetched pages that may wait for a parser before fetching pauses
+            on_parsed: Called on the calling thread with (url, record) as each page
+                finishes; record is None if parsing failed or found nothing
+        """
+        self.fetch = fetch
+        self.parse = parse
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(0, parse_workers)
+        self.queue_size = max(1, queue_size)
+        self.on_parsed = on_parsed
+
+    def imap(self, urls: Iterable[str]) -> Iterator[R]:
+        """Fetch and parse every URL, yielding records in completion order"""
+        urls = iter(urls)
+        url_lock = threading.Lock()
+        pages: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+
+        fetchers = [
+            threading.Thread(target=self._fetch_worker, args=(urls, url_lock, pages, stop),
+                             name=f'fetch-{i}', daemon=True)
+            for i in range(self.fetch_workers)
+        ]
+
+        # Spawn rather than fork: the fetch threads are already running
+        executor = ProcessPoolExecutor(
+            max_workers=self.parse_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        ) if self.parse_workers else None
+        # Enough parses in flight to keep every worker busy, few enough to bound memory
+        max_pending = max(1, self.parse_workers * 2)
+
+        for fetcher in fetchers:
+            fetcher.start()
+
+        try:
+            pending: Set[Future] = set()
+            running = len(fetchers)
+            while running or pending:
+                if running and len(pending) < max_pending:
+                    try:
+                        item = pages.get(timeout=POLL_INTERVAL)
+                    except queue.Empty:
+                        item = ()
+                    if item is _DONE:
+                        running -= 1
+                    elif item:
+                        pending.add(self._submit(executor, *item))
+                    finished = {future for future in pending if future.done()}
+                else:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                pending -= finished
+                for future in finished:
+                    record = self._result(future)
+                    if self.on_parsed:
+                        self.on_parsed(future.url, record)
+                    if record is not None:
+                        yield record
+        finally:
+            stop.set()
+            if executor:
+                executor.shutdown(cancel_futures=True)
+            for fetcher in fetchers:
+                fetcher.join()
+
+    def _fetch_worker(self, urls: Iterator[str], url_lock: threading.Lock,
+                      pages: queue.Queue, stop: threading.Event):
+        """Download URLs until they run out, handing each body to the parsers"""
+        try:
+            while not stop.is_set():
+                with url_lock:
+                    url = next(urls, None)
+                if url is None:
+                    break
+                try:
+                    content = self.fetch(url)
+                except Exception as e:
+                    logger.error(f"Error fetching {url}: {e}")
+                    continue
+                if content is not None:
+                    self._put(pages, (url, content), stop)
+        finally:
+            self._put(pages, _DONE, stop)
+
+    def _submit(self, executor: Optional[ProcessPoolExecutor], url: str, content: bytes) -> Future:
+        """Start parsing a page, in a worker process or right here"""
+        if executor:
+            future = executor.submit(self.parse, url, content)
+            future.url = url
+            return future
+
+        future = Future()
+        future.url = url
+        try:
+            future.set_result(self.parse(url, content))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    @staticmethod
+    def _result(future: Future) -> Optional[R]:
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Error parsing {future.url}: {e}")
+            return None
+
+    @staticmethod
+    def _put(pages: queue.Queue, item, stop: threading.Event):
+        """Block until the queue has room, giving up once the pipeline is stopped"""
+        while True:
+            try:
+                pages.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                if stop.is_set():
+                    return
@@ -0,0 +1,205 @@
+"""
+Per-Host Rate Limiter
+=====================
+Token-bucket rate limiting shared by every scraper.
+
+Each host gets its own bucket, so different sites can be crawled in parallel
+while each one still sees a polite request rate. Rates can be set per domain,
+and a robots.txt Crawl-delay is honored whenever it is slower than the
+configured rate. Only requests that actually go out on the network should
+call acquire() - cache hits never wait.
+
+Usage:
+    from rate_limiter import get_rate_limiter
+
+    limiter = get_rate_limiter()
+    limiter.set_rate('flagfootballfinder.com', 0.5)  # requests per second
+    limiter.acquire(url)                             # blocks until allowed
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 0.5  # Requests per second per host (one every 2 seconds)
+ROBOTS_USER_AGENT = 'FlagFootballDirectory'
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token and return how long the caller must wait before using it
+
+        Tokens may go negative, which queues concurrent callers one interval
+        apart instead of letting them all wake up at the same moment.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Per-host token buckets with per-domain rates and robots.txt Crawl-delay"""
+
+    def __init__(self, default_rate: float = DEFAULT_RATE, burst: float = 1.0,
+                 respect_robots: bool = True):
+        self.default_rate = default_rate
+        self.burst = burst
+        self.respect_robots = respect_robots
+        self.domain_rates: Dict[str, Tuple[float, float]] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.robots: Dict[str, Optional[RobotFileParser]] = {}
+        self.host_locks: Dict[str, threading.RLock] = {}  # Serialize robots.txt and bucket setup per host
+        self.lock = threading.Lock()
+
+    def set_rate(self, domain: str, rate: float, burst: Optional[float] = None):
+        """
+        Set the request rate for a domain and its subdomains
+
+        Args:
+            domain: Domain such as 'flagfootballfinder.com'
+            rate: Requests per second
+            burst: Requests allowed back to back (defaults to the global burst)
+
+        Raises:
+            ValueError: If rate or burst is not a positive number
+        """
+        if not rate > 0:
+            raise ValueError(f"Rate limit for {domain} must be positive, got {rate}")
+        if burst is not None and not burst > 0:
+            raise ValueError(f"Burst for {domain} must be positive, got {burst}")
+        domain = domain.lower().lstrip('.')
+        with self.lock:
+            self.domain_rates[domain] = (rate, burst or self.burst)
+            # Rebuild buckets for matching hosts on next use
+            for host in [h for h in self.buckets if self._matches(h, domain)]:
+                del self.buckets[host]
+
+    def configure(self, specs: List[str]):
+        """Apply 'domain=rate' strings, e.g. from a --rate-limit CLI flag"""
+        for spec in specs or []:
+            domain, _, rate = spec.partition('=')
+            try:
+                rate = float(rate)
+            except ValueError:
+                rate = None
+            if not domain or rate is None:
+                raise ValueError(f"Invalid rate limit '{spec}', expected domain=requests_per_second")
+            self.set_rate(domain, rate)
+
+    def acquire(self, url: str):
+        """Block until a request to url's host is allowed"""
+        wait = self._bucket(url).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str):
+        """Async version of acquire() that does not block the event loop"""
+        bucket = await asyncio.to_thread(self._bucket, url)
+        wait = bucket.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """Return the robots.txt Crawl-delay for url's host, if any"""
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+
+        with self._host_lock(host):
+            if host not in self.robots:
+                self.robots[host] = self._load_robots(f"{parsed.scheme or 'https'}://{host}/robots.txt")
+            robots = self.robots[host]
+
+        if not robots:
+            return None
+        delay = robots.crawl_delay(ROBOTS_USER_AGENT)
+        return float(delay) if delay else None
+
+    def _bucket(self, url: str) -> TokenBucket:
+        """Get or create the bucket for url's host"""
+        host = urlparse(url).netloc.lower()
+        bucket = self.buckets.get(host)
+        if bucket:
+            return bucket
+
+        # Concurrent first requests to a host wait here for one robots.txt
+        # fetch instead of each fetching it and building its own bucket.
+        # Other hosts are not held up meanwhile.
+        with self._host_lock(host):
+            bucket = self.buckets.get(host)
+            if bucket:
+                return bucket
+
+            delay = self.crawl_delay(url) if self.respect_robots else None
+            with self.lock:
+                rate, burst = self._rate_for(host)
+                if delay and 1 / delay < rate:
+                    logger.info(f"Honoring robots.txt Crawl-delay of {delay}s for {host}")
+                    rate = 1 / delay
+                return self.buckets.setdefault(host, TokenBucket(rate, burst))
+
+    def _host_lock(self, host: str) -> threading.RLock:
+        """Get the lock guarding robots.txt and bucket setup for a host"""
+        with self.lock:
+            return self.host_locks.setdefault(host, threading.RLock())
+
+    def _rate_for(self, host: str) -> Tuple[float, float]:
+        """Find the most specific configured rate for a host"""
+        matches = [domain for domain in self.domain_rates if self._matches(host, domain)]
+        if matches:
+            return self.domain_rates[max(matches, key=len)]
+        return self.default_rate, self.burst
+
+    @staticmethod
+    def _matches(host: str, domain: str) -> bool:
+        host = host.split(':')[0]
+        return host == domain or host.endswith('.' + domain)
+
+    @staticmethod
+    def _load_robots(robots_url: str) -> Optional[RobotFileParser]:
+        """Fetch and parse robots.txt, returning None if it is unavailable"""
+        try:
+            request = urllib.request.Request(robots_url, headers={'User-Agent': ROBOTS_USER_AGENT})
+            with urllib.request.urlopen(request, timeout=10) as response:
+                lines = response.read().decode('utf-8', errors='ignore').splitlines()
+        except Exception as e:
+            logger.debug(f"No robots.txt at {robots_url}: {e}")
+            return None
+
+        parser = RobotFileParser(robots_url)
+        parser.parse(lines)
+        return parser
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter used by all scrapers"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter()
+        return _shared_limiter
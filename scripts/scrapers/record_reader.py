@@ -0,0 +1,124 @@
+"""
+Record Reader
+=============
+Stream scraped records back out of JSON-array, JSONL and gzipped exports.
+
+The format is detected from the content, so `*_leagues.json`,
+`*_leagues.jsonl` and `*_leagues.jsonl.gz` all read the same way, one record
+at a time. A JSON array cut off by a crashed scraper yields every complete
+record with a warning; a malformed record in the middle raises ValueError.
+
+Used by import_to_supabase.py and columnar.py.
+
+Usage:
+    from record_reader import load_records
+
+    for record in load_records('../../scraped_data/raw/fff_20250101_leagues.json'):
+        print(record['name'])
+"""
+
+import gzip
+import itertools
+import json
+import logging
+import re
+from typing import Dict, Iterator
+
+logger = logging.getLogger(__name__)
+
+READ_CHUNK_SIZE = 64 * 1024  # Characters read at a time from JSON-array input
+GZIP_MAGIC = b'\x1f\x8b'
+
+# What is left of a literal, number or \uXXXX escape cut off at the end of the text
+PARTIAL_TOKEN = re.compile(r'(?:t(?:ru?)?|f(?:a(?:ls?)?)?|n(?:ul?)?|-|[.eE][-+]?|u[0-9a-fA-F]{0,4})\s*')
+
+
+def _ran_out(error: json.JSONDecodeError, text: str) -> bool:
+    """Whether a decode error only means the text stops before the element ends"""
+    if error.msg.startswith('Unterminated string'):
+        return True
+    return not text[error.pos:].strip() or PARTIAL_TOKEN.fullmatch(text, error.pos) is not None
+
+
+def iter_json_array(f, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Yield the elements of a JSON array from a text stream positioned just after its '['
+
+    An array cut off at the end of the file (a missing ']' or a partly
+    written last element) yields every complete element with a warning.
+
+    Raises:
+        ValueError: If an element in the middle of the array is malformed
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    consumed = 0  # Characters dropped from the front of buffer
+    eof = False
+
+    while True:
+        # Skip separators between elements
+        while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ','):
+            position += 1
+
+        if position < len(buffer) and buffer[position] == ']':
+            return
+
+        try:
+            if position >= len(buffer):
+                raise json.JSONDecodeError('Need more data', buffer, position)
+            element, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            if not _ran_out(e, buffer):
+                raise ValueError(f"Malformed JSON array element at character {consumed + e.pos}: {e.msg}") from e
+            if eof:
+                # Streamed exports stop mid-array if the scraper crashed; keep what is complete
+                leftover = buffer[position:].strip()
+                if leftover:
+                    logger.warning(f"⚠️  JSON array is truncated; skipped {len(leftover)} characters of an incomplete record")
+                else:
+                    logger.warning("⚠️  JSON array is missing its closing ']'; the export was probably interrupted")
+                return
+            # The element continues past the buffer; read more and retry
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            consumed += position
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+
+        yield element
+
+
+def load_records(filename: str) -> Iterator[Dict]:
+    """
+    Stream records from a JSONL or JSON-array file, optionally gzipped
+
+    The format is detected from the content: a file starting with '['
+    is read as a JSON array one element at a time, anything else as one
+    JSON object per line. Only one record is held in memory at a time.
+    """
+    with open(filename, 'rb') as raw:
+        compressed = raw.read(2) == GZIP_MAGIC
+
+    opener = gzip.open if compressed else open
+    with opener(filename, 'rt', encoding='utf-8') as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+
+        if first == '[':
+            try:
+                yield from iter_json_array(f)
+            except ValueError as e:
+                raise ValueError(f"{filename}: {e}") from e
+            return
+
+        for line_number, line in enumerate(itertools.chain([first + f.readline()], f), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                logger.error(f"Skipping invalid JSON on line {line_number} of {filename}: {e}")
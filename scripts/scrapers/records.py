@@ -0,0 +1,120 @@
+"""
+Scraped Record Types
+====================
+Compact record classes shared by every scraper.
+
+LeagueData, EventData and TeamData are slotted dataclasses: no per-instance
+__dict__, so a record costs a fixed set of slots instead of a hash table,
+which matters when 100k+ records are held for dedup and export. Enum-like
+string fields (state, source, contact_type, kind, ...) are interned, so every
+'CA' or 'flagfootballfinder.com' in memory is the same object.
+
+dataclass(slots=True) needs Python 3.10 or newer.
+
+Usage:
+    from records import LeagueData, TeamData
+
+    league = LeagueData(name='Elon Park', website=url, city='Charlotte', state='NC')
+    team = TeamData.from_dict(scraped)
+    row = league.to_dict()
+"""
+
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional
+
+
+def intern_value(value: Any) -> Any:
+    """Intern strings, pass anything else through"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Record:
+    """Shared behaviour for the slotted record dataclasses"""
+
+    __slots__ = ()
+
+    # Low-cardinality fields interned on construction
+    INTERNED: tuple = ()
+
+    def __post_init__(self):
+        for name in self.INTERNED:
+            setattr(self, name, intern_value(getattr(self, name)))
+
+    def to_dict(self) -> Dict:
+        """Field name -> value, in field order (lists are shared, not copied)"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict):
+        """Build a record from a dict, ignoring keys that are not fields"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+
+@dataclass(slots=True)
+class LeagueData(Record):
+    """Data structure for scraped league information"""
+    name: str
+    website: str
+    city: Optional[str]
+    state: Optional[str]
+    fees: Optional[float] = None
+    season_start: Optional[str] = None
+    season_end: Optional[str] = None
+    divisions: List[str] = field(default_factory=list)
+    nights: List[str] = field(default_factory=list)
+    formats: List[str] = field(default_factory=list)
+    contact_type: Optional[str] = None
+    comp_levels: List[str] = field(default_factory=list)
+    signup_url: Optional[str] = None
+    contact_email: Optional[str] = None
+    contact_phone: Optional[str] = None
+    about: Optional[str] = None
+    source: str = 'scraped'
+    organization: Optional[str] = None
+    league_type: Optional[str] = None
+
+    INTERNED = ('state', 'source', 'contact_type', 'organization', 'league_type')
+
+
+@dataclass(slots=True)
+class EventData(Record):
+    """Data structure for scraped event information"""
+    name: str
+    kind: str  # 'clinic' or 'tournament'
+    state: str
+    location: str
+    start_date: str
+    website: str
+    end_date: Optional[str] = None
+    fee: Optional[float] = None
+    divisions: List[str] = field(default_factory=list)
+    formats: List[str] = field(default_factory=list)
+    contact_type: Optional[str] = None
+    comp_levels: List[str] = field(default_factory=list)
+    signup_url: Optional[str] = None
+    contact_email: Optional[str] = None
+    about: Optional[str] = None
+    source: str = 'scraped'
+
+    INTERNED = ('kind', 'state', 'source', 'contact_type')
+
+
+@dataclass(slots=True)
+class TeamData(Record):
+    """Data structure for scraped team information"""
+    name: str
+    city: Optional[str] = None
+    state: Optional[str] = None
+    gender: Optional[str] = None
+    age_groups: List[str] = field(default_factory=list)
+    formats: List[str] = field(default_factory=list)
+    comp_levels: List[str] = field(default_factory=list)
+    contact_type: Optional[str] = None
+    website: Optional[str] = None
+    contact_email: Optional[str] = None
+    about: Optional[str] = None
+    source: str = 'scraped'
+
+    INTERNED = ('state', 'source', 'contact_type', 'gender')
@@ -5,27 +5,36 @@ This script scrapes flag football programs from various sources and
 prepares them for import into your database.
 
 Dependencies:
-    pip install requests beautifulsoup4 selenium webdriver-manager pandas python-dotenv
+    pip install requests aiohttp beautifulsoup4 lxml selectolax selenium webdriver-manager pandas python-dotenv
 
 Usage:
     python scraper.py --source nflflag
     python scraper.py --source all
     python scraper.py --state CA --city "Los Angeles"
+    python scraper.py --source nflflag --concurrency 16
+    python scraper.py --source nflflag --concurrency 16 --parse-workers 4
+    python scraper.py --source generic --url URL --parser selectolax
+    python scraper.py --source generic --url URL --no-selector-cache
 """
 
 import requests
-from bs4 import BeautifulSoup
-import json
-import csv
 import re
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import partial
+from typing import Any, List, Dict, Iterable, Optional, Tuple
 import time
 import logging
-from dataclasses import dataclass, asdict
-from urllib.parse import urljoin, urlparse
-import os
+import asyncio
+import aiohttp
+from urllib.parse import urljoin
 from dotenv import load_dotenv
+from rate_limiter import get_rate_limiter
+from exporters import FORMATS, StreamingExporter, outputs_for
+from records import EventData, LeagueData
+from html_parser import DEFAULT_PARSER, PARSER_CHOICES, HTMLNode, parse_html
+from field_extractor import extract_fields
+from selector_cache import DEFAULT_SELECTOR_CACHE, SelectorCache
+from pipeline import DEFAULT_PARSE_WORKERS, FetchParsePipeline
 
 # Load environment variables
 load_dotenv()
@@ -42,86 +51,27 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@dataclass
-class LeagueData:
-    """Data structure for scraped league information"""
-    name: str
-    website: str
-    city: str
-    state: str
-    fees: Optional[float] = None
-    season_start: Optional[str] = None
-    season_end: Optional[str] = None
-    divisions: List[str] = None
-    nights: List[str] = None
-    formats: List[str] = None
-    contact_type: Optional[str] = None
-    comp_levels: List[str] = None
-    signup_url: Optional[str] = None
-    contact_email: Optional[str] = None
-    contact_phone: Optional[str] = None
-    about: Optional[str] = None
-    source: str = 'scraped'
-    
-    def __post_init__(self):
-        if self.divisions is None:
-            self.divisions = []
-        if self.nights is None:
-            self.nights = []
-        if self.formats is None:
-            self.formats = []
-        if self.comp_levels is None:
-            self.comp_levels = []
-
-
-@dataclass
-class EventData:
-    """Data structure for scraped event information"""
-    name: str
-    kind: str  # 'clinic' or 'tournament'
-    state: str
-    location: str
-    start_date: str
-    website: str
-    end_date: Optional[str] = None
-    fee: Optional[float] = None
-    divisions: List[str] = None
-    formats: List[str] = None
-    contact_type: Optional[str] = None
-    comp_levels: List[str] = None
-    signup_url: Optional[str] = None
-    contact_email: Optional[str] = None
-    about: Optional[str] = None
-    source: str = 'scraped'
-    
-    def __post_init__(self):
-        if self.divisions is None:
-            self.divisions = []
-        if self.formats is None:
-            self.formats = []
-        if self.comp_levels is None:
-            self.comp_levels = []
-
-
 class BaseScraper:
     """Base class for all scrapers"""
     
-    def __init__(self):
+    def __init__(self, parser: str = DEFAULT_PARSER, selector_cache: Optional[SelectorCache] = None):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
-        self.delay = 2  # Seconds between requests (be respectful!)
+        self.rate_limiter = get_rate_limiter()  # Shared per-host limits (be respectful!)
+        self.parser = parser  # html_parser backend
+        self.selector_cache = selector_cache  # Listing selectors learned per domain
     
-    def get_page(self, url: str, retries: int = 3) -> Optional[BeautifulSoup]:
-        """Fetch and parse a web page"""
+    def fetch(self, url: str, retries: int = 3) -> Optional[bytes]:
+        """Fetch a web page body"""
         for attempt in range(retries):
             try:
+                self.rate_limiter.acquire(url)
                 logger.info(f"Fetching: {url}")
                 response = self.session.get(url, timeout=10)
                 response.raise_for_status()
-                time.sleep(self.delay)
-                return BeautifulSoup(response.content, 'html.parser')
+                return response.content
             except requests.RequestException as e:
                 logger.error(f"Error fetching {url}: {e}")
                 if attempt < retries - 1:
@@ -129,25 +79,26 @@ class BaseScraper:
                     continue
                 return None
     
-    def extract_email(self, text: str) -> Optional[str]:
-        """Extract email from text"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(email_pattern, text)
-        return match.group(0) if match else None
-    
-    def extract_phone(self, text: str) -> Optional[str]:
-        """Extract phone number from text"""
-        phone_pattern = r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        match = re.search(phone_pattern, text)
-        return match.group(0) if match else None
+    def get_page(self, url: str, retries: int = 3) -> Optional[HTMLNode]:
+        """Fetch and parse a web page"""
+        content = self.fetch(url, retries)
+        return parse_html(content, self.parser) if content is not None else None
     
-    def extract_price(self, text: str) -> Optional[float]:
-        """Extract price from text"""
-        price_pattern = r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)'
-        match = re.search(price_pattern, text)
-        if match:
-            return float(match.group(1).replace(',', ''))
-        return None
+    def select_listings(self, page: HTMLNode, url: str, kind: str,
+                        selectors: List[str]) -> Tuple[Optional[str], List[HTMLNode]]:
+        """
+        Find the listing elements on a directory page
+        
+        Uses the selector learned for the page's domain when there is one, so
+        repeat scrapes run a single query; otherwise tries selectors in order.
+        """
+        if self.selector_cache:
+            return self.selector_cache.select(page, url, kind, selectors)
+        for selector in selectors:
+            elements = page.select(selector)
+            if elements:
+                return selector, elements
+        return None, []
     
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
@@ -156,12 +107,117 @@ class BaseScraper:
         return ' '.join(text.strip().split())
 
 
-class NFLFlagScraper(BaseScraper):
-    """Scraper for NFL FLAG leagues"""
+class AsyncBaseScraper(BaseScraper):
+    """
+    Base class for scrapers that fetch many pages concurrently
+
+    fetch_many() downloads a batch of URLs with a bounded number of requests
+    in flight. Politeness comes from the shared per-host rate limiter, so
+    different hosts are fetched in parallel. The parsed pages are held until
+    get_page() asks for them, so subclasses keep their parsing code unchanged.
+    """
+
+    def __init__(self, max_concurrency: int = 8, parser: str = DEFAULT_PARSER,
+                 selector_cache: Optional[SelectorCache] = None):
+        super().__init__(parser=parser, selector_cache=selector_cache)
+        self.max_concurrency = max_concurrency
+        self._pages: Dict[str, Optional[HTMLNode]] = {}
+
+    def get_page(self, url: str, retries: int = 3) -> Optional[HTMLNode]:
+        """Return a prefetched page, or fetch it synchronously"""
+        if url in self._pages:
+            return self._pages.pop(url)
+        return super().get_page(url, retries)
+
+    def fetch_many(self, urls: Iterable[str], retries: int = 3) -> Dict[str, Optional[HTMLNode]]:
+        """
+        Fetch many pages concurrently and keep them for get_page()
+
+        Args:
+            urls: URLs to fetch (duplicates are fetched once)
+            retries: Attempts per URL before giving up
+
+        Returns:
+            Dictionary of URL -> parsed page (None if the fetch failed)
+        """
+        urls = list(dict.fromkeys(urls))
+        pending = [url for url in urls if url not in self._pages]
+        if pending:
+            self._pages.update(asyncio.run(self.afetch_many(pending, retries)))
+        return {url: self._pages.get(url) for url in urls}
+
+    async def afetch_many(self, urls: List[str], retries: int = 3) -> Dict[str, Optional[HTMLNode]]:
+        """Coroutine behind fetch_many() for callers already inside an event loop"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(session: aiohttp.ClientSession, url: str) -> Optional[HTMLNode]:
+            for attempt in range(retries):
+                await self.rate_limiter.acquire_async(url)
+                async with semaphore:
+                    try:
+                        logger.info(f"Fetching: {url}")
+                        async with session.get(url) as response:
+                            response.raise_for_status()
+                            content = await response.read()
+                        return parse_html(content, self.parser)
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        logger.error(f"Error fetching {url}: {e}")
+                if attempt < retries - 1:
+                    await asyncio.sleep(5)
+            return None
+
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(
+            headers=dict(self.session.headers), connector=connector, timeout=timeout
+        ) as session:
+            pages = await asyncio.gather(*(fetch(session, url) for url in urls))
+
+        return dict(zip(urls, pages))
+
+
+def parse_league_details(url: str, content: bytes, parser: str = DEFAULT_PARSER) -> Tuple[str, Dict[str, Any]]:
+    """
+    Read the extra league fields on an NFL FLAG league page
+
+    Runs in pipeline worker processes, so it returns the page URL with the
+    fields found instead of updating the league itself.
+    """
+    page = parse_html(content, parser)
+    details = {}
+    
+    # Example: Extract fees
+    fee_text = page.select_one('span.price')
+    if fee_text:
+        details['fees'] = extract_fields(fee_text.text).price
+    
+    # Example: Extract divisions/age groups
+    divisions_section = page.select_one('div.divisions')
+    if divisions_section:
+        details['divisions'] = [
+            ' '.join(div.text.split())
+            for div in divisions_section.select('span')
+        ]
+    
+    # Extract contact info
+    contact_section = page.select_one('div.contact')
+    if contact_section:
+        contact = extract_fields(contact_section.text)
+        details['contact_email'] = contact.email
+        details['contact_phone'] = contact.phone
     
-    def __init__(self):
-        super().__init__()
+    return url, details
+
+
+
+class NFLFlagScraper(AsyncBaseScraper):
+    """Scraper for NFL FLAG leagues"""
+
+    def __init__(self, max_concurrency: int = 8, parser: str = DEFAULT_PARSER,
+                 parse_workers: int = DEFAULT_PARSE_WORKERS):
+        super().__init__(max_concurrency=max_concurrency, parser=parser)
         self.base_url = "https://nflflag.com"
+        self.parse_workers = parse_workers  # Processes parsing league detail pages
     
     def scrape_leagues(self, state: Optional[str] = None) -> List[LeagueData]:
         """
@@ -174,68 +230,61 @@ class NFLFlagScraper(BaseScraper):
         
         # Example: Scrape from a league directory page
         directory_url = f"{self.base_url}/find-a-league"
-        soup = self.get_page(directory_url)
+        page = self.get_page(directory_url)
         
-        if not soup:
+        if not page:
             return leagues
         
         # Example selector - adjust based on actual site
-        league_elements = soup.find_all('div', class_='league-card')
-        
+        league_elements = page.select('div.league-card')
+        pending_details: Dict[str, List[LeagueData]] = {}
+
         for element in league_elements:
             try:
                 league = LeagueData(
-                    name=self.clean_text(element.find('h3').text),
+                    name=self.clean_text(element.select_one('h3').text),
                     website=self.base_url,
-                    city=self.clean_text(element.find('span', class_='city').text),
-                    state=self.clean_text(element.find('span', class_='state').text),
+                    city=self.clean_text(element.select_one('span.city').text),
+                    state=self.clean_text(element.select_one('span.state').text),
                     source='nflflag'
                 )
                 
                 # Extract additional details if available
-                details_link = element.find('a', href=True)
+                details_link = element.select_one('a[href]')
                 if details_link:
                     detail_url = urljoin(self.base_url, details_link['href'])
-                    self._scrape_league_details(detail_url, league)
-                
+                    pending_details.setdefault(detail_url, []).append(league)
+
                 leagues.append(league)
                 logger.info(f"Scraped: {league.name}")
-                
+
             except Exception as e:
                 logger.error(f"Error parsing league element: {e}")
                 continue
-        
+
+        # Download detail pages on threads while worker processes parse them
+        pipeline = FetchParsePipeline(self.fetch, partial(parse_league_details, parser=self.parser),
+                                      fetch_workers=self.max_concurrency, parse_workers=self.parse_workers)
+        for detail_url, details in pipeline.imap(pending_details):
+            for league in pending_details[detail_url]:
+                for field, value in details.items():
+                    setattr(league, field, value)
+
         return leagues
-    
-    def _scrape_league_details(self, url: str, league: LeagueData):
-        """Scrape detailed information from a league page"""
-        soup = self.get_page(url)
-        if not soup:
-            return
-        
-        # Example: Extract fees
-        fee_text = soup.find('span', class_='price')
-        if fee_text:
-            league.fees = self.extract_price(fee_text.text)
-        
-        # Example: Extract divisions/age groups
-        divisions_section = soup.find('div', class_='divisions')
-        if divisions_section:
-            league.divisions = [
-                self.clean_text(div.text) 
-                for div in divisions_section.find_all('span')
-            ]
-        
-        # Extract contact info
-        contact_section = soup.find('div', class_='contact')
-        if contact_section:
-            league.contact_email = self.extract_email(contact_section.text)
-            league.contact_phone = self.extract_phone(contact_section.text)
-
-
-class GenericLeagueScraper(BaseScraper):
+
+
+class GenericLeagueScraper(AsyncBaseScraper):
     """Generic scraper for common league directory patterns"""
     
+    # Common patterns for league listings, most specific first
+    LISTING_SELECTORS = [
+        'div.league-item',
+        'div.program-card',
+        'article.league',
+        'div[class*="league"]',
+        'div[class*="program"]'
+    ]
+    
     def scrape_from_directory(self, url: str) -> List[LeagueData]:
         """
         Scrape leagues from a directory-style page
@@ -243,34 +292,23 @@ class GenericLeagueScraper(BaseScraper):
         This uses common patterns found on many league directory sites.
         """
         leagues = []
-        soup = self.get_page(url)
+        page = self.get_page(url)
         
-        if not soup:
+        if not page:
             return leagues
         
-        # Common patterns for league listings
-        selectors = [
-            'div.league-item',
-            'div.program-card',
-            'article.league',
-            'div[class*="league"]',
-            'div[class*="program"]'
-        ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                logger.info(f"Found {len(elements)} items with selector: {selector}")
-                
-                for element in elements:
-                    try:
-                        league = self._parse_league_element(element, url)
-                        if league:
-                            leagues.append(league)
-                    except Exception as e:
-                        logger.error(f"Error parsing element: {e}")
-                        continue
-                break
+        selector, elements = self.select_listings(page, url, 'leagues', self.LISTING_SELECTORS)
+        if elements:
+            logger.info(f"Found {len(elements)} items with selector: {selector}")
+            
+            for element in elements:
+                try:
+                    league = self._parse_league_element(element, url)
+                    if league:
+                        leagues.append(league)
+                except Exception as e:
+                    logger.error(f"Error parsing element: {e}")
+                    continue
         
         return leagues
     
@@ -280,7 +318,7 @@ class GenericLeagueScraper(BaseScraper):
         # Try to find name
         name = None
         for tag in ['h2', 'h3', 'h4', 'strong', 'a']:
-            name_elem = element.find(tag)
+            name_elem = element.select_one(tag)
             if name_elem and name_elem.text.strip():
                 name = self.clean_text(name_elem.text)
                 break
@@ -288,15 +326,15 @@ class GenericLeagueScraper(BaseScraper):
         if not name:
             return None
         
-        # Try to find location
-        location_text = element.get_text()
-        city, state = self._extract_location(location_text)
+        # Every regex-derived field in one pass over the text
+        fields = extract_fields(element.text)
+        city, state = fields.city, fields.state
         
         if not city or not state:
             return None
         
         # Find website/link
-        link = element.find('a', href=True)
+        link = element.select_one('a[href]')
         website = urljoin(base_url, link['href']) if link else base_url
         
         league = LeagueData(
@@ -307,70 +345,46 @@ class GenericLeagueScraper(BaseScraper):
             source='generic_scraper'
         )
         
-        # Extract additional info from text
-        text = element.get_text()
-        league.fees = self.extract_price(text)
-        league.contact_email = self.extract_email(text)
-        league.contact_phone = self.extract_phone(text)
-        
-        # Try to extract age groups
-        age_pattern = r'\b(\d+U|ADULT)\b'
-        league.divisions = list(set(re.findall(age_pattern, text, re.IGNORECASE)))
+        league.fees = fields.price
+        league.contact_email = fields.email
+        league.contact_phone = fields.phone
+        league.divisions = fields.age_groups + (['ADULT'] if fields.adult else [])
         
         return league
-    
-    def _extract_location(self, text: str) -> tuple:
-        """Extract city and state from text"""
-        # Common state abbreviations
-        states = ['AL','AK','AZ','AR','CA','CO','CT','DE','FL','GA','HI','ID','IL','IN','IA',
-                 'KS','KY','LA','ME','MD','MA','MI','MN','MS','MO','MT','NE','NV','NH','NJ',
-                 'NM','NY','NC','ND','OH','OK','OR','PA','RI','SC','SD','TN','TX','UT','VT',
-                 'VA','WA','WV','WI','WY','DC']
-        
-        # Pattern: City, ST
-        pattern = r'([A-Za-z\s]+),\s*(' + '|'.join(states) + r')\b'
-        match = re.search(pattern, text)
-        
-        if match:
-            return match.group(1).strip(), match.group(2).strip()
-        
-        return None, None
 
 
-class TournamentScraper(BaseScraper):
+class TournamentScraper(AsyncBaseScraper):
     """Scraper for tournament and clinic events"""
     
+    # Common patterns for event listings, most specific first
+    LISTING_SELECTORS = [
+        'div.tournament-item',
+        'div.event-card',
+        'article.event',
+        'div[class*="tournament"]',
+        'div[class*="event"]'
+    ]
+    
     def scrape_tournaments_from_directory(self, url: str) -> List[EventData]:
         """Scrape tournaments from a directory page"""
         events = []
-        soup = self.get_page(url)
+        page = self.get_page(url)
         
-        if not soup:
+        if not page:
             return events
         
-        # Common patterns for event listings
-        selectors = [
-            'div.tournament-item',
-            'div.event-card',
-            'article.event',
-            'div[class*="tournament"]',
-            'div[class*="event"]'
-        ]
-        
-        for selector in selectors:
-            elements = soup.select(selector)
-            if elements:
-                logger.info(f"Found {len(elements)} events with selector: {selector}")
-                
-                for element in elements:
-                    try:
-                        event = self._parse_event_element(element, url)
-                        if event:
-                            events.append(event)
-                    except Exception as e:
-                        logger.error(f"Error parsing event: {e}")
-                        continue
-                break
+        selector, elements = self.select_listings(page, url, 'events', self.LISTING_SELECTORS)
+        if elements:
+            logger.info(f"Found {len(elements)} events with selector: {selector}")
+            
+            for element in elements:
+                try:
+                    event = self._parse_event_element(element, url)
+                    if event:
+                        events.append(event)
+                except Exception as e:
+                    logger.error(f"Error parsing event: {e}")
+                    continue
         
         return events
     
@@ -380,7 +394,7 @@ class TournamentScraper(BaseScraper):
         # Find name
         name = None
         for tag in ['h2', 'h3', 'h4', 'strong']:
-            name_elem = element.find(tag)
+            name_elem = element.select_one(tag)
             if name_elem and name_elem.text.strip():
                 name = self.clean_text(name_elem.text)
                 break
@@ -393,12 +407,13 @@ class TournamentScraper(BaseScraper):
         if any(word in name.lower() for word in ['clinic', 'camp', 'training', 'skills']):
             kind = 'clinic'
         
-        text = element.get_text()
+        text = element.text
         
-        # Extract location
-        location, state = self._extract_location(text)
-        if not location or not state:
+        # Every regex-derived field in one pass over the text
+        fields = extract_fields(text)
+        if not fields.city or not fields.state:
             return None
+        location, state = f"{fields.city}, {fields.state}", fields.state
         
         # Extract dates
         start_date, end_date = self._extract_dates(text)
@@ -406,7 +421,7 @@ class TournamentScraper(BaseScraper):
             return None
         
         # Find website
-        link = element.find('a', href=True)
+        link = element.select_one('a[href]')
         website = urljoin(base_url, link['href']) if link else base_url
         
         event = EventData(
@@ -420,33 +435,12 @@ class TournamentScraper(BaseScraper):
             source='generic_scraper'
         )
         
-        # Extract fee
-        event.fee = self.extract_price(text)
-        
-        # Extract contact info
-        event.contact_email = self.extract_email(text)
-        
-        # Extract age groups
-        age_pattern = r'\b(\d+U|ADULT)\b'
-        event.divisions = list(set(re.findall(age_pattern, text, re.IGNORECASE)))
+        event.fee = fields.price
+        event.contact_email = fields.email
+        event.divisions = fields.age_groups + (['ADULT'] if fields.adult else [])
         
         return event
     
-    def _extract_location(self, text: str) -> tuple:
-        """Extract location and state from text"""
-        states = ['AL','AK','AZ','AR','CA','CO','CT','DE','FL','GA','HI','ID','IL','IN','IA',
-                 'KS','KY','LA','ME','MD','MA','MI','MN','MS','MO','MT','NE','NV','NH','NJ',
-                 'NM','NY','NC','ND','OH','OK','OR','PA','RI','SC','SD','TN','TX','UT','VT',
-                 'VA','WA','WV','WI','WY','DC']
-        
-        pattern = r'([A-Za-z\s]+),\s*(' + '|'.join(states) + r')\b'
-        match = re.search(pattern, text)
-        
-        if match:
-            return match.group(1).strip() + ', ' + match.group(2).strip(), match.group(2).strip()
-        
-        return None, None
-    
     def _extract_dates(self, text: str) -> tuple:
         """Extract start and end dates from text"""
         # Common date patterns
@@ -493,54 +487,27 @@ class TournamentScraper(BaseScraper):
 class DataExporter:
     """Export scraped data to various formats"""
     
+    @staticmethod
+    def open(stem: str, formats: Iterable[str] = ('csv', 'json'), label: str = 'records') -> StreamingExporter:
+        """Open '<stem>.<format>' files that records are streamed into as they are scraped"""
+        return StreamingExporter(outputs_for(stem, formats), label=label)
+    
     @staticmethod
     def to_csv(data: List, filename: str):
         """Export data to CSV"""
-        if not data:
-            logger.warning("No data to export")
-            return
-        
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            dict_data = [asdict(item) for item in data]
-            writer = csv.DictWriter(f, fieldnames=dict_data[0].keys())
-            writer.writeheader()
-            writer.writerows(dict_data)
-        
-        logger.info(f"Exported {len(data)} records to {filename}")
+        with StreamingExporter({filename: 'csv'}) as exporter:
+            exporter.write_many(data)
     
     @staticmethod
     def to_json(data: List, filename: str):
         """Export data to JSON"""
-        if not data:
-            logger.warning("No data to export")
-            return
-        
-        dict_data = [asdict(item) for item in data]
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(dict_data, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Exported {len(data)} records to {filename}")
+        with StreamingExporter({filename: 'json'}) as exporter:
+            exporter.write_many(data)
     
     @staticmethod
     def to_supabase_json(data: List, filename: str):
-        """Export data in format ready for Supabase import"""
-        if not data:
-            logger.warning("No data to export")
-            return
-        
-        # Convert to format matching your database schema
-        formatted_data = []
-        for item in data:
-            item_dict = asdict(item)
-            # Remove 'source' field if you don't have it in DB
-            # item_dict.pop('source', None)
-            formatted_data.append(item_dict)
-        
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(formatted_data, f, indent=2, ensure_ascii=False)
-        
-        logger.info(f"Exported {len(data)} records to {filename} (Supabase format)")
+        """Export data in format ready for Supabase import (same records as to_json)"""
+        DataExporter.to_json(data, filename)
 
 
 # Example usage and main function
@@ -551,53 +518,65 @@ def main():
     parser = argparse.ArgumentParser(description='Scrape flag football programs')
     parser.add_argument('--source', choices=['nflflag', 'generic', 'tournament', 'all'], 
                        default='all', help='Source to scrape')
-    parser.add_argument('--url', help='URL to scrape (for generic scraper)')
+    parser.add_argument('--url', nargs='+', help='URL(s) to scrape (for generic scraper)')
     parser.add_argument('--state', help='Filter by state')
     parser.add_argument('--output', default='scraped_data', help='Output filename prefix')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum requests in flight')
+    parser.add_argument('--parse-workers', type=int, default=DEFAULT_PARSE_WORKERS,
+                       help='Processes parsing NFL FLAG league detail pages (0 = parse on the main thread)')
+    parser.add_argument('--rate-limit', action='append', metavar='DOMAIN=RPS',
+                       help='Requests per second for a domain (repeatable)')
+    parser.add_argument('--format', nargs='+', choices=FORMATS, default=['csv', 'json'],
+                       help='Output formats, written as each source is scraped')
+    parser.add_argument('--parser', choices=PARSER_CHOICES, default=DEFAULT_PARSER,
+                       help='HTML parser backend (auto = fastest installed)')
+    parser.add_argument('--selector-cache', default=str(DEFAULT_SELECTOR_CACHE),
+                       help='Listing selectors learned per domain by the generic/tournament scrapers')
+    parser.add_argument('--no-selector-cache', action='store_true',
+                       help='Detect listing selectors on every page without remembering them')
     
     args = parser.parse_args()
-    
-    all_leagues = []
-    all_events = []
-    
-    # Scrape NFL FLAG leagues
-    if args.source in ['nflflag', 'all']:
-        logger.info("Scraping NFL FLAG leagues...")
-        scraper = NFLFlagScraper()
-        leagues = scraper.scrape_leagues(state=args.state)
-        all_leagues.extend(leagues)
-    
-    # Scrape from generic URL
-    if args.source == 'generic' and args.url:
-        logger.info(f"Scraping from: {args.url}")
-        scraper = GenericLeagueScraper()
-        leagues = scraper.scrape_from_directory(args.url)
-        all_leagues.extend(leagues)
-    
-    # Scrape tournaments
-    if args.source in ['tournament', 'all'] and args.url:
-        logger.info("Scraping tournaments/clinics...")
-        scraper = TournamentScraper()
-        events = scraper.scrape_tournaments_from_directory(args.url)
-        all_events.extend(events)
-    
-    # Export results
-    exporter = DataExporter()
-    
-    if all_leagues:
-        exporter.to_csv(all_leagues, f'{args.output}_leagues.csv')
-        exporter.to_json(all_leagues, f'{args.output}_leagues.json')
-        exporter.to_supabase_json(all_leagues, f'{args.output}_leagues_supabase.json')
-    
-    if all_events:
-        exporter.to_csv(all_events, f'{args.output}_events.csv')
-        exporter.to_json(all_events, f'{args.output}_events.json')
-        exporter.to_supabase_json(all_events, f'{args.output}_events_supabase.json')
+    try:
+        get_rate_limiter().configure(args.rate_limit)
+    except ValueError as e:
+        parser.error(str(e))
+    selector_cache = None if args.no_selector_cache else SelectorCache(args.selector_cache)
+    
+    # Records are written out as each source finishes, converted once for every format
+    leagues_out = DataExporter.open(f'{args.output}_leagues', args.format, label='leagues')
+    events_out = DataExporter.open(f'{args.output}_events', args.format, label='events')
+    
+    with leagues_out, events_out:
+        # Scrape NFL FLAG leagues
+        if args.source in ['nflflag', 'all']:
+            logger.info("Scraping NFL FLAG leagues...")
+            scraper = NFLFlagScraper(max_concurrency=args.concurrency, parser=args.parser,
+                                     parse_workers=args.parse_workers)
+            leagues_out.write_many(scraper.scrape_leagues(state=args.state))
+        
+        # Scrape from generic URL
+        if args.source == 'generic' and args.url:
+            scraper = GenericLeagueScraper(max_concurrency=args.concurrency, parser=args.parser,
+                                           selector_cache=selector_cache)
+            # Listing pages are parsed here rather than in worker processes so
+            # the selector cache can learn from them
+            scraper.fetch_many(args.url)
+            for url in args.url:
+                logger.info(f"Scraping from: {url}")
+                leagues_out.write_many(scraper.scrape_from_directory(url))
+        
+        # Scrape tournaments
+        if args.source in ['tournament', 'all'] and args.url:
+            logger.info("Scraping tournaments/clinics...")
+            scraper = TournamentScraper(max_concurrency=args.concurrency, parser=args.parser,
+                                        selector_cache=selector_cache)
+            scraper.fetch_many(args.url)
+            for url in args.url:
+                events_out.write_many(scraper.scrape_tournaments_from_directory(url))
     
     logger.info("Scraping complete!")
-    logger.info(f"Total leagues: {len(all_leagues)}")
-    logger.info(f"Total events: {len(all_events)}")
-
+    logger.info(f"Total leagues: {leagues_out.count}")
+    logger.info(f"Total events: {events_out.count}")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Selector Cache
+==============
+Remember, per domain, which CSS selector finds the listings on a directory page.
+
+The generic directory scrapers try a list of candidate selectors until one
+matches, and the wildcard ones (div[class*="league"]) scan the whole tree.
+Once a selector has worked on a domain it is stored in a small JSON profile,
+and later pages from that domain - in this run or the next - are queried with
+that one selector only. Detection re-runs just when the stored selector stops
+matching (the site changed its markup), and the profile is updated.
+
+Profile layout (../../scraped_data/cache/selectors.json):
+    {"example.com": {"leagues": "div.program-card", "events": "article.event"}}
+
+Usage:
+    from selector_cache import SelectorCache
+
+    cache = SelectorCache()
+    selector, elements = cache.select(page, url, 'leagues', ['div.league-item', 'div[class*="league"]'])
+
+    python selector_cache.py            # show learned selectors
+    python selector_cache.py --forget example.com
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from atomic_write import write_atomic
+from html_parser import HTMLNode
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SELECTOR_CACHE = Path('../../scraped_data/cache/selectors.json')
+
+
+def domain_of(url: str) -> str:
+    """Host a profile is kept under (www. is dropped)"""
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+class SelectorCache:
+    """Per-domain profile of the listing selector that last worked"""
+
+    def __init__(self, path: Optional[Path] = DEFAULT_SELECTOR_CACHE):
+        """
+        Args:
+            path: JSON file the profiles persist to (None = keep them in memory only)
+        """
+        self.path = Path(path) if path else None
+        self.profiles: Dict[str, Dict[str, str]] = self._load()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.detections = 0
+
+    def select(self, page: HTMLNode, url: str, kind: str,
+               candidates: Sequence[str]) -> Tuple[Optional[str], List[HTMLNode]]:
+        """
+        Find the listing elements on a page
+
+        Args:
+            page: Parsed directory page
+            url: Page URL (its domain picks the profile)
+            kind: What is being listed, e.g. 'leagues' or 'events'
+            candidates: Selectors to try in order when the domain has none stored
+
+        Returns:
+            The selector that matched (None if none did) and its elements
+        """
+        domain = domain_of(url)
+        with self.lock:
+            stored = self.profiles.get(domain, {}).get(kind)
+
+        if stored:
+            elements = page.select(stored)
+            if elements:
+                with self.lock:
+                    self.hits += 1
+                return stored, elements
+            logger.info(f"🔄 Stored {kind} selector '{stored}' no longer matches on {domain}, re-detecting")
+
+        with self.lock:
+            self.detections += 1
+        for selector in candidates:
+            if selector == stored:
+                continue
+            elements = page.select(selector)
+            if elements:
+                self.remember(domain, kind, selector)
+                return selector, elements
+
+        if stored:
+            self.forget(domain, kind)
+        return None, []
+
+    def remember(self, domain: str, kind: str, selector: str):
+        """Store the selector for a domain and persist the profiles"""
+        with self.lock:
+            if self.profiles.get(domain, {}).get(kind) == selector:
+                return
+            self.profiles.setdefault(domain, {})[kind] = selector
+            self._save()
+        logger.info(f"📌 Learned {kind} selector for {domain}: {selector}")
+
+    def forget(self, domain: str, kind: Optional[str] = None):
+        """Drop a domain's stored selector for kind (or all of them)"""
+        with self.lock:
+            profile = self.profiles.get(domain)
+            if not profile:
+                return
+            if kind:
+                profile.pop(kind, None)
+            if not kind or not profile:
+                del self.profiles[domain]
+            self._save()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable selector cache {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        """Write via a temp file so a crash never leaves a truncated profile"""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(self.profiles, indent=2, sort_keys=True).encode('utf-8'))
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show or reset learned listing selectors')
+    parser.add_argument('--cache', default=str(DEFAULT_SELECTOR_CACHE), help='Selector cache file')
+    parser.add_argument('--forget', nargs='+', metavar='DOMAIN', help='Domains to re-detect next time')
+    args = parser.parse_args()
+
+    cache = SelectorCache(Path(args.cache))
+    for domain in args.forget or []:
+        cache.forget(domain_of(f'//{domain}'))
+        print(f"Forgot {domain}")
+
+    for domain, profile in sorted(cache.profiles.items()):
+        for kind, selector in sorted(profile.items()):
+            print(f"{domain:40} {kind:10} {selector}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Selenium Helpers
+================
+Event-driven readiness waits and bulk link extraction shared by the
+Selenium scrapers.
+
+Instead of sleeping for a worst-case guess after every navigation, these
+helpers poll the page with WebDriverWait and return as soon as it is ready:
+the document has loaded, the DOM has stopped mutating, and no network
+resource has finished recently. Every wait has a configurable upper bound
+and never raises on timeout - callers simply carry on with whatever loaded.
+
+collect_links() gathers every matching href in a single injected script
+instead of one WebDriver round-trip per anchor, so its cost stays flat as
+directory pages grow to thousands of links.
+
+Usage:
+    from selenium_helpers import PageReadiness, collect_links
+
+    ready = PageReadiness(driver, max_wait=15)
+    driver.get(url)
+    ready.wait_for_any(['h1', '.league-name'])
+    ready.settled()
+    league_urls = collect_links(driver, contains=['/leagues/'])
+"""
+
+import logging
+from typing import List, Optional, Sequence
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WAIT = 15  # Seconds
+DEFAULT_QUIET_PERIOD = 0.5  # Seconds without DOM or network activity
+POLL_INTERVAL = 0.1
+
+# Installs a MutationObserver that timestamps the latest DOM change
+_INSTALL_MUTATION_OBSERVER = """
+if (!window.__ffdMutationObserver) {
+    window.__ffdLastMutation = performance.now();
+    window.__ffdMutationObserver = new MutationObserver(function () {
+        window.__ffdLastMutation = performance.now();
+    });
+    window.__ffdMutationObserver.observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+}
+"""
+
+# Milliseconds since the last DOM mutation (0 if the observer is missing)
+_MS_SINCE_MUTATION = """
+return window.__ffdLastMutation === undefined ? 0 : performance.now() - window.__ffdLastMutation;
+"""
+
+# Milliseconds since the last network resource finished loading
+_MS_SINCE_NETWORK = """
+var last = 0;
+performance.getEntriesByType('resource').forEach(function (entry) {
+    if (entry.responseEnd > last) { last = entry.responseEnd; }
+});
+return performance.now() - last;
+"""
+
+
+# Returns the absolute href of every matching element, filtered in the page
+_COLLECT_LINKS = """
+var selector = arguments[0], contains = arguments[1], visibleOnly = arguments[2];
+var hrefs = [];
+document.querySelectorAll(selector).forEach(function (el) {
+    var href = el.href || el.getAttribute('href');
+    if (!href || typeof href !== 'string') { return; }
+    if (visibleOnly && !(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) { return; }
+    var lower = href.toLowerCase();
+    if (contains.length && !contains.some(function (c) { return lower.indexOf(c) !== -1; })) { return; }
+    hrefs.push(href);
+});
+return hrefs;
+"""
+
+
+def collect_links(driver, contains: Sequence[str] = (), selectors: Sequence[str] = ('a[href]',),
+                  visible_only: bool = False, keep_query: bool = False) -> List[str]:
+    """
+    Collect link URLs from the current page in one execute_script call
+
+    Args:
+        driver: WebDriver showing the page
+        contains: Keep only hrefs containing any of these (case-insensitive)
+        selectors: CSS selectors for the link elements
+        visible_only: Skip elements that are not rendered
+        keep_query: Keep ?query strings (fragments are always dropped)
+
+    Returns:
+        Sorted, de-duplicated absolute http(s) URLs
+    """
+    try:
+        hrefs = driver.execute_script(
+            _COLLECT_LINKS,
+            ', '.join(selectors),
+            [c.lower() for c in contains],
+            visible_only
+        ) or []
+    except WebDriverException as e:
+        logger.error(f"Error collecting links: {e}")
+        return []
+
+    urls = set()
+    for href in hrefs:
+        url = href.split('#')[0]
+        if not keep_query:
+            url = url.split('?')[0]
+        if url.startswith(('http://', 'https://')):
+            urls.add(url)
+
+    return sorted(urls)
+
+
+class PageReadiness:
+    """Bounded, event-driven waits for one WebDriver"""
+
+    def __init__(self, driver, max_wait: float = DEFAULT_MAX_WAIT,
+                 quiet_period: float = DEFAULT_QUIET_PERIOD):
+        self.driver = driver
+        self.max_wait = max_wait
+        self.quiet_period = quiet_period
+
+    def _wait(self, condition, timeout: Optional[float] = None) -> bool:
+        """Run a WebDriverWait, returning False instead of raising on timeout"""
+        try:
+            WebDriverWait(
+                self.driver,
+                self.max_wait if timeout is None else timeout,
+                poll_frequency=POLL_INTERVAL,
+                ignored_exceptions=(WebDriverException,)
+            ).until(condition)
+            return True
+        except TimeoutException:
+            return False
+
+    def document_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for document.readyState to reach 'complete'"""
+        return self._wait(
+            lambda d: d.execute_script('return document.readyState') == 'complete',
+            timeout
+        )
+
+    def dom_stable(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the DOM has not changed for the quiet period"""
+        self.driver.execute_script(_INSTALL_MUTATION_OBSERVER)
+        quiet_ms = self.quiet_period * 1000
+        return self._wait(lambda d: d.execute_script(_MS_SINCE_MUTATION) >= quiet_ms, timeout)
+
+    def network_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no network resource has finished for the quiet period"""
+        quiet_ms = self.quiet_period * 1000
+        return self._wait(lambda d: d.execute_script(_MS_SINCE_NETWORK) >= quiet_ms, timeout)
+
+    def settled(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the document, DOM and network to all go quiet"""
+        ready = self.document_ready(timeout)
+        self.driver.execute_script(_INSTALL_MUTATION_OBSERVER)
+        quiet_ms = self.quiet_period * 1000
+        settled = self._wait(
+            lambda d: d.execute_script(_MS_SINCE_MUTATION) >= quiet_ms
+            and d.execute_script(_MS_SINCE_NETWORK) >= quiet_ms,
+            timeout
+        )
+        if not (ready and settled):
+            logger.debug(f"Page still busy after {self.max_wait if timeout is None else timeout}s, continuing")
+        return ready and settled
+
+    def wait_for_any(self, selectors: List[str], timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Wait until any CSS selector matches a displayed element
+
+        Returns:
+            The first selector that matched, or None on timeout
+        """
+        matched = []
+
+        def any_present(driver):
+            for selector in selectors:
+                for element in driver.find_elements(By.CSS_SELECTOR, selector):
+                    if element.is_displayed():
+                        matched.append(selector)
+                        return True
+            return False
+
+        return matched[0] if self._wait(any_present, timeout) else None
+
+    def page_growth(self, previous_height: int, timeout: Optional[float] = None) -> int:
+        """
+        Wait for the page to grow past previous_height (infinite scroll)
+
+        Returns:
+            The new scroll height (unchanged if nothing loaded in time)
+        """
+        height_script = 'return document.body.scrollHeight'
+        self._wait(lambda d: d.execute_script(height_script) > previous_height, timeout)
+        return self.driver.execute_script(height_script)
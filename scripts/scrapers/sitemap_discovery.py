@@ -0,0 +1,259 @@
+"""
+Sitemap URL Discovery
+=====================
+Discover league, team and organization URLs from robots.txt and sitemap.xml
+using plain HTTP - no browser needed.
+
+Sitemaps are located through the Sitemap: lines in robots.txt, falling back
+to /sitemap.xml. Each sitemap is streamed through an incremental XML parser,
+so nested sitemap indexes and gzipped sitemaps with tens of thousands of
+entries are handled without loading whole documents into memory.
+
+Usage:
+    from sitemap_discovery import SitemapDiscovery
+
+    discovery = SitemapDiscovery()
+    results = discovery.discover('https://www.flagfootballfinder.com', ['leagues', 'teams'])
+    for entry in results['leagues']:
+        print(entry.url, entry.lastmod)
+
+    # Or from a saved copy
+    results = discovery.discover(BASE_URL, ['leagues'], sitemap_files=['sitemap.xml'])
+"""
+
+import logging
+import xml.etree.ElementTree as ET
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set
+from urllib.parse import urljoin
+
+import requests
+
+from rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+FFF_BASE_URL = 'https://www.flagfootballfinder.com'
+
+# URL type -> path segment identifying its detail pages
+URL_TYPE_PATHS = {
+    'leagues': '/leagues/',
+    'teams': '/flag-football-team/',
+    'organizations': '/organizations/',
+}
+
+MAX_INDEX_DEPTH = 5  # Nested sitemap indexes followed before giving up
+GZIP_MAGIC = b'\x1f\x8b'
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class SitemapEntry:
+    """One <url> from a sitemap"""
+    url: str
+    lastmod: Optional[str] = None
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _normalize_url(url: str) -> str:
+    """Drop fragments and query strings, matching the Selenium discovery output"""
+    return url.strip().split('#')[0].split('?')[0]
+
+
+class SitemapDiscovery:
+    """Stream detail-page URLs out of a site's sitemaps"""
+
+    def __init__(self, session: Optional[requests.Session] = None, rate_limiter=None,
+                 timeout: int = 10):
+        """
+        Initialize sitemap discovery
+
+        Args:
+            session: requests session (a new one is created if omitted)
+            rate_limiter: Rate limiter consulted before each request
+            timeout: Request timeout in seconds
+        """
+        self.session = session or requests.Session()
+        self.session.headers.setdefault(
+            'User-Agent',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+        )
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.timeout = timeout
+
+    def find_sitemaps(self, base_url: str) -> List[str]:
+        """
+        Find sitemap URLs from robots.txt, falling back to /sitemap.xml
+
+        Args:
+            base_url: Site root, e.g. https://www.flagfootballfinder.com
+
+        Returns:
+            Sitemap URLs to read
+        """
+        robots_url = urljoin(base_url, '/robots.txt')
+        sitemaps = []
+
+        try:
+            response = self._get(robots_url)
+            if response.ok:
+                for line in response.text.splitlines():
+                    key, _, value = line.partition(':')
+                    if key.strip().lower() == 'sitemap' and value.strip():
+                        sitemaps.append(value.strip())
+        except requests.RequestException as e:
+            logger.debug(f"Could not read {robots_url}: {e}")
+
+        if sitemaps:
+            logger.info(f"🗺️  robots.txt lists {len(sitemaps)} sitemap(s)")
+            return sitemaps
+
+        logger.info("robots.txt lists no sitemaps, trying /sitemap.xml")
+        return [urljoin(base_url, '/sitemap.xml')]
+
+    def iter_entries(self, sources: Sequence[str]) -> Iterator[SitemapEntry]:
+        """
+        Stream every page entry from sitemaps, following nested indexes
+
+        Args:
+            sources: Sitemap URLs or local file paths
+
+        Yields:
+            SitemapEntry for each <url> element
+        """
+        seen: Set[str] = set()
+        pending = [(source, 0) for source in sources]
+
+        while pending:
+            source, depth = pending.pop(0)
+            if source in seen:
+                continue
+            seen.add(source)
+
+            try:
+                for kind, entry in self._parse(self._chunks(source)):
+                    if kind == 'url':
+                        yield entry
+                    elif depth < MAX_INDEX_DEPTH:
+                        pending.append((entry.url, depth + 1))
+                    else:
+                        logger.warning(f"⚠️  Sitemap index nesting too deep, skipping {entry.url}")
+            except (OSError, requests.RequestException) as e:
+                logger.warning(f"⚠️  Could not read sitemap {source}: {e}")
+            except (ET.ParseError, zlib.error) as e:
+                logger.warning(f"⚠️  Malformed sitemap {source}: {e}")
+
+    def discover(self, base_url: str = FFF_BASE_URL, url_types: Sequence[str] = tuple(URL_TYPE_PATHS),
+                 sitemap_files: Sequence[str] = ()) -> Dict[str, List[SitemapEntry]]:
+        """
+        Discover detail-page URLs by type
+
+        Args:
+            base_url: Site root used to locate sitemaps
+            url_types: Any of 'leagues', 'teams', 'organizations'
+            sitemap_files: Local sitemap files to read instead of the live site
+
+        Returns:
+            Dictionary of URL type -> entries sorted by URL (empty lists if
+            no sitemap was found)
+        """
+        sources = list(sitemap_files) or self.find_sitemaps(base_url)
+        found: Dict[str, Dict[str, SitemapEntry]] = {url_type: {} for url_type in url_types}
+        total = 0
+
+        for entry in self.iter_entries(sources):
+            total += 1
+            for url_type in url_types:
+                if URL_TYPE_PATHS[url_type] in entry.url:
+                    found[url_type][entry.url] = entry
+                    break
+
+        logger.info(f"🗺️  Read {total} sitemap entries")
+        results = {}
+        for url_type, entries in found.items():
+            results[url_type] = [entries[url] for url in sorted(entries)]
+            logger.info(f"✅ Found {len(entries)} {url_type} URLs in sitemap")
+        return results
+
+    def _get(self, url: str, stream: bool = False) -> requests.Response:
+        self.rate_limiter.acquire(url)
+        logger.info(f"Fetching: {url}")
+        return self.session.get(url, timeout=self.timeout, stream=stream)
+
+    def _chunks(self, source: str) -> Iterator[bytes]:
+        """Stream a sitemap URL or file as decompressed byte chunks"""
+        if source.startswith(('http://', 'https://')):
+            response = self._get(source, stream=True)
+            response.raise_for_status()
+            chunks = response.iter_content(CHUNK_SIZE)
+        else:
+            chunks = self._file_chunks(Path(source))
+
+        decompressor = None
+        for chunk in chunks:
+            if decompressor is None:
+                # Sniff gzip from the body itself - .gz sitemaps are often
+                # served without a Content-Encoding header
+                is_gzip = chunk[:2] == GZIP_MAGIC
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if is_gzip else False
+            yield decompressor.decompress(chunk) if decompressor else chunk
+
+    @staticmethod
+    def _file_chunks(path: Path) -> Iterator[bytes]:
+        with open(path, 'rb') as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+
+    @staticmethod
+    def _parse(chunks: Iterator[bytes]) -> Iterator:
+        """
+        Incrementally parse a <urlset> or <sitemapindex>
+
+        Yields:
+            ('url', SitemapEntry) for pages, ('sitemap', SitemapEntry) for
+            nested sitemaps
+        """
+        parser = ET.XMLPullParser(events=('start', 'end'))
+        root = None
+        depth = 0  # Open elements; at an end event, the ancestors of the one that ended
+        loc = lastmod = None
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if event == 'start':
+                    depth += 1
+                    if root is None:
+                        root = element
+                    continue
+                depth -= 1
+                name = _local_name(element.tag)
+
+                # <url>/<sitemap> sit under the root and their <loc>/<lastmod>
+                # directly under them; extensions such as
+                # <image:image><image:loc> nest their own loc deeper
+                if depth == 2 and name == 'loc':
+                    loc = (element.text or '').strip()
+                elif depth == 2 and name == 'lastmod':
+                    lastmod = (element.text or '').strip() or None
+                elif depth == 1 and name in ('url', 'sitemap'):
+                    if loc:
+                        url = _normalize_url(loc) if name == 'url' else loc
+                        yield name, SitemapEntry(url, lastmod)
+                    loc = lastmod = None
+                    # Free the finished subtree and detach it from the root
+                    # so memory stays flat however long the sitemap is
+                    element.clear()
+                    if root is not None and element is not root:
+                        root.clear()
+
+        parser.close()
@@ -0,0 +1,20 @@
+import pytest
+
+from atomic_write import write_atomic
+
+
+def test_replaces_contents(tmp_path):
+    path = tmp_path / 'entry.json'
+    path.write_bytes(b'old contents that are longer')
+    write_atomic(path, b'new')
+    assert path.read_bytes() == b'new'
+    assert [p.name for p in tmp_path.iterdir()] == ['entry.json']
+
+
+def test_failed_write_keeps_old_file_and_no_temp(tmp_path):
+    path = tmp_path / 'entry.json'
+    path.write_bytes(b'old')
+    with pytest.raises(TypeError):
+        write_atomic(path, 'not bytes')
+    assert path.read_bytes() == b'old'
+    assert [p.name for p in tmp_path.iterdir()] == ['entry.json']
@@ -0,0 +1,89 @@
+import pytest
+
+from columnar import ColumnarWriter, read_records, read_table
+
+pa = pytest.importorskip('pyarrow')
+
+FORMATS = ['leagues.parquet', 'leagues.arrow']
+
+
+def write(path, records, row_group_size=2):
+    with ColumnarWriter(path, row_group_size=row_group_size) as writer:
+        writer.write_many(records)
+    return writer
+
+
+@pytest.mark.parametrize('filename', FORMATS)
+def test_later_row_group_widens_schema(tmp_path, filename):
+    path = tmp_path / filename
+    records = [
+        {'name': 'Elon Park', 'state': 'NC'},
+        {'name': 'Norristown', 'state': 'PA'},
+        {'name': 'Acacia', 'state': 'AZ', 'fees': 99.5, 'formats': ['5v5', '7v7']},
+        {'name': 'Ballantyne', 'state': 'NC', 'fees': 120, 'formats': []},
+        {'name': 'Mesa', 'state': 'AZ'},
+    ]
+    writer = write(path, records)
+
+    assert writer.count == 5
+    assert read_table(path).schema.names == ['name', 'state', 'fees', 'formats']
+    assert read_records(path) == [
+        {'name': 'Elon Park', 'state': 'NC', 'fees': None, 'formats': None},
+        {'name': 'Norristown', 'state': 'PA', 'fees': None, 'formats': None},
+        {'name': 'Acacia', 'state': 'AZ', 'fees': 99.5, 'formats': ['5v5', '7v7']},
+        {'name': 'Ballantyne', 'state': 'NC', 'fees': 120.0, 'formats': []},
+        {'name': 'Mesa', 'state': 'AZ', 'fees': None, 'formats': None},
+    ]
+    assert not path.with_name(path.name + '.previous').exists()
+
+
+@pytest.mark.parametrize('filename', FORMATS)
+def test_dictionary_columns_round_trip_across_row_groups(tmp_path, filename):
+    path = tmp_path / filename
+    records = [
+        {'name': 'Elon Park', 'state': 'NC', 'source': 'fff'},
+        {'name': 'Norristown', 'state': 'PA', 'source': 'fff'},
+        {'name': 'Acacia', 'state': 'AZ', 'source': 'nflflag'},
+        {'name': 'Ballantyne', 'state': 'NC', 'source': None},
+        {'name': 'Mesa', 'state': None, 'source': 'nflflag'},
+    ]
+    write(path, records)
+
+    schema = read_table(path).schema
+    assert pa.types.is_dictionary(schema.field('state').type)
+    assert pa.types.is_dictionary(schema.field('source').type)
+    assert not pa.types.is_dictionary(schema.field('name').type)
+
+    rows = read_records(path)
+    assert [row['state'] for row in rows] == ['NC', 'PA', 'AZ', 'NC', None]
+    assert [row['source'] for row in rows] == ['fff', 'fff', 'nflflag', None, 'nflflag']
+    assert [row['name'] for row in read_records(path, where={'state': 'NC'})] == ['Elon Park', 'Ballantyne']
+    assert [row['name'] for row in read_records(path, where={'state': ['AZ', 'PA']})] == ['Norristown', 'Acacia']
+
+
+@pytest.mark.parametrize('filename', FORMATS)
+def test_none_and_missing_fields_read_back_as_null(tmp_path, filename):
+    path = tmp_path / filename
+    records = [
+        {'name': 'Elon Park', 'city': None, 'fees': None, 'verified': True, 'divisions': None},
+        {'name': 'Norristown', 'verified': False},
+        {'name': 'Acacia', 'city': 'Mesa', 'fees': 75, 'divisions': ['U10']},
+    ]
+    write(path, records, row_group_size=10)
+
+    schema = read_table(path).schema
+    assert schema.field('fees').type == pa.float64()
+    assert schema.field('divisions').type == pa.list_(pa.string())
+    assert read_records(path) == [
+        {'name': 'Elon Park', 'city': None, 'fees': None, 'verified': True, 'divisions': None},
+        {'name': 'Norristown', 'city': None, 'fees': None, 'verified': False, 'divisions': None},
+        {'name': 'Acacia', 'city': 'Mesa', 'fees': 75.0, 'verified': None, 'divisions': ['U10']},
+    ]
+
+
+def test_null_only_known_column_keeps_its_type(tmp_path):
+    path = tmp_path / 'leagues.parquet'
+    write(path, [{'name': 'Elon Park', 'fees': None}, {'name': 'Norristown'}])
+
+    assert read_table(path).schema.field('fees').type == pa.float64()
+    assert read_records(path, columns=['name']) == [{'name': 'Elon Park'}, {'name': 'Norristown'}]
@@ -0,0 +1,59 @@
+import pytest
+
+from field_extractor import compare_with_baseline, extract_fields
+
+SAMPLE_PAGES = [
+    # League page: age range running into a division, and a comma before a gender keyword
+    """Elon Park i9 Sports Flag Football League
+    Charlotte, NC
+    Ages 5-12U, co-ed. Spring season starts in March.
+    Register for $129.99 per player. Questions? info@i9sports.com or (704) 555-0134.""",
+    # Divisions listed individually, state written out
+    """Kansas City Youth Flag
+    Kansas City, Missouri
+    Divisions: 6U, 8U-10U and 12U. Girls only! 5v5 and 7 v 7 formats.
+    Competitive and recreational teams. Fall season. Call 816.555.0199.
+    Team fee $1,200""",
+    # Age range written with "to", followed by an adult division
+    """Austin Flag Football
+    Austin, TX
+    Ages 6 to 14, boys only, plus adult leagues. Travel teams, elite level.
+    Summer season. Email coach.mike@austinflag.org""",
+    # Commas everywhere that are not locations
+    """Winter league, in the gym, co-ed, mixed, 7v7, ages 8-10U
+    Plano, TX 75024
+    beginner friendly, $75""",
+]
+
+
+@pytest.mark.parametrize('text', SAMPLE_PAGES)
+def test_single_pass_matches_per_field_baseline(text):
+    assert compare_with_baseline(text) == []
+
+
+def test_age_range_does_not_swallow_division():
+    fields = extract_fields('Ages 5-12U')
+    assert fields.age_groups == ['5U', '7U', '9U', '11U', '12U']
+
+
+def test_comma_before_keyword_is_not_a_state():
+    fields = extract_fields('Open to all, co-ed play. Austin, TX')
+    assert fields.gender == 'coed'
+    assert (fields.city, fields.state) == ('Austin', 'TX')
+
+
+def test_fields_from_sample_page():
+    fields = extract_fields(SAMPLE_PAGES[0])
+    assert (fields.city, fields.state) == ('Charlotte', 'NC')
+    assert fields.email == 'info@i9sports.com'
+    assert fields.phone == '(704) 555-0134'
+    assert fields.price == 129.99
+    assert fields.season == 'spring'
+    assert fields.gender == 'coed'
+
+
+def test_compare_reports_mismatch(monkeypatch):
+    import field_extractor
+    monkeypatch.setattr(field_extractor, 'extract_fields', lambda text: field_extractor.PageFields())
+    mismatches = compare_with_baseline('Ages 5-12U')
+    assert any(mismatch.startswith('age_groups:') for mismatch in mismatches)
@@ -0,0 +1,33 @@
+import sys
+
+import fff_common
+import flagfootballfinder_scraper
+from crawl_frontier import CrawlFrontier
+from flagfootballfinder_scraper import FlagFootballFinderScraper
+
+URL = 'https://www.flagfootballfinder.com/leagues/elon-park-i9-sports-flag-football-league'
+
+
+def test_incremental_run_with_nothing_due_writes_nothing(tmp_path, monkeypatch):
+    frontier_db = tmp_path / 'frontier.db'
+    frontier = CrawlFrontier(frontier_db)
+    frontier.record_fetch(URL, 'hash', 'league')
+    frontier.close()
+
+    fetched = []
+    monkeypatch.setattr(FlagFootballFinderScraper, 'fetch', lambda self, url: fetched.append(url))
+    monkeypatch.setattr(fff_common, 'OUTPUT_DIR', tmp_path / 'raw')
+    exporters = []
+    open_results = FlagFootballFinderScraper.open_results
+    monkeypatch.setattr(FlagFootballFinderScraper, 'open_results',
+                        lambda self, *args: exporters.append(open_results(self, *args)) or exporters[-1])
+    monkeypatch.setattr(sys, 'argv', [
+        'flagfootballfinder_scraper.py', '--urls', URL, '--incremental',
+        '--frontier-db', str(frontier_db), '--no-cache', '--parse-workers', '0',
+    ])
+
+    flagfootballfinder_scraper.main()
+
+    assert fetched == []
+    assert [exporter.count for exporter in exporters] == [0]
+    assert not (tmp_path / 'raw').exists()
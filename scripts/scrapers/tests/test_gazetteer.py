@@ -0,0 +1,25 @@
+from gazetteer import GAZETTEER, canonical_city, find_locations
+
+
+def test_exact_names_match_ignoring_case_whitespace_and_abbreviations():
+    assert GAZETTEER.match_city('  austin ', 'TX') == 'Austin'
+    assert GAZETTEER.match_city('HOUSTON', 'Texas') == 'Houston'
+    assert GAZETTEER.match_city('saint  louis', 'MO') == 'St. Louis'
+    assert GAZETTEER.match_city('St Louis', 'mo') == 'St. Louis'
+
+
+def test_unknown_place_ending_in_a_known_city_does_not_match():
+    assert GAZETTEER.match_city('East Los Angeles', 'CA') is None
+    assert GAZETTEER.match_city('Greater Houston', 'TX') is None
+    assert canonical_city('Greater  Houston', 'TX') == 'Greater Houston'
+
+
+def test_same_name_in_another_state_does_not_match():
+    assert GAZETTEER.match_city('Austin', 'CA') is None
+
+
+def test_free_text_finds_the_city_without_surrounding_words():
+    assert find_locations('Fun league in Austin, TX') == [('Austin', 'TX')]
+    assert find_locations('Games in Round Rock, TX and St Louis, Missouri') == [
+        ('Round Rock', 'TX'), ('St. Louis', 'MO'),
+    ]
@@ -0,0 +1,25 @@
+import pytest
+
+from html_parser import HTMLNode, available_parsers, parse_html
+
+PAGE = b'<html><body><h1>Elon Park</h1><a class="team link" href="/teams/a">A</a><p>One</p><p>Two</p></body></html>'
+
+
+@pytest.mark.parametrize('parser', available_parsers())
+def test_backends_share_the_query_api(parser):
+    page = parse_html(PAGE, parser)
+    assert isinstance(page, HTMLNode)
+    assert page.select_one('h1').text == 'Elon Park'
+    assert page.select_one('a')['class'] == 'team link'
+    assert page.select_one('a').attr('href') == '/teams/a'
+    assert [p.text for p in page.select('p')] == ['One', 'Two']
+    assert page.select_one('table') is None
+
+
+def test_backend_missing_a_method_fails_on_instantiation():
+    class PartialNode(HTMLNode):
+        def select(self, css):
+            return []
+
+    with pytest.raises(TypeError, match='abstract'):
+        PartialNode()
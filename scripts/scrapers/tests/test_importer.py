@@ -0,0 +1,275 @@
+import json
+import threading
+
+import pytest
+
+from import_journal import ImportJournal
+from import_to_supabase import DataImporter, SlugIndex
+from local_client import LocalAPIError, LocalClient
+
+
+@pytest.fixture
+def client():
+    return LocalClient()
+
+
+def make_importer(client, **kwargs):
+    return DataImporter(client, batch_size=kwargs.pop('batch_size', 100), **kwargs)
+
+
+def rows(client, table, columns='*'):
+    return client.table(table).select(columns).execute().data
+
+
+def league(name, **fields):
+    return {'name': name, 'city': 'Austin', 'state': 'TX', 'website': f'https://example.com/{name}', **fields}
+
+
+def league_row(name, slug):
+    """A prepared leagues row, as insert_batch receives it"""
+    return {'name': name, 'slug': slug, 'name_key': slug, 'city_id': 1}
+
+
+class CountingClient(LocalClient):
+    """LocalClient that counts write requests"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def table(self, name):
+        query = super().table(name)
+        execute = query.execute
+
+        def counted():
+            if query.operation != 'select':
+                self.writes += 1
+            return execute()
+
+        query.execute = counted
+        return query
+
+
+def test_slug_index_hands_out_next_free_suffix():
+    index = SlugIndex(['austin-tx', 'austin-tx-2', 'dallas-tx'])
+    assert index.reserve('houston-tx') == 'houston-tx'
+    assert index.reserve('austin-tx') == 'austin-tx-3'
+    assert index.reserve('austin-tx') == 'austin-tx-4'
+    assert index.reserve('dallas-tx') == 'dallas-tx-2'
+    assert index.reserve('houston-tx') == 'houston-tx-2'
+    assert len(index) == 8
+
+
+def test_slug_index_skips_slugs_taken_after_a_suffix_was_handed_out():
+    index = SlugIndex(['a'])
+    assert index.reserve('a') == 'a-2'
+    index.used.add('a-3')
+    assert index.reserve('a') == 'a-4'
+
+
+def test_insert_batch_bisects_to_the_failing_rows():
+    client = CountingClient()
+    importer = make_importer(client)
+    batch = [league_row(f'League {i}', f'league-{i}') for i in range(8)]
+    batch[5]['name'] = None  # NOT NULL name
+    stats = importer.new_stats()
+
+    written = importer.insert_batch('leagues', batch, stats)
+
+    assert [row['slug'] for row in written] == [f'league-{i}' for i in range(8) if i != 5]
+    assert stats['success'] == 7 and stats['failed'] == 1
+    assert [row['name'] for row in rows(client, 'leagues')] == [row['name'] for row in written]
+    # 8 -> 4 + 4 -> 2 + 2 -> 1 + 1: the good halves go in whole
+    assert client.writes == 7
+
+
+def test_insert_batch_rejects_duplicate_slugs_row_by_row(client):
+    importer = make_importer(client)
+    importer.insert_batch('leagues', [league_row('Existing', 'taken')], importer.new_stats())
+    stats = importer.new_stats()
+
+    written = importer.insert_batch('leagues', [
+        league_row('A', 'a'), {**league_row('Dup', 'taken'), 'name_key': 'dup'}, league_row('B', 'b'),
+    ], stats)
+
+    assert [row['name'] for row in written] == ['A', 'B']
+    assert stats['failed'] == 1
+    assert [row['slug'] for row in rows(client, 'leagues')] == ['taken', 'a', 'b']
+
+
+def test_import_assigns_unique_slugs_and_one_city(client):
+    importer = make_importer(client)
+    stats = importer.import_leagues([league('Flag Fun'), league('Flag Fun', city='Dallas'), league('Other', city='austin')])
+
+    assert stats['success'] == 3 and stats['failed'] == 0
+    assert [row['slug'] for row in rows(client, 'leagues')] == ['flag-fun', 'flag-fun-2', 'other']
+    assert [(city['name'], city['state']) for city in rows(client, 'cities')] == [('Austin', 'TX'), ('Dallas', 'TX')]
+
+
+def test_plain_import_skips_rows_already_stored_in_one_request():
+    client = CountingClient()
+    make_importer(client).import_leagues([league('Flag Fun'), league('Other')])
+    writes = client.writes
+
+    stats = make_importer(client).import_leagues([league('flag  fun!'), league('Other'), league('New')])
+
+    assert stats['success'] == 1 and stats['skipped'] == 2 and stats['failed'] == 0
+    assert client.writes - writes == 1  # No bisection over the stored rows
+    assert [row['name_key'] for row in rows(client, 'leagues')] == ['flag-fun', 'other', 'new']
+
+
+def test_upsert_updates_changed_rows_in_place(client):
+    make_importer(client, upsert=True).import_leagues([league(f'League {i}') for i in range(4)])
+    # Curated columns must survive a re-import
+    client.conn.execute("UPDATE leagues SET verified = 1, slug = 'curated' WHERE name = 'League 0'")
+
+    changed = [league(f'League {i}') for i in range(4)]
+    changed[0]['website'] = 'https://example.com/moved'
+    changed[1]['fees'] = 120.0
+    stats = make_importer(client, upsert=True).import_leagues(changed)
+
+    assert stats['failed'] == 0
+    assert stats['updated'] == 2 and stats['unchanged'] == 2 and stats['success'] == 4
+    stored = {row['name']: row for row in rows(client, 'leagues')}
+    assert len(stored) == 4
+    assert stored['League 0']['website'] == 'https://example.com/moved'
+    assert stored['League 0']['slug'] == 'curated' and stored['League 0']['verified'] == 1
+    assert stored['League 1']['fees'] == 120.0
+
+
+def test_upsert_events_keyed_on_name_date_and_state(client):
+    event = {'name': 'Spring Classic', 'state': 'tx', 'start_date': '2026-04-04', 'fee': 200}
+    make_importer(client, upsert=True).import_events([event, {**event, 'start_date': '2026-10-03'}])
+
+    stats = make_importer(client, upsert=True).import_events([{**event, 'fee': 250}])
+
+    assert stats == {'success': 1, 'failed': 0, 'skipped': 0, 'resumed': 0, 'updated': 1, 'unchanged': 0}
+    assert [(row['start_date'], row['fee']) for row in rows(client, 'events')] == [
+        ('2026-04-04', 250), ('2026-10-03', 200),
+    ]
+
+
+
+def test_upsert_finds_rows_from_a_plain_import(client):
+    make_importer(client).import_leagues([league('Flag Fun'), league('Other')])
+    assert [row['name_key'] for row in rows(client, 'leagues')] == ['flag-fun', 'other']
+
+    stats = make_importer(client, upsert=True).import_leagues([league('Flag Fun', fees=99.0), league('Other')])
+
+    assert stats['updated'] == 1 and stats['unchanged'] == 1 and stats['failed'] == 0
+    assert [(row['name'], row['fees']) for row in rows(client, 'leagues')] == [('Flag Fun', 99.0), ('Other', None)]
+
+
+def test_import_files_shares_workers_across_files(client, tmp_path, monkeypatch):
+    leagues = tmp_path / 'leagues.jsonl'
+    leagues.write_text('\n'.join(json.dumps(league(f'League {i}')) for i in range(3)))
+    events = tmp_path / 'events.jsonl'
+    events.write_text(json.dumps({'name': 'Spring Classic', 'state': 'TX', 'start_date': '2026-04-04'}))
+    importer = make_importer(client, workers=4)
+    # Each file is a single batch: both only get past the barrier if they run at the same time
+    both_running = threading.Barrier(2, timeout=5)
+    import_batch = importer.import_batch
+    monkeypatch.setattr(importer, 'import_batch', lambda *batch: both_running.wait() is None or import_batch(*batch))
+
+    stats, unreadable = importer.import_files([(str(leagues), 'leagues'), (str(events), 'events')])
+
+    assert unreadable == []
+    assert stats['success'] == 4 and stats['failed'] == 0
+    assert len(rows(client, 'leagues')) == 3 and len(rows(client, 'events')) == 1
+
+
+def test_import_files_reports_malformed_files_and_keeps_going(client, tmp_path):
+    bad = tmp_path / 'bad.json'
+    bad.write_text('[{"name": "A", "city": "Austin", "state": "TX"}, {"name": oops}, {"name": "B"}]')
+    good = tmp_path / 'good.jsonl'
+    good.write_text(json.dumps(league('Flag Fun')))
+
+    stats, unreadable = make_importer(client, workers=2).import_files([(str(bad), 'leagues'), (str(good), 'leagues')])
+
+    assert unreadable == [str(bad)]
+    assert sorted(row['name'] for row in rows(client, 'leagues')) == ['A', 'Flag Fun']
+
+
+def test_upsert_updates_a_row_another_worker_inserted_meanwhile(client):
+    make_importer(client).import_leagues([league('Flag Fun')])
+    importer = make_importer(client, upsert=True)
+    fetch_existing = importer.fetch_existing
+    lookups = []
+
+    def stale_lookup(*args):
+        # The first lookup misses, as if it ran before the other worker's insert
+        lookups.append(args)
+        return {} if len(lookups) == 1 else fetch_existing(*args)
+
+    importer.fetch_existing = stale_lookup
+    stats = importer.import_leagues([league('Flag Fun', fees=80.0)])
+
+    assert stats['failed'] == 0 and stats['updated'] == 1 and stats['success'] == 1
+    assert [(row['name'], row['fees'], row['slug']) for row in rows(client, 'leagues')] == [('Flag Fun', 80.0, 'flag-fun')]
+
+
+def test_malformed_record_mid_chunk_keeps_the_records_before_it(client, tmp_path):
+    path = tmp_path / 'leagues.json'
+    records = [json.dumps(league(f'League {i}')) for i in range(3)] + ['{"name": oops}', json.dumps(league('After'))]
+    path.write_text('[' + ',\n'.join(records) + ']')
+
+    stats, unreadable = make_importer(client, batch_size=10).import_files([(str(path), 'leagues')])
+
+    assert unreadable == [str(path)]
+    assert stats['success'] == 3
+    assert [row['name'] for row in rows(client, 'leagues')] == ['League 0', 'League 1', 'League 2']
+
+
+class RejectingClient(CountingClient):
+    """CountingClient that rejects any write containing a row named in rejected"""
+
+    def __init__(self):
+        super().__init__()
+        self.rejected = set()
+
+    def table(self, name):
+        query = super().table(name)
+        execute = query.execute
+
+        def checked():
+            if any(row.get('name') in self.rejected for row in query.rows):
+                raise LocalAPIError('rejected')
+            return execute()
+
+        query.execute = checked
+        return query
+
+
+def test_resume_skips_journaled_batches(tmp_path):
+    client = CountingClient()
+    journal = ImportJournal(tmp_path / 'journal.db', target='test')
+    data = [league(f'League {i}') for i in range(4)]
+    make_importer(client, batch_size=2, journal=journal).import_leagues(data)
+    writes = client.writes
+
+    stats = make_importer(client, batch_size=2, journal=journal, resume=True).import_leagues(data)
+
+    assert stats['resumed'] == 4 and stats['success'] == 0
+    assert client.writes == writes
+    assert len(rows(client, 'leagues')) == 4
+
+
+def test_resume_retries_failed_rows_without_marking_their_batch_done(tmp_path):
+    client = RejectingClient()
+    journal = ImportJournal(tmp_path / 'journal.db', target='test')
+    data = [league('Good'), league('Bad'), league('Also Good')]
+    client.rejected = {'Bad'}
+
+    stats = make_importer(client, journal=journal).import_leagues(data)
+
+    assert stats['success'] == 2 and stats['failed'] == 1
+    hashes = [ImportJournal.record_hash(item) for item in data]
+    assert not journal.batch_committed('leagues', ImportJournal.batch_hash(hashes))
+    assert journal.committed_rows('leagues', hashes) == {hashes[0], hashes[2]}
+
+    client.rejected = set()
+    stats = make_importer(client, journal=journal, resume=True).import_leagues(data)
+
+    assert stats['resumed'] == 2 and stats['success'] == 1 and stats['failed'] == 0
+    assert [row['name'] for row in rows(client, 'leagues')] == ['Good', 'Also Good', 'Bad']
+    assert journal.batch_committed('leagues', ImportJournal.batch_hash(hashes))
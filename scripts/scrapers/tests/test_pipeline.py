@@ -0,0 +1,99 @@
+import logging
+import threading
+
+import pytest
+
+from pipeline import FetchParsePipeline
+
+URLS = [f'https://example.com/leagues/{i}' for i in range(12)]
+
+
+def parse_page(url, content):
+    """Module-level so spawned parser processes can unpickle it"""
+    if content == b'broken':
+        raise ValueError('no league name')
+    if content == b'empty':
+        return None
+    return {'url': url, 'name': content.decode()}
+
+
+class StubFetcher:
+    """Serves canned page bodies, raising for URLs listed in errors"""
+
+    def __init__(self, errors=(), bodies=None):
+        self.errors = set(errors)
+        self.bodies = bodies or {}
+        self.fetched = []
+        self.lock = threading.Lock()
+
+    def __call__(self, url):
+        with self.lock:
+            self.fetched.append(url)
+        if url in self.errors:
+            raise ConnectionError('connection reset')
+        return self.bodies.get(url, url.rsplit('/', 1)[-1].encode())
+
+
+def fetch_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith('fetch-')]
+
+
+def test_single_fetcher_inline_parse_keeps_url_order():
+    fetcher = StubFetcher()
+    pipeline = FetchParsePipeline(fetcher, parse_page, fetch_workers=1, parse_workers=0)
+
+    records = list(pipeline.imap(URLS))
+
+    assert [record['url'] for record in records] == URLS
+    assert fetcher.fetched == URLS
+
+
+@pytest.mark.parametrize('parse_workers', [0, 2])
+def test_every_page_is_parsed_once(parse_workers):
+    parsed = []
+    pipeline = FetchParsePipeline(StubFetcher(), parse_page, fetch_workers=3,
+                                  parse_workers=parse_workers, on_parsed=lambda url, record: parsed.append(url))
+
+    records = list(pipeline.imap(URLS))
+
+    # Completion order, so compare as sets
+    assert sorted(record['url'] for record in records) == sorted(URLS)
+    assert all(record['name'] == record['url'].rsplit('/', 1)[-1] for record in records)
+    assert sorted(parsed) == sorted(URLS)
+    assert fetch_threads() == []
+
+
+@pytest.mark.parametrize('parse_workers', [0, 2])
+def test_fetch_and_parse_errors_skip_only_their_page(parse_workers, caplog):
+    fetcher = StubFetcher(errors={URLS[1]}, bodies={URLS[2]: b'broken', URLS[3]: b'empty'})
+    parsed = {}
+    pipeline = FetchParsePipeline(fetcher, parse_page, fetch_workers=2, parse_workers=parse_workers,
+                                  on_parsed=parsed.__setitem__)
+
+    with caplog.at_level(logging.ERROR, logger='pipeline'):
+        records = list(pipeline.imap(URLS))
+
+    assert sorted(record['url'] for record in records) == sorted(set(URLS) - {URLS[1], URLS[2], URLS[3]})
+    assert sorted(fetcher.fetched) == sorted(URLS)
+    # A failed fetch never reaches a parser; a failed or empty parse is reported as None
+    assert URLS[1] not in parsed
+    assert parsed[URLS[2]] is None and parsed[URLS[3]] is None
+    assert f'Error fetching {URLS[1]}: connection reset' in caplog.text
+    assert f'Error parsing {URLS[2]}: no league name' in caplog.text
+
+
+@pytest.mark.parametrize('parse_workers', [0, 2])
+def test_stopping_early_shuts_down_fetchers(parse_workers):
+    fetcher = StubFetcher()
+    urls = [f'https://example.com/leagues/{i}' for i in range(500)]
+    pipeline = FetchParsePipeline(fetcher, parse_page, fetch_workers=2,
+                                  parse_workers=parse_workers, queue_size=2)
+
+    records = pipeline.imap(urls)
+    first = next(records)
+    records.close()
+
+    assert first['url'] in urls
+    assert fetch_threads() == []
+    # The bounded queue stops fetching long before the URLs run out
+    assert len(fetcher.fetched) < len(urls)
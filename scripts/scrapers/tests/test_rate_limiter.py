@@ -0,0 +1,38 @@
+import threading
+import time
+
+import pytest
+
+from rate_limiter import RateLimiter
+
+
+def test_concurrent_first_requests_share_one_robots_fetch_and_bucket(monkeypatch):
+    loads = []
+
+    def slow_load(robots_url):
+        loads.append(robots_url)
+        time.sleep(0.05)
+        return None
+
+    limiter = RateLimiter(default_rate=100)
+    monkeypatch.setattr(limiter, '_load_robots', slow_load)
+    start = threading.Barrier(8)
+    buckets = []
+
+    def first_request():
+        start.wait()
+        buckets.append(limiter._bucket('https://www.flagfootballfinder.com/leagues/a'))
+
+    threads = [threading.Thread(target=first_request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert loads == ['https://www.flagfootballfinder.com/robots.txt']
+    assert len({id(bucket) for bucket in buckets}) == 1
+
+
+def test_rate_must_be_positive():
+    with pytest.raises(ValueError):
+        RateLimiter().set_rate('example.com', 0)
@@ -0,0 +1,82 @@
+import gzip
+import io
+import json
+import logging
+
+import pytest
+
+from record_reader import iter_json_array, load_records
+
+RECORDS = [
+    {'name': 'Elon Park', 'city': 'Charlotte', 'state': 'NC', 'fees': 99.5, 'formats': ['5v5']},
+    {'name': 'Acacia Élémentaire', 'city': None, 'state': 'AZ', 'verified': False},
+    {'name': 'Norristown', 'about': 'Line one\nline "two" \\ three', 'divisions': []},
+]
+
+
+def read_array(text, chunk_size=3):
+    f = io.StringIO(text)
+    assert f.read(1) == '['
+    return list(iter_json_array(f, chunk_size))
+
+
+def test_load_json_array(tmp_path):
+    path = tmp_path / 'leagues.json'
+    path.write_text(json.dumps(RECORDS, indent=2, ensure_ascii=False), encoding='utf-8')
+    assert list(load_records(str(path))) == RECORDS
+
+
+def test_load_jsonl_skips_blank_and_invalid_lines(tmp_path, caplog):
+    path = tmp_path / 'leagues.jsonl'
+    lines = [json.dumps(RECORDS[0]), '', '{"name": ', json.dumps(RECORDS[1]), json.dumps(RECORDS[2])]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    with caplog.at_level(logging.ERROR):
+        assert list(load_records(str(path))) == RECORDS
+    assert 'line 3' in caplog.text
+
+
+@pytest.mark.parametrize('content', [
+    json.dumps(RECORDS),
+    '\n'.join(json.dumps(record) for record in RECORDS),
+])
+def test_load_gzipped(tmp_path, content):
+    path = tmp_path / 'leagues.json.gz'
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(content)
+    assert list(load_records(str(path))) == RECORDS
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 64, 4096])
+def test_array_across_chunk_boundaries(chunk_size):
+    assert read_array(json.dumps(RECORDS, ensure_ascii=True), chunk_size) == RECORDS
+
+
+def test_truncated_array_keeps_complete_records():
+    text = json.dumps(RECORDS, indent=1)
+    # Every cut inside the last record, from its '{' up to its closing '}'
+    for cut in range(text.rindex('{') + 1, text.rindex('}') + 1):
+        for chunk_size in (1, 7, 4096):
+            assert read_array(text[:cut], chunk_size) == RECORDS[:2], (cut, chunk_size)
+
+
+def test_missing_closing_bracket(caplog):
+    with caplog.at_level(logging.WARNING):
+        assert read_array(json.dumps(RECORDS)[:-1]) == RECORDS
+    assert "closing ']'" in caplog.text
+
+
+@pytest.mark.parametrize('chunk_size', [1, 4, 4096])
+def test_malformed_record_mid_array_raises(chunk_size):
+    good = [json.dumps({'name': f'League {i}'}) for i in range(8)]
+    text = '[' + ','.join(good[:3] + ['{"name": }'] + good[3:]) + ']'
+    with pytest.raises(ValueError, match='Malformed'):
+        read_array(text, chunk_size)
+
+
+def test_malformed_file_names_the_file(tmp_path):
+    path = tmp_path / 'bad.json'
+    path.write_text('[{"name": "a"}, {"name" "b"}, {"name": "c"}]', encoding='utf-8')
+    records = load_records(str(path))
+    assert next(records) == {'name': 'a'}
+    with pytest.raises(ValueError, match='bad.json'):
+        next(records)
@@ -0,0 +1,91 @@
+import json
+
+from html_parser import parse_html
+from selector_cache import SelectorCache
+
+OLD_MARKUP = b'<div class="league-item">Elon Park</div><div class="league-item">Ballantyne</div>'
+NEW_MARKUP = b'<article class="program-card">Elon Park</article>'
+CANDIDATES = ['div.league-item', 'article.program-card', 'div[class*="league"]']
+
+
+class CountingPage:
+    """Parsed page that records every selector it is queried with"""
+
+    def __init__(self, content):
+        self.page = parse_html(content)
+        self.queries = []
+
+    def select(self, selector):
+        self.queries.append(selector)
+        return self.page.select(selector)
+
+
+def test_stored_selector_is_used_without_detection(tmp_path):
+    path = tmp_path / 'selectors.json'
+    cache = SelectorCache(path)
+    selector, elements = cache.select(CountingPage(OLD_MARKUP), 'https://www.example.com/a', 'leagues', CANDIDATES)
+    assert selector == 'div.league-item'
+    assert [element.text for element in elements] == ['Elon Park', 'Ballantyne']
+    assert json.loads(path.read_text()) == {'example.com': {'leagues': 'div.league-item'}}
+
+    # A later run reads the profile and queries the stored selector only
+    cache = SelectorCache(path)
+    page = CountingPage(OLD_MARKUP)
+    selector, elements = cache.select(page, 'https://example.com/b', 'leagues', list(reversed(CANDIDATES)))
+    assert selector == 'div.league-item'
+    assert len(elements) == 2
+    assert page.queries == ['div.league-item']
+    assert (cache.hits, cache.detections) == (1, 0)
+
+
+def test_stale_selector_falls_back_to_detection(tmp_path):
+    path = tmp_path / 'selectors.json'
+    cache = SelectorCache(path)
+    cache.remember('example.com', 'leagues', 'div.league-item')
+
+    page = CountingPage(NEW_MARKUP)
+    selector, elements = cache.select(page, 'https://example.com/a', 'leagues', CANDIDATES)
+
+    assert selector == 'article.program-card'
+    assert [element.text for element in elements] == ['Elon Park']
+    # The stale selector is tried once, not again among the candidates
+    assert page.queries == ['div.league-item', 'article.program-card']
+    assert (cache.hits, cache.detections) == (0, 1)
+    assert json.loads(path.read_text()) == {'example.com': {'leagues': 'article.program-card'}}
+
+
+def test_stale_selector_with_no_match_is_forgotten(tmp_path):
+    cache = SelectorCache(tmp_path / 'selectors.json')
+    cache.remember('example.com', 'leagues', 'div.league-item')
+    cache.remember('example.com', 'events', 'article.event')
+
+    assert cache.select(CountingPage(b'<p>Nothing here</p>'), 'https://example.com/a', 'leagues', CANDIDATES) == (None, [])
+    assert cache.profiles == {'example.com': {'events': 'article.event'}}
+
+
+def test_forget_is_per_domain(tmp_path):
+    path = tmp_path / 'selectors.json'
+    cache = SelectorCache(path)
+    cache.remember('example.com', 'leagues', 'div.league-item')
+    cache.remember('example.com', 'events', 'article.event')
+    cache.remember('other.org', 'leagues', 'div.league-item')
+
+    cache.forget('example.com', 'events')
+    assert cache.profiles == {'example.com': {'leagues': 'div.league-item'},
+                              'other.org': {'leagues': 'div.league-item'}}
+
+    cache.forget('example.com')
+    assert json.loads(path.read_text()) == {'other.org': {'leagues': 'div.league-item'}}
+
+    # other.org still hits; example.com detects again
+    page = CountingPage(OLD_MARKUP)
+    cache.select(page, 'https://other.org/a', 'leagues', CANDIDATES)
+    cache.select(page, 'https://example.com/a', 'leagues', ['div[class*="league"]'])
+    assert (cache.hits, cache.detections) == (1, 1)
+    assert cache.profiles['example.com'] == {'leagues': 'div[class*="league"]'}
+
+
+def test_unreadable_profile_starts_empty(tmp_path):
+    path = tmp_path / 'selectors.json'
+    path.write_text('{"example.com": ')
+    assert SelectorCache(path).profiles == {}
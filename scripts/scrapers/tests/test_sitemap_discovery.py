@@ -0,0 +1,41 @@
+from sitemap_discovery import SitemapDiscovery, SitemapEntry
+
+IMAGE_SITEMAP = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url>
+    <loc>https://www.flagfootballfinder.com/leagues/a</loc>
+    <lastmod>2026-09-01</lastmod>
+    <image:image>
+      <image:loc>https://cdn.x.com/img.png</image:loc>
+    </image:image>
+  </url>
+  <url>
+    <image:image><image:loc>https://cdn.x.com/first.png</image:loc></image:image>
+    <loc>https://www.flagfootballfinder.com/teams/b</loc>
+  </url>
+</urlset>
+"""
+
+SITEMAP_INDEX = b"""<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://www.flagfootballfinder.com/sitemap-leagues.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+
+def parse(xml, chunk_size=16):
+    return list(SitemapDiscovery._parse(xml[i:i + chunk_size] for i in range(0, len(xml), chunk_size)))
+
+
+def test_image_sitemap_keeps_page_locs():
+    assert parse(IMAGE_SITEMAP) == [
+        ('url', SitemapEntry('https://www.flagfootballfinder.com/leagues/a', '2026-09-01')),
+        ('url', SitemapEntry('https://www.flagfootballfinder.com/teams/b', None)),
+    ]
+
+
+def test_sitemap_index_yields_nested_sitemaps():
+    assert parse(SITEMAP_INDEX) == [
+        ('sitemap', SitemapEntry('https://www.flagfootballfinder.com/sitemap-leagues.xml', None)),
+    ]
@@ -0,0 +1,126 @@
+-- Natural keys for idempotent scraper imports
+-- Run once before importing with `import_to_supabase.py`. Every import
+-- writes name_key, and `--upsert` matches existing rows on it.
+--
+-- name_key is the lowercased name with every run of non-alphanumeric
+-- characters replaced by '-' (the importer computes the same value), so
+-- "Elon Park i9 Sports" and "elon park  i9-sports" map to the same row.
+--
+-- The keys are unique with NULLS NOT DISTINCT (Postgres 15+), so a row
+-- without a city still conflicts with its earlier copy instead of being
+-- inserted again.
+--
+-- public.teams is not created by schema.sql; its statements only run on
+-- databases that already have the table.
+--
+-- Everything runs in one transaction, so a stop on duplicate verified rows
+-- (see below) leaves the database as it was.
+
+begin;
+
+alter table public.leagues add column if not exists name_key text;
+alter table public.events add column if not exists name_key text;
+
+update public.leagues
+set name_key = trim(both '-' from regexp_replace(lower(name), '[^a-z0-9]+', '-', 'g'))
+where name_key is null;
+
+update public.events
+set name_key = trim(both '-' from regexp_replace(lower(name), '[^a-z0-9]+', '-', 'g'))
+where name_key is null;
+
+-- Earlier imports inserted a new copy on every run. Before the unique
+-- indexes below can be created, each group of rows sharing a natural key is
+-- merged into one keeper: the verified row if there is one, otherwise the
+-- oldest. Foreign keys pointing at the other copies are moved to the keeper
+-- before they are deleted. A group with more than one verified row holds
+-- curated data on both sides, so it is not merged automatically: the
+-- migration stops and lists those rows to be resolved by hand.
+create or replace function pg_temp.merge_natural_key_duplicates(tbl regclass, key_columns text[])
+returns void
+language plpgsql
+as $$
+declare
+  key_list text := (select string_agg(format('%I', c), ', ') from unnest(key_columns) c);
+  has_verified boolean := exists (
+    select 1 from pg_attribute
+    where attrelid = tbl and attname = 'verified' and not attisdropped
+  );
+  verified_expr text := case when has_verified then 'coalesce(verified, false)' else 'false' end;
+  conflicts text;
+  merged bigint;
+  fk record;
+begin
+  execute format(
+    'create temp table natural_key_duplicates as
+     select id, keeper_id, verified_in_group
+     from (
+       select id,
+              first_value(id) over w as keeper_id,
+              count(*) filter (where %2$s) over (partition by %3$s) as verified_in_group
+       from %1$s
+       window w as (partition by %3$s order by %2$s desc, id)
+     ) ranked
+     where id <> keeper_id',
+    tbl, verified_expr, key_list
+  );
+
+  execute $q$
+    select string_agg(format('%s (keeper %s)', id, keeper_id), ', ' order by keeper_id, id)
+    from natural_key_duplicates
+    where verified_in_group > 1
+  $q$ into conflicts;
+  if conflicts is not null then
+    raise exception 'More than one verified row shares a natural key in %; ids: %. Merge or rename them by hand and rerun.', tbl, conflicts;
+  end if;
+
+  -- Move every single-column foreign key that references a duplicate
+  for fk in
+    select c.conrelid::regclass as ref_table, a.attname as ref_column
+    from pg_constraint c
+    join pg_attribute a on a.attrelid = c.conrelid and a.attnum = c.conkey[1]
+    where c.contype = 'f' and c.confrelid = tbl and array_length(c.conkey, 1) = 1
+  loop
+    execute format(
+      'update %1$s r set %2$I = d.keeper_id from natural_key_duplicates d where r.%2$I = d.id',
+      fk.ref_table, fk.ref_column
+    );
+  end loop;
+
+  execute format('delete from %s t using natural_key_duplicates d where t.id = d.id', tbl);
+  get diagnostics merged = row_count;
+  raise notice 'Merged % duplicate rows in %', merged, tbl;
+  drop table natural_key_duplicates;
+end
+$$;
+
+select pg_temp.merge_natural_key_duplicates('public.leagues', array['name_key', 'city_id']);
+select pg_temp.merge_natural_key_duplicates('public.events', array['name_key', 'start_date', 'state']);
+
+-- Conflict targets for on_conflict upserts
+create unique index if not exists leagues_natural_key
+  on public.leagues(name_key, city_id) nulls not distinct;
+create unique index if not exists events_natural_key
+  on public.events(name_key, start_date, state);
+
+do $$
+begin
+  if to_regclass('public.teams') is null then
+    raise notice 'public.teams does not exist, skipping its natural key';
+    return;
+  end if;
+
+  alter table public.teams add column if not exists name_key text;
+
+  update public.teams
+  set name_key = trim(both '-' from regexp_replace(lower(name), '[^a-z0-9]+', '-', 'g'))
+  where name_key is null;
+
+  perform pg_temp.merge_natural_key_duplicates('public.teams', array['name_key', 'city_id']);
+
+  create unique index if not exists teams_natural_key
+    on public.teams(name_key, city_id) nulls not distinct;
+end
+$$;
+
+commit;